@@ -0,0 +1,81 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+DJANGO_SETUP = (
+    'import os, django; '
+    "os.environ['DJANGO_SETTINGS_MODULE'] = '{settings}'; "
+    'django.setup(); '
+    'from django.conf import settings; '
+    '__import__(settings.ROOT_URLCONF); '
+    'import tasks.views'
+)
+
+JOB_WORKER = (
+    'import os, django; '
+    "os.environ['DJANGO_SETTINGS_MODULE'] = '{settings}'; "
+    'django.setup(); '
+    'import tasks.management.commands.run_analysis_worker'
+)
+
+SCENARIOS = [
+    ('interpreter only', 'pass'),
+    ('tasks.scoring (library)', 'import tasks.scoring'),
+    ('tasks.batch (library)', 'import tasks.batch'),
+    ('django, full settings', DJANGO_SETUP.format(settings='task_analyzer.settings')),
+    ('django, worker settings', DJANGO_SETUP.format(settings='task_analyzer.settings_worker')),
+    ('job worker, full settings', JOB_WORKER.format(settings='task_analyzer.settings')),
+    ('job worker, worker settings', JOB_WORKER.format(settings='task_analyzer.settings_worker')),
+]
+
+
+def import_time_ms(code):
+    env = dict(os.environ)
+    env.pop('DJANGO_SETTINGS_MODULE', None)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    total = 0
+    modules = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules += 1
+        if not name.startswith('  '):
+            total += int(cumulative)
+    return total / 1000, modules
+
+
+def wall_time_ms(code):
+    env = dict(os.environ)
+    env.pop('DJANGO_SETTINGS_MODULE', None)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, env=env, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start cost of the scoring engines and API profiles')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = min(wall_time_ms('pass') for _ in range(args.runs))
+    print(f'{"scenario":28} {"imports ms":>11} {"modules":>8} {"process ms":>11}')
+    for label, code in SCENARIOS:
+        imports = [import_time_ms(code) for _ in range(args.runs)]
+        walls = [wall_time_ms(code) - baseline for _ in range(args.runs)]
+        print(f'{label:28} {statistics.median(i[0] for i in imports):11.1f} '
+              f'{imports[0][1]:8d} {statistics.median(walls):11.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -88,3 +88,36 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
+ANALYSIS_CACHE_SIZE = 16
+RANKING_VERSION_CACHE_SIZE = 64
+GRAPH_INLINE_LAYOUT_LIMIT = 2000
+
+ANALYZE_BATCH_MAX_BACKLOGS = 500
+ANALYZE_BATCH_MAX_PROCESSES = 4
+
+ANALYZE_PEERS = []
+ANALYZE_PEER_TOKEN = None
+ANALYZE_PEER_TIMEOUT = 30
+ANALYZE_SCATTER_MIN_TASKS = 20000
+
+SELECT_DP_CELLS = 250000
+SELECT_NODE_LIMIT = 200
+
+ANALYSIS_JOB_TTL = 3600
+ANALYSIS_JOB_MAX_WAIT = 30
+ANALYSIS_JOB_LEASE = 60
+
+WORKSPACE_RUNTIME_LIMIT = 64
+WORKSPACE_ANALYSIS_CACHE_SIZE = 4
+WORKSPACE_SCORE_CACHE_SIZE = 50000
+
+FEED_RANKING_LIMIT = 50
+FEED_HEARTBEAT_SECONDS = 15
+FEED_STREAM_SECONDS = 300
+FEED_RETRY_MS = 3000
+
+TASK_ANALYZER_TIMINGS = False
+
+PROFILE_STORE_DIR = BASE_DIR / 'profiles'
+PROFILE_STORE_LIMIT = 50
+PROFILE_SAMPLE_INTERVAL = 0.001
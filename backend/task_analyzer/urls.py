@@ -1,8 +1,10 @@
 from django.contrib import admin
 from django.urls import path, include
+from tasks import views as task_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/tasks/', include('tasks.urls')),
+    path('metrics', task_views.metrics, name='metrics'),
 ]
 
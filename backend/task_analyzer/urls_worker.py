@@ -0,0 +1,7 @@
+from django.urls import path, include
+from tasks import views as task_views
+
+urlpatterns = [
+    path('api/tasks/', include('tasks.urls')),
+    path('metrics', task_views.metrics, name='metrics'),
+]
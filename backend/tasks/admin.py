@@ -1,11 +1,205 @@
-from django.contrib import admin
-from .models import Task
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+from .materialize import refresh_scores
+from .models import AnalysisJob, Task, Workspace
+from .search import DUE_WINDOWS, IMPORTANCE_BANDS, due_window, importance_band, match_titles
+
+
+CURSOR_VAR = 'after'
+KEYSET_FIELDS = {'id', 'priority_score', 'blocker_count', 'in_cycle', 'due_date', 'importance',
+                 'estimated_hours', 'created_at'}
+
+
+def estimated_row_count(model, using='default'):
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+            elif connection.vendor == 'mysql':
+                cursor.execute(
+                    'SELECT table_rows FROM information_schema.tables '
+                    'WHERE table_schema = DATABASE() AND table_name = %s', [table]
+                )
+            else:
+                return model._base_manager.using(using).aggregate(last=Max('pk'))['last']
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    exact_limit = 10000
+
+    @cached_property
+    def count(self):
+        self.estimated = False
+        if not self.object_list.query.where:
+            estimate = estimated_row_count(self.object_list.model, self.object_list.db)
+            if estimate is not None and estimate > self.exact_limit:
+                self.estimated = True
+                return estimate
+        capped = self.object_list.order_by()[:self.exact_limit + 1].count()
+        self.estimated = capped > self.exact_limit
+        return capped
+
+
+class KeysetChangeList(ChangeList):
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def keyset_ordering(self):
+        pk = self.lookup_opts.pk
+        keys = []
+        for term in self.queryset.query.order_by:
+            if not isinstance(term, str) or len(keys) == 2:
+                return None
+            name = term.lstrip('-')
+            name = pk.name if name == 'pk' else name
+            if name not in KEYSET_FIELDS:
+                return None
+            keys.append((self.lookup_opts.get_field(name), term.startswith('-')))
+            if keys[-1][0] == pk:
+                return keys
+        return None
+
+    def cursor_for(self, obj):
+        return '|'.join(str(getattr(obj, field.attname)) for field, _ in self.keyset)
+
+    def after_cursor(self, cursor):
+        parts = cursor.rsplit('|', len(self.keyset) - 1)
+        if len(parts) != len(self.keyset):
+            raise IncorrectLookupParameters
+        try:
+            values = [field.to_python(value) for (field, _), value in zip(self.keyset, parts)]
+        except ValidationError:
+            raise IncorrectLookupParameters
+
+        condition = Q()
+        equal = {}
+        for (field, descending), value in zip(self.keyset, values):
+            condition |= Q(**equal, **{f"{field.name}__{'lt' if descending else 'gt'}": value})
+            equal[field.name] = value
+        return condition
+
+    def get_results(self, request):
+        self.keyset = self.keyset_ordering()
+        self.cursor = request.GET.get(CURSOR_VAR)
+        if self.keyset is None or (self.cursor is None and self.page_num > 1):
+            super().get_results(request)
+            self.estimated_count = getattr(self.paginator, 'estimated', False)
+            return
+
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        queryset = self.queryset
+        if self.cursor:
+            queryset = queryset.filter(self.after_cursor(self.cursor))
+        rows = list(queryset[:self.list_per_page + 1])
+        page = rows[:self.list_per_page]
+        next_cursor = self.cursor_for(page[-1]) if len(rows) > self.list_per_page else None
+
+        self.result_count = paginator.count
+        self.estimated_count = getattr(paginator, 'estimated', False)
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.result_list = page
+        self.can_show_all = False
+        self.multi_page = bool(self.cursor or next_cursor)
+        self.paginator = paginator
+        self.first_url = self.get_query_string(remove=[CURSOR_VAR, PAGE_VAR])
+        self.next_url = next_cursor and self.get_query_string({CURSOR_VAR: next_cursor}, [PAGE_VAR])
+
+
+class DueWindowFilter(admin.SimpleListFilter):
+    title = 'due window'
+    parameter_name = 'due'
+
+    def lookups(self, request, model_admin):
+        return [
+            ('overdue', 'Overdue'),
+            ('today', 'Due today'),
+            ('week', 'Next 7 days'),
+            ('month', 'Next 30 days'),
+            ('later', 'Later'),
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() not in DUE_WINDOWS:
+            return queryset
+        return queryset.filter(due_window(self.value(), timezone.localdate()))
+
+
+class ImportanceBandFilter(admin.SimpleListFilter):
+    title = 'importance'
+    parameter_name = 'importance_band'
+
+    def lookups(self, request, model_admin):
+        return [
+            ('critical', 'Critical (9-10)'),
+            ('high', 'High (7-8)'),
+            ('normal', 'Normal (4-6)'),
+            ('low', 'Low (1-3)'),
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() not in IMPORTANCE_BANDS:
+            return queryset
+        return queryset.filter(importance_band(self.value()))
 
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
-    list_display = ['title', 'due_date', 'importance', 'estimated_hours', 'created_at']
-    list_filter = ['due_date', 'importance', 'created_at']
+    list_display = ['title', 'workspace', 'priority_score', 'blocker_count', 'in_cycle', 'due_date',
+                    'importance', 'estimated_hours', 'completed', 'scored_at']
+    list_filter = [DueWindowFilter, ImportanceBandFilter, 'in_cycle', 'completed', 'workspace']
+    list_select_related = ['workspace']
+    readonly_fields = ['priority_score', 'blocker_count', 'in_cycle', 'scored_at']
     search_fields = ['title']
-    ordering = ['-created_at']
+    ordering = ['-priority_score', '-id']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 100
+    actions = ['refresh_scores']
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        return match_titles(queryset, search_term), False
+
+    @admin.action(description='Recompute scores for the backlogs of the selected tasks')
+    def refresh_scores(self, request, queryset):
+        workspace_ids = set(queryset.order_by().values_list('workspace', flat=True).distinct())
+        workspaces = list(Workspace.objects.filter(pk__in=workspace_ids - {None}))
+        if None in workspace_ids:
+            workspaces.append(None)
+        refreshed = sum(refresh_scores(workspace) for workspace in workspaces)
+        self.message_user(request, f'Scored {refreshed} task(s) in {len(workspaces)} backlog(s)', messages.SUCCESS)
 
+
+@admin.register(Workspace)
+class WorkspaceAdmin(admin.ModelAdmin):
+    list_display = ['slug', 'name', 'max_tasks', 'cpu_seconds_per_minute', 'max_concurrent_analyses', 'updated_at']
+    search_fields = ['slug', 'name']
+    ordering = ['slug']
+
+
+@admin.register(AnalysisJob)
+class AnalysisJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'status', 'task_count', 'created_at', 'finished_at', 'expires_at']
+    list_filter = ['status']
+    exclude = ['payload', 'result']
+    ordering = ['-created_at']
@@ -0,0 +1,77 @@
+import atexit
+import threading
+from functools import partial
+from .pipeline import run_pipeline
+from .scoring import default_calendar, parse_date
+
+
+_pool = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(processes):
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != processes:
+            from concurrent.futures import ProcessPoolExecutor
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=processes)
+            _pool_size = processes
+        return _pool
+
+
+def _reset_pool():
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+        _pool_size = 0
+
+
+atexit.register(_reset_pool)
+
+
+def prime_calendar(backlogs, work_calendar=None):
+    work_calendar = work_calendar or default_calendar
+    dates = []
+    for backlog in backlogs:
+        if backlog['options'].get('reference_date'):
+            dates.append(backlog['options']['reference_date'])
+        for task in backlog['tasks']:
+            due = parse_date(task.get('due_date'))
+            if due is not None:
+                dates.append(due)
+    if dates:
+        work_calendar.ensure_range(min(dates), max(dates))
+
+
+def analyze_backlog(backlog, score_cache=None, layout_limit=0):
+    try:
+        result, _ = run_pipeline(
+            backlog['tasks'],
+            backlog['strategy'],
+            backlog['options'],
+            score_cache=score_cache,
+            layout_limit=layout_limit
+        )
+    except Exception as e:
+        return {'name': backlog['name'], 'status': 'error', 'error': f'{type(e).__name__}: {e}'}
+    return {'name': backlog['name'], 'status': 'ok', 'result': result}
+
+
+def analyze_batch(backlogs, processes=0, layout_limit=0):
+    if processes > 1 and len(backlogs) > 1:
+        from concurrent.futures.process import BrokenProcessPool
+        pool = _get_pool(processes)
+        chunksize = max(1, len(backlogs) // (processes * 4))
+        try:
+            return list(pool.map(partial(analyze_backlog, layout_limit=layout_limit), backlogs, chunksize=chunksize))
+        except BrokenProcessPool:
+            _reset_pool()
+
+    prime_calendar(backlogs)
+    score_cache = {}
+    return [analyze_backlog(backlog, score_cache, layout_limit) for backlog in backlogs]
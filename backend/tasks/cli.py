@@ -0,0 +1,323 @@
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from datetime import date
+from .columnar import ColumnarSnapshot, SnapshotFormatError, is_snapshot, write_snapshot
+from .graph import split_by_component
+from .propagation import Propagation
+from .scoring import STRATEGY_NAMES, analyze_all_tasks, normalize_tasks, parse_date
+
+
+OUTPUT_FIELDS = ('rank', 'id', 'title', 'priority_score', 'due_date', 'importance', 'estimated_hours', 'explanation')
+CHUNKS_PER_PROCESS = 4
+
+
+class InputError(ValueError):
+    pass
+
+
+def _number(value, cast):
+    try:
+        return cast(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        raise InputError(f'{value!r} is not a number')
+
+
+def _check_task(task):
+    if not isinstance(task, dict):
+        raise InputError('not an object')
+    due = task.get('due_date')
+    if due is not None and parse_date(due) is None:
+        raise InputError(f'due_date {due!r} is not a YYYY-MM-DD date')
+    for field in ('importance', 'estimated_hours'):
+        if field not in task:
+            continue
+        value = task[field]
+        if isinstance(value, str):
+            try:
+                value = _number(value.strip(), int)
+            except InputError:
+                pass
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise InputError(f'{field} {task[field]!r} is not a number')
+        task[field] = value
+    if 'dependencies' in task:
+        dependencies = task['dependencies']
+        if not isinstance(dependencies, list):
+            raise InputError(f'dependencies {dependencies!r} is not a list')
+        for dependency in dependencies:
+            if isinstance(dependency, bool) or not isinstance(dependency, (int, str)):
+                raise InputError(f'dependency {dependency!r} is not a task id')
+
+
+def _task_id(value):
+    value = value.strip()
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def parse_csv(text):
+    tasks = []
+    for row in csv.DictReader(io.StringIO(text)):
+        task = {}
+        for key, value in row.items():
+            if key is None or value is None or value.strip() == '':
+                continue
+            key = key.strip()
+            if key == 'id':
+                task['id'] = _task_id(value)
+            elif key == 'dependencies':
+                task['dependencies'] = [_task_id(d) for d in value.replace(';', ' ').replace(',', ' ').split()]
+            elif key in ('importance', 'estimated_hours'):
+                task[key] = _number(value.strip(), int)
+            else:
+                task[key] = value.strip()
+        tasks.append(task)
+    return tasks
+
+
+def parse_ndjson(text):
+    tasks = []
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            tasks.append(json.loads(line))
+        except ValueError as e:
+            raise InputError(f'line {number}: {e}')
+    return tasks
+
+
+def parse_json(text):
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise InputError(str(e))
+    if isinstance(data, dict):
+        data = data['tasks'] if 'tasks' in data else [data]
+    if not isinstance(data, list):
+        raise InputError('expected a list of tasks or an object with a "tasks" list')
+    return data
+
+
+def detect_format(name, text):
+    lowered = (name or '').lower()
+    if lowered.endswith('.csv'):
+        return 'csv'
+    if lowered.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    stripped = text.lstrip()
+    if stripped.startswith('['):
+        return 'json'
+    if stripped.startswith('{'):
+        first_line = stripped.split('\n', 1)[0]
+        try:
+            json.loads(first_line)
+        except ValueError:
+            return 'json'
+        return 'ndjson' if '\n' in stripped.strip() else 'json'
+    return 'csv'
+
+
+def read_tasks(text, input_format='auto', name=None):
+    if input_format == 'auto':
+        input_format = detect_format(name, text)
+    parser = {'json': parse_json, 'ndjson': parse_ndjson, 'csv': parse_csv}[input_format]
+    tasks = parser(text)
+    for number, task in enumerate(tasks, 1):
+        try:
+            _check_task(task)
+        except InputError as e:
+            raise InputError(f'record {number}: {e}')
+    return tasks
+
+
+def analyze_chunk(job):
+    tasks, strategy, reference_date, propagation = job
+    analyze_all_tasks(
+        tasks,
+        strategy,
+        score_cache={},
+        reference_date=reference_date,
+        propagation=Propagation(**propagation) if propagation else None
+    )
+    return tasks
+
+
+def analyze_snapshot_chunk(job):
+    path, positions, strategy, reference_date, propagation = job
+    with ColumnarSnapshot(path) as snapshot:
+        tasks = snapshot.tasks(positions)
+    return analyze_chunk((tasks, strategy, reference_date, propagation))
+
+
+def _score_chunks(func, chunks, jobs, total, processes):
+    from concurrent.futures import ProcessPoolExecutor
+    scored = [None] * total
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for chunk, analyzed in zip(chunks, pool.map(func, jobs)):
+            for p, task in zip(chunk, analyzed):
+                scored[p] = task
+    return scored
+
+
+def score_tasks(tasks, strategy='smart_balance', reference_date=None, processes=1, propagation=None):
+    reference_date = reference_date or date.today()
+    if processes <= 1 or len(tasks) < 2:
+        return analyze_chunk((tasks, strategy, reference_date, propagation))
+
+    chunks = split_by_component(normalize_tasks(tasks).successors, processes * CHUNKS_PER_PROCESS)
+    if len(chunks) == 1:
+        return analyze_chunk((tasks, strategy, reference_date, propagation))
+
+    jobs = [([tasks[p] for p in chunk], strategy, reference_date, propagation) for chunk in chunks]
+    return _score_chunks(analyze_chunk, chunks, jobs, len(tasks), processes)
+
+
+def score_snapshot(path, strategy='smart_balance', reference_date=None, processes=1, propagation=None):
+    reference_date = reference_date or date.today()
+    with ColumnarSnapshot(path) as snapshot:
+        if processes <= 1 or len(snapshot) < 2:
+            return snapshot.analyze(strategy, reference_date,
+                                    propagation=Propagation(**propagation) if propagation else None)
+        total = len(snapshot)
+        chunks = split_by_component(snapshot.task_index().successors, processes * CHUNKS_PER_PROCESS)
+
+    jobs = [(path, chunk, strategy, reference_date, propagation) for chunk in chunks]
+    return _score_chunks(analyze_snapshot_chunk, chunks, jobs, total, processes)
+
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'Cannot serialize {type(value).__name__}')
+
+
+def write_ranked(tasks, stream, output_format='ndjson', top=None):
+    order = sorted(range(len(tasks)), key=lambda i: (-tasks[i]['priority_score'], i))
+    if top:
+        order = order[:top]
+
+    if output_format == 'csv':
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(OUTPUT_FIELDS)
+        for rank, i in enumerate(order, 1):
+            task = dict(tasks[i], rank=rank)
+            if isinstance(task.get('due_date'), date):
+                task['due_date'] = task['due_date'].isoformat()
+            writer.writerow([task.get(f, '') for f in OUTPUT_FIELDS])
+        return len(order)
+
+    if output_format == 'json':
+        stream.write('[\n')
+    for rank, i in enumerate(order, 1):
+        line = json.dumps(dict(tasks[i], rank=rank), default=_default)
+        if output_format == 'json':
+            line = ('  ' if rank == 1 else ', ') + line
+        stream.write(line + '\n')
+    if output_format == 'json':
+        stream.write(']\n')
+    return len(order)
+
+
+def add_arguments(parser):
+    parser.add_argument('input', nargs='?', default='-', help='Input file, or - for stdin')
+    parser.add_argument('--format', dest='input_format', choices=['auto', 'json', 'ndjson', 'csv', 'columnar'],
+                        default='auto')
+    parser.add_argument('--strategy', choices=sorted(STRATEGY_NAMES), default='smart_balance')
+    parser.add_argument('--reference-date', help='Score as of this date (YYYY-MM-DD)')
+    parser.add_argument('--propagation', choices=['legacy', 'jacobi', 'gauss_seidel'], default='legacy')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Worker processes; the backlog is split by connected component')
+    parser.add_argument('--output', default='-', help='Output file, or - for stdout')
+    parser.add_argument('--output-format', choices=['ndjson', 'json', 'csv', 'columnar'], default='ndjson')
+    parser.add_argument('--top', type=int, help='Only write the N highest-ranked tasks')
+
+
+def run(options, stdin=None, stdout=None, stderr=None):
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+
+    reference_date = None
+    if options.get('reference_date'):
+        reference_date = parse_date(options['reference_date'])
+        if reference_date is None:
+            raise InputError('reference date must be YYYY-MM-DD')
+
+    columnar = options['input_format'] == 'columnar' or (
+        options['input_format'] == 'auto' and options['input'] != '-' and is_snapshot(options['input'])
+    )
+    if columnar and options['input'] == '-':
+        raise InputError('columnar snapshots must be read from a file')
+    if options['output_format'] == 'columnar' and (options['output'] == '-' or options.get('top')):
+        raise InputError('columnar output needs --output and cannot be combined with --top')
+
+    start = time.perf_counter()
+    if columnar:
+        tasks = None
+    elif options['input'] == '-':
+        tasks = read_tasks(stdin.read(), options['input_format'])
+    else:
+        with open(options['input'], encoding='utf-8') as handle:
+            tasks = read_tasks(handle.read(), options['input_format'], options['input'])
+    loaded = time.perf_counter()
+
+    propagation = None
+    if options['propagation'] != 'legacy':
+        propagation = {'method': options['propagation']}
+    processes = max(1, options['processes'])
+    try:
+        if columnar:
+            tasks = score_snapshot(options['input'], options['strategy'], reference_date, processes, propagation)
+        else:
+            tasks = score_tasks(tasks, options['strategy'], reference_date, processes, propagation)
+    except SnapshotFormatError as e:
+        raise InputError(str(e))
+    scored = time.perf_counter()
+
+    if options['output_format'] == 'columnar':
+        try:
+            write_snapshot(options['output'], tasks)
+        except SnapshotFormatError as e:
+            raise InputError(str(e))
+        written = len(tasks)
+    elif options['output'] == '-':
+        written = write_ranked(tasks, stdout, options['output_format'], options.get('top'))
+    else:
+        with open(options['output'], 'w', encoding='utf-8') as handle:
+            written = write_ranked(tasks, handle, options['output_format'], options.get('top'))
+    finished = time.perf_counter()
+
+    scoring_time = max(scored - loaded, 1e-9)
+    stderr.write(
+        f'Scored {len(tasks)} tasks with {STRATEGY_NAMES[options["strategy"]]} using {processes} process(es): '
+        f'{len(tasks) / scoring_time:,.0f} tasks/sec scoring, '
+        f'{len(tasks) / max(finished - start, 1e-9):,.0f} tasks/sec end to end '
+        f'(read {loaded - start:.2f}s, score {scoring_time:.2f}s, write {finished - scored:.2f}s, '
+        f'{written} written)\n'
+    )
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tasks.cli', description='Rank a task backlog from a file or stdin')
+    add_arguments(parser)
+    options = vars(parser.parse_args(argv))
+    try:
+        return run(options)
+    except (InputError, OSError) as e:
+        parser.exit(2, f'error: {e}\n')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+import importlib
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from .scoring import TaskIndex, analyze_all_tasks, normalize_tasks, parse_date
+
+
+MAGIC = b'TASKCOL1'
+VERSION = 1
+SUFFIX = '.tcol'
+HEADER = struct.Struct('<8sIIQQ')
+COLUMNS = (
+    ('ids', 'q'),
+    ('due', 'i'),
+    ('importance', 'd'),
+    ('hours', 'd'),
+    ('raw_score', 'd'),
+    ('priority_score', 'd'),
+    ('dep_indptr', 'q'),
+    ('dep_indices', 'q'),
+    ('title_offsets', 'q'),
+    ('title_data', 'B'),
+)
+SECTION = struct.Struct('<QQ')
+NUMPY_TYPES = {'q': '<i8', 'i': '<i4', 'd': '<f8', 'B': 'u1'}
+
+
+class SnapshotFormatError(ValueError):
+    pass
+
+
+def is_snapshot(path):
+    try:
+        with open(path, 'rb') as handle:
+            return handle.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _column(typecode, values):
+    packed = array(typecode, values)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed
+
+
+def _number(value, default):
+    if value is None:
+        return float(default)
+    return float(value)
+
+
+def write_snapshot(path, tasks, task_index=None):
+    if task_index is None:
+        task_index = normalize_tasks(tasks)
+
+    for task_id in task_index.ids:
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            raise SnapshotFormatError(f'Columnar snapshots need integer task ids, got {task_id!r}')
+
+    indptr = [0]
+    for resolved in task_index.blockers:
+        indptr.append(indptr[-1] + len(resolved))
+
+    titles = bytearray()
+    title_offsets = [0]
+    for task in tasks:
+        titles += str(task.get('title', '')).encode('utf-8')
+        title_offsets.append(len(titles))
+
+    due = []
+    for task in tasks:
+        parsed = parse_date(task.get('due_date'))
+        due.append(parsed.toordinal() if parsed else 0)
+
+    columns = {
+        'ids': _column('q', task_index.ids),
+        'due': _column('i', due),
+        'importance': _column('d', (_number(t.get('importance'), 5) for t in tasks)),
+        'hours': _column('d', (_number(t.get('estimated_hours'), 1) for t in tasks)),
+        'raw_score': _column('d', (_number(t.get('raw_score'), math.nan) for t in tasks)),
+        'priority_score': _column('d', (_number(t.get('priority_score'), math.nan) for t in tasks)),
+        'dep_indptr': _column('q', indptr),
+        'dep_indices': _column('q', (j for resolved in task_index.blockers for j in resolved)),
+        'title_offsets': _column('q', title_offsets),
+        'title_data': array('B', titles),
+    }
+
+    offset = HEADER.size + SECTION.size * len(COLUMNS)
+    sections = []
+    for name, _ in COLUMNS:
+        offset += -offset % 8
+        size = len(columns[name]) * columns[name].itemsize
+        sections.append((offset, size))
+        offset += size
+
+    temporary = f'{path}.tmp{os.getpid()}'
+    with open(temporary, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, 0, len(tasks), indptr[-1]))
+        for section in sections:
+            handle.write(SECTION.pack(*section))
+        for (name, _), (start, _) in zip(COLUMNS, sections):
+            handle.write(b'\0' * (start - handle.tell()))
+            columns[name].tofile(handle)
+    os.replace(temporary, path)
+    return path
+
+
+class ColumnarSnapshot:
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._views = []
+        with open(self.path, 'rb') as handle:
+            try:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotFormatError(f'{self.path} is empty')
+
+        try:
+            magic, version, _, self.task_count, self.edge_count = HEADER.unpack_from(self._map)
+        except struct.error:
+            self.close()
+            raise SnapshotFormatError(f'{self.path} is truncated')
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise SnapshotFormatError(f'{self.path} is not a version {VERSION} task snapshot')
+
+        self.sections = {}
+        for k, (name, typecode) in enumerate(COLUMNS):
+            start, size = SECTION.unpack_from(self._map, HEADER.size + k * SECTION.size)
+            if start + size > len(self._map):
+                self.close()
+                raise SnapshotFormatError(f'{self.path} is truncated')
+            self.sections[name] = (start, size, typecode)
+            setattr(self, name, self._view(start, size, typecode))
+
+    def _view(self, start, size, typecode):
+        if sys.byteorder != 'little' and typecode != 'B':
+            swapped = array(typecode)
+            swapped.frombytes(self._map[start:start + size])
+            swapped.byteswap()
+            return swapped
+        raw = memoryview(self._map)[start:start + size]
+        view = raw.cast(typecode)
+        self._views.extend((raw, view))
+        return view
+
+    def __len__(self):
+        return self.task_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        if not self._map.closed:
+            self._map.close()
+
+    def arrays(self):
+        np = importlib.import_module('numpy')
+        return {
+            name: np.frombuffer(self._map, dtype=NUMPY_TYPES[typecode], count=size // struct.calcsize(typecode),
+                                offset=start)
+            for name, (start, size, typecode) in self.sections.items()
+        }
+
+    def title(self, i):
+        return bytes(self.title_data[self.title_offsets[i]:self.title_offsets[i + 1]]).decode('utf-8')
+
+    def blockers(self, i):
+        return self.dep_indices[self.dep_indptr[i]:self.dep_indptr[i + 1]].tolist()
+
+    def task(self, i):
+        ids = self.ids
+        task = {'id': ids[i], 'title': self.title(i)}
+        if self.due[i]:
+            task['due_date'] = date.fromordinal(self.due[i]).isoformat()
+        task['importance'] = _restore(self.importance[i])
+        task['estimated_hours'] = _restore(self.hours[i])
+        task['dependencies'] = [ids[j] for j in self.blockers(i)]
+        if not math.isnan(self.raw_score[i]):
+            task['raw_score'] = self.raw_score[i]
+        if not math.isnan(self.priority_score[i]):
+            task['priority_score'] = self.priority_score[i]
+        return task
+
+    def tasks(self, positions=None):
+        if positions is None:
+            positions = range(self.task_count)
+        return [self.task(i) for i in positions]
+
+    def task_index(self):
+        indptr = self.dep_indptr.tolist()
+        indices = self.dep_indices.tolist()
+        return TaskIndex.from_blockers(
+            self.ids.tolist(),
+            [indices[indptr[i]:indptr[i + 1]] for i in range(self.task_count)]
+        )
+
+    def analyze(self, strategy='smart_balance', reference_date=None, work_calendar=None, propagation=None):
+        return analyze_all_tasks(
+            self.tasks(),
+            strategy,
+            score_cache={},
+            reference_date=reference_date,
+            work_calendar=work_calendar,
+            task_index=self.task_index(),
+            propagation=propagation
+        )
+
+
+def _restore(value):
+    return int(value) if value.is_integer() else value
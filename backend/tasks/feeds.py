@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from datetime import date
+from .cache import LRUCache
+
+
+class Feed:
+
+    def __init__(self, compute, fingerprint=None, today=date.today, check_interval=15.0):
+        self.compute = compute
+        self.fingerprint = fingerprint
+        self.today = today
+        self.check_interval = check_interval
+        self.sequence = 0
+        self.event = None
+        self.computations = 0
+        self.subscribers = 0
+        self._day = None
+        self._seen = None
+        self._checked = 0.0
+        self._dirty = True
+        self._changed = threading.Condition()
+        self._refreshing = threading.Lock()
+
+    def notify(self):
+        with self._changed:
+            self._dirty = True
+            self._changed.notify_all()
+
+    def _stale(self, today):
+        if self._dirty or today != self._day:
+            return True
+        if self.fingerprint is None or time.monotonic() - self._checked < self.check_interval:
+            return False
+        self._checked = time.monotonic()
+        return self.fingerprint() != self._seen
+
+    def refresh(self):
+        if not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            today = self.today()
+            if not self._stale(today):
+                return
+            with self._changed:
+                self._dirty = False
+            try:
+                seen = self.fingerprint() if self.fingerprint else None
+                event = self.compute(today)
+            except Exception:
+                self.notify()
+                raise
+            self.computations += 1
+            self._day, self._seen, self._checked = today, seen, time.monotonic()
+            with self._changed:
+                if event != self.event:
+                    self.event = event
+                    self.sequence += 1
+                self._changed.notify_all()
+        finally:
+            self._refreshing.release()
+
+    def next_event(self, after=0, timeout=15.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            self.refresh()
+            with self._changed:
+                if self.sequence > after or (self.sequence and after > self.sequence):
+                    return self.sequence, self.event
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._changed.wait(min(remaining, 0.05 if self._dirty else self.check_interval))
+
+    def subscribe(self, after=0, heartbeat=15.0, max_seconds=None):
+        with self._changed:
+            self.subscribers += 1
+        try:
+            started = time.monotonic()
+            while max_seconds is None or time.monotonic() - started < max_seconds:
+                update = self.next_event(after, heartbeat)
+                if update is None:
+                    yield None
+                    continue
+                after = update[0]
+                yield update
+        finally:
+            with self._changed:
+                self.subscribers -= 1
+
+
+def format_event(sequence, event, name='ranking'):
+    return f'id: {sequence}\nevent: {name}\ndata: {json.dumps(event, separators=(",", ":"))}\n\n'
+
+
+def format_error(message, **extra):
+    return f'event: error\ndata: {json.dumps(dict(extra, error=message), separators=(",", ":"))}\n\n'
+
+
+class FeedRegistry:
+
+    def __init__(self, max_backlogs=256):
+        self._backlogs = LRUCache(max_backlogs)
+        self._lock = threading.Lock()
+
+    def get(self, backlog, name, factory):
+        with self._lock:
+            feeds = self._backlogs.get(backlog)
+            if feeds is None:
+                feeds = {}
+                self._backlogs.set(backlog, feeds)
+            feed = feeds.get(name)
+            if feed is None:
+                feed = feeds[name] = factory()
+            return feed
+
+    def notify(self, backlog):
+        with self._lock:
+            feeds = list(self._backlogs.get(backlog, {}).values())
+        for feed in feeds:
+            feed.notify()
+
+    def clear(self):
+        self._backlogs.clear()
@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+from .graph import ReachabilityIndex
+from .instrumentation import stage
+from .scoring import (
+    DOWNSTREAM_STRATEGIES,
+    default_calendar,
+    is_weekend,
+    normalize_tasks,
+    parse_date,
+    propagate_scores,
+    score_from_components
+)
+
+
+def forecast_rankings(tasks, strategy='smart_balance', start_date=None, days=30, top=10,
+                      work_calendar=None):
+    start_date = start_date or date.today()
+    work_calendar = work_calendar or default_calendar
+
+    if not tasks:
+        return {'days': [], 'series': []}
+
+    index = normalize_tasks(tasks)
+    downstream = [0] * len(tasks)
+    if strategy in DOWNSTREAM_STRATEGIES:
+        with stage('reachability'):
+            downstream = ReachabilityIndex(index.successors).counts()
+    dependents = index.successors
+    cycles = index.cycle_positions()
+    in_cycle = [i in cycles for i in range(len(tasks))]
+
+    due_dates = [parse_date(t.get('due_date')) for t in tasks]
+    known = [d for d in due_dates if d is not None]
+    end_date = start_date + timedelta(days=days + 30)
+    work_calendar.ensure_range(min(known + [start_date]), max(known + [end_date]))
+
+    profiles = []
+    for task, due, count in zip(tasks, due_dates, downstream):
+        profiles.append((
+            due.toordinal() if due else None,
+            work_calendar.day_index(due) if due else None,
+            is_weekend(due) if due else None,
+            max(1, min(10, task.get('importance', 5))),
+            task.get('estimated_hours', 1),
+            count
+        ))
+
+    previous_rank = None
+    timeline = []
+    rank_history = []
+    score_history = []
+
+    for offset in range(days):
+        today = start_date + timedelta(days=offset)
+        today_ordinal = today.toordinal()
+        today_index = work_calendar.day_index(today)
+        today_is_working = work_calendar.is_working_day(today)
+        fallback = today + timedelta(days=30)
+        fallback_profile = (
+            30,
+            work_calendar.working_days_between(today, fallback),
+            is_weekend(fallback)
+        )
+
+        memo = {}
+        raw_scores = []
+        for due_ordinal, due_index, due_on_weekend, importance, hours, count in profiles:
+            if due_ordinal is None:
+                days_until_due, working_days_left, due_on_weekend = fallback_profile
+            else:
+                days_until_due = due_ordinal - today_ordinal
+                working_days_left = max(0, due_index - today_index)
+
+            key = (days_until_due, working_days_left, due_on_weekend, importance, hours, count)
+            score = memo.get(key)
+            if score is None:
+                score = score_from_components(
+                    strategy, days_until_due, working_days_left, today_is_working,
+                    due_on_weekend, importance, hours, count
+                )
+                memo[key] = score
+            raw_scores.append(score)
+
+        scores = propagate_scores(raw_scores, dependents)
+        for i, cyclic in enumerate(in_cycle):
+            if cyclic:
+                scores[i] = 999.0
+
+        ranking = sorted(range(len(tasks)), key=lambda i: (-scores[i], i))
+        rank = [0] * len(tasks)
+        for position, i in enumerate(ranking):
+            rank[i] = position
+
+        changed = 0 if previous_rank is None else sum(1 for a, b in zip(rank, previous_rank) if a != b)
+        previous_rank = rank
+
+        timeline.append({
+            'date': today.isoformat(),
+            'is_working_day': today_is_working,
+            'rank_changes': changed,
+            'top': [
+                {'id': tasks[i]['id'], 'title': tasks[i].get('title', f"Task {tasks[i]['id']}"),
+                 'priority_score': scores[i]}
+                for i in ranking[:top]
+            ]
+        })
+        rank_history.append(rank)
+        score_history.append(scores)
+
+    tracked = sorted({i for history in rank_history for i, r in enumerate(history) if r < top})
+    series = [
+        {
+            'id': tasks[i]['id'],
+            'title': tasks[i].get('title', f"Task {tasks[i]['id']}"),
+            'ranks': [history[i] + 1 for history in rank_history],
+            'scores': [history[i] for history in score_history]
+        }
+        for i in tracked
+    ]
+
+    return {'days': timeline, 'series': series}
@@ -0,0 +1,214 @@
+import heapq
+
+try:
+    _popcount = int.bit_count
+except AttributeError:
+    def _popcount(value):
+        return bin(value).count('1')
+
+
+def strongly_connected_components(successors):
+    n = len(successors)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    component = [-1] * n
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+
+        while work:
+            v, pos = work[-1]
+            succ = successors[v]
+            if pos < len(succ):
+                work[-1] = (v, pos + 1)
+                w = succ[pos]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            work.pop()
+            if work:
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+
+            if low[v] == index[v]:
+                members = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = len(components)
+                    members.append(w)
+                    if w == v:
+                        break
+                components.append(members)
+
+    return component, components
+
+
+def cycle_positions(blockers, roots=None):
+    visited = [False] * len(blockers)
+    on_path = [False] * len(blockers)
+    cycles = set()
+
+    for root in range(len(blockers)) if roots is None else roots:
+        if visited[root]:
+            continue
+        visited[root] = on_path[root] = True
+        work = [(root, 0)]
+
+        while work:
+            v, k = work[-1]
+            if k < len(blockers[v]):
+                work[-1] = (v, k + 1)
+                w = blockers[v][k]
+                if not visited[w]:
+                    visited[w] = on_path[w] = True
+                    work.append((w, 0))
+                elif on_path[w]:
+                    cycles.add(w)
+                    cycles.update(u for u, _ in work)
+                    break
+                continue
+            on_path[v] = False
+            work.pop()
+
+    return cycles
+
+
+def predecessors(successors):
+    blockers = [[] for _ in successors]
+    for v, succ in enumerate(successors):
+        for w in succ:
+            blockers[w].append(v)
+    return blockers
+
+
+def weakly_connected_components(successors):
+    parent = list(range(len(successors)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for v, succ in enumerate(successors):
+        for w in succ:
+            a, b = find(v), find(w)
+            if a != b:
+                parent[a] = b
+
+    roots = {}
+    component = []
+    members = []
+    for v in range(len(successors)):
+        root = find(v)
+        c = roots.get(root)
+        if c is None:
+            c = roots[root] = len(members)
+            members.append([])
+        component.append(c)
+        members[c].append(v)
+    return component, members
+
+
+def split_by_component(successors, chunks):
+    _, members = weakly_connected_components(successors)
+    bins = [(0, b, []) for b in range(min(chunks, len(members)))]
+    heapq.heapify(bins)
+    for group in sorted(members, key=len, reverse=True):
+        size, b, positions = heapq.heappop(bins)
+        positions.extend(group)
+        heapq.heappush(bins, (size + len(group), b, positions))
+    return [sorted(positions) for _, _, positions in sorted(bins, key=lambda item: item[1]) if positions]
+
+
+def transitive_reduction(successors):
+    component, components = strongly_connected_components(successors)
+
+    reach = []
+    kept = []
+    for c, members in enumerate(components):
+        targets = {component[w] for v in members for w in successors[v]}
+        targets.discard(c)
+        covered = 0
+        direct = set()
+        for d in sorted(targets, reverse=True):
+            if not covered >> d & 1:
+                direct.add(d)
+                covered |= reach[d]
+        reach.append(covered | 1 << c)
+        kept.append(direct)
+
+    return [
+        [w for w in succ if component[w] == component[v] or component[w] in kept[component[v]]]
+        for v, succ in enumerate(successors)
+    ]
+
+
+class ReachabilityIndex:
+
+    def __init__(self, successors):
+        self.component, self.components = strongly_connected_components(successors)
+
+        reach = []
+        for c, members in enumerate(self.components):
+            targets = {self.component[w] for v in members for w in successors[v]}
+            targets.discard(c)
+            bits = 1 << c
+            for d in targets:
+                bits |= reach[d]
+            reach.append(bits)
+        self.reach = reach
+
+    def _component_sums(self, values):
+        if all(v == 1 for v in values):
+            return [_popcount(bits) for bits in self.reach]
+
+        size = (len(values) + 7) // 8
+        planes = []
+        for k in range(max(values, default=0).bit_length()):
+            buf = bytearray(size)
+            for c, value in enumerate(values):
+                if value >> k & 1:
+                    buf[c >> 3] |= 1 << (c & 7)
+            planes.append(int.from_bytes(buf, 'little'))
+
+        return [
+            sum(_popcount(bits & plane) << k for k, plane in enumerate(planes))
+            for bits in self.reach
+        ]
+
+    def counts(self):
+        totals = self._component_sums([len(m) for m in self.components])
+        return [totals[c] - 1 for c in self.component]
+
+    def weights(self, values, scale=100):
+        scaled = [max(0, int(round(v * scale))) for v in values]
+        comp_values = [0] * len(self.components)
+        for v, c in enumerate(self.component):
+            comp_values[c] += scaled[v]
+
+        totals = self._component_sums(comp_values)
+        return [
+            round((totals[c] - scaled[v]) / scale, 2)
+            for v, c in enumerate(self.component)
+        ]
@@ -0,0 +1,69 @@
+import base64
+import importlib
+import sys
+from array import array
+from .graph import cycle_positions, predecessors
+
+
+EDGE_ENCODING = 'int32le-pairs'
+
+
+class CodecUnavailable(RuntimeError):
+    pass
+
+
+def pack_edges(successors):
+    packed = array('i')
+    for v, succ in enumerate(successors):
+        for w in succ:
+            packed.append(v)
+            packed.append(w)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed
+
+
+def unpack_edges(data):
+    packed = array('i')
+    packed.frombytes(data)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return list(zip(packed[0::2], packed[1::2]))
+
+
+def encode_graph(ids, scores, successors, titles=None, edge_format='json', cycles=None):
+    if cycles is None:
+        cycles = cycle_positions(predecessors(successors))
+    circular = [1 if v in cycles else 0 for v in range(len(ids))]
+
+    packed = pack_edges(successors)
+    graph = {
+        'node_count': len(ids),
+        'edge_count': len(packed) // 2,
+        'ids': list(ids),
+        'scores': list(scores),
+        'circular': circular
+    }
+    if titles is not None:
+        graph['titles'] = list(titles)
+
+    if edge_format == 'json':
+        graph['edges'] = packed.tolist()
+    elif edge_format == 'base64':
+        graph['edge_encoding'] = EDGE_ENCODING
+        graph['edges'] = base64.b64encode(packed.tobytes()).decode('ascii')
+    elif edge_format == 'msgpack':
+        graph['edge_encoding'] = EDGE_ENCODING
+        graph['edges'] = packed.tobytes()
+    else:
+        raise ValueError(f'Unknown edge format {edge_format}')
+
+    return graph
+
+
+def to_msgpack(graph):
+    try:
+        msgpack = importlib.import_module('msgpack')
+    except ImportError:
+        raise CodecUnavailable('msgpack is not installed on this server')
+    return msgpack.packb(graph, use_bin_type=True)
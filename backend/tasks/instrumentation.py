@@ -0,0 +1,163 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = ContextVar('task_analyzer_timings', default=None)
+
+
+class StageTimings:
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def as_dict(self):
+        return {
+            'stages_ms': {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+            'counters': dict(self.counters)
+        }
+
+    def server_timing(self):
+        return ', '.join(
+            f'{name};dur={seconds * 1000:.3f}' for name, seconds in self.stages.items()
+        )
+
+
+@contextmanager
+def recording():
+    recorder = StageTimings()
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name):
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(name, time.perf_counter() - start)
+
+
+def count(name, amount=1):
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.count(name, amount)
+
+
+def is_recording():
+    return _current.get() is not None
+
+
+class Histogram:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+
+    def observe(self, name, labels, value, help_text=''):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+                self._help.setdefault(name, ('histogram', help_text))
+            histogram.observe(value)
+
+    def inc(self, name, labels, amount=1, help_text=''):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._help.setdefault(name, ('counter', help_text))
+
+    def record(self, endpoint, recorder, elapsed, status_code):
+        self.observe('task_analyzer_request_seconds', {'endpoint': endpoint}, elapsed,
+                     'End-to-end view latency.')
+        self.inc('task_analyzer_requests_total', {'endpoint': endpoint, 'status': str(status_code)},
+                 help_text='Instrumented requests served.')
+        for name, seconds in recorder.stages.items():
+            self.observe('task_analyzer_stage_seconds', {'endpoint': endpoint, 'stage': name}, seconds,
+                         'Time spent per pipeline stage.')
+        for name, amount in recorder.counters.items():
+            self.inc('task_analyzer_work_total', {'endpoint': endpoint, 'counter': name}, amount,
+                     'Work units counted inside the scoring pipeline.')
+
+    def render(self):
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            help_texts = dict(self._help)
+
+        lines = []
+        seen = set()
+
+        def header(name):
+            if name not in seen:
+                seen.add(name)
+                kind, text = help_texts[name]
+                if text:
+                    lines.append(f'# HELP {name} {text}')
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (name, labels), value in counters:
+            header(name)
+            lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        for (name, labels), histogram in histograms:
+            header(name)
+            for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", repr(bound)),))} {bucket_count}')
+            lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {histogram.total}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum:.6f}')
+            lines.append(f'{name}_count{_format_labels(labels)} {histogram.total}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{escaped}"')
+    return '{' + ','.join(parts) + '}'
+
+
+registry = MetricsRegistry()
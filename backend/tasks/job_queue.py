@@ -0,0 +1,119 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from .jobs import canonical_payload, compress, content_hash, unpack_result
+from .models import AnalysisJob
+
+
+def job_ttl():
+    return timedelta(seconds=getattr(settings, 'ANALYSIS_JOB_TTL', 3600))
+
+
+def job_lease():
+    return timedelta(seconds=getattr(settings, 'ANALYSIS_JOB_LEASE', 60))
+
+
+def submit_job(tasks, strategy, options):
+    payload = canonical_payload(tasks, strategy, options)
+    digest = content_hash(payload)
+    now = timezone.now()
+
+    existing = (
+        AnalysisJob.objects
+        .filter(content_hash=digest)
+        .filter(Q(status__in=['queued', 'running']) | Q(status='done', expires_at__gt=now))
+        .order_by('-created_at')
+        .first()
+    )
+    if existing is not None:
+        return existing, True
+
+    job = AnalysisJob.objects.create(
+        content_hash=digest,
+        task_count=len(tasks),
+        payload=compress(payload),
+        expires_at=now + job_ttl()
+    )
+    return job, False
+
+
+def claim_next_job(worker_id=''):
+    candidates = (
+        AnalysisJob.objects
+        .filter(status='queued')
+        .order_by('created_at')
+        .values_list('id', flat=True)[:10]
+    )
+    for job_id in candidates:
+        now = timezone.now()
+        claimed = AnalysisJob.objects.filter(id=job_id, status='queued').update(
+            status='running',
+            worker_id=worker_id,
+            started_at=now,
+            heartbeat_at=now
+        )
+        if claimed:
+            return AnalysisJob.objects.get(id=job_id)
+    return None
+
+
+def finish_job(job_id, result=None, error=None, worker_id=None):
+    now = timezone.now()
+    jobs = AnalysisJob.objects.filter(id=job_id)
+    if worker_id is not None:
+        jobs = jobs.filter(status='running', worker_id=worker_id)
+    return jobs.update(
+        status='failed' if error else 'done',
+        result=result,
+        error=error or '',
+        payload=b'',
+        finished_at=now,
+        expires_at=now + job_ttl()
+    )
+
+
+def renew_leases(worker_id, job_ids):
+    return AnalysisJob.objects.filter(id__in=job_ids, status='running', worker_id=worker_id).update(
+        heartbeat_at=timezone.now()
+    )
+
+
+def requeue_expired_jobs():
+    stale = Q(heartbeat_at__isnull=True) | Q(heartbeat_at__lt=timezone.now() - job_lease())
+    return AnalysisJob.objects.filter(stale, status='running').update(
+        status='queued',
+        worker_id='',
+        started_at=None,
+        heartbeat_at=None
+    )
+
+
+def purge_expired_jobs():
+    deleted, _ = AnalysisJob.objects.filter(
+        status__in=['done', 'failed'],
+        expires_at__lte=timezone.now()
+    ).delete()
+    return deleted
+
+
+def job_state(job):
+    state = {
+        'job_id': str(job.id),
+        'status': job.status,
+        'task_count': job.task_count,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'expires_at': job.expires_at.isoformat()
+    }
+    if job.status == 'queued':
+        state['queue_position'] = AnalysisJob.objects.filter(
+            status='queued',
+            created_at__lt=job.created_at
+        ).count() + 1
+    elif job.status == 'done':
+        state['result'] = unpack_result(bytes(job.result))
+    elif job.status == 'failed':
+        state['error'] = job.error
+    return state
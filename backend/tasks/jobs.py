@@ -0,0 +1,41 @@
+import hashlib
+import json
+import zlib
+from datetime import date
+from .pipeline import run_pipeline
+from .scoring import parse_date
+
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'Cannot serialize {type(value).__name__}')
+
+
+def canonical_payload(tasks, strategy, options):
+    body = {'tasks': tasks, 'strategy': strategy, 'options': options}
+    return json.dumps(body, sort_keys=True, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def content_hash(payload):
+    return hashlib.sha256(payload).hexdigest()
+
+
+def compress(data):
+    return zlib.compress(data, 6)
+
+
+def pack_result(result):
+    return compress(json.dumps(result, separators=(',', ':'), default=_default).encode('utf-8'))
+
+
+def unpack_result(data):
+    return json.loads(zlib.decompress(data))
+
+
+def execute_payload(data):
+    body = json.loads(zlib.decompress(data))
+    options = dict(body['options'])
+    options['reference_date'] = parse_date(options.get('reference_date'))
+    result, _ = run_pipeline(body['tasks'], body['strategy'], options, layout_limit=0)
+    return pack_result(result)
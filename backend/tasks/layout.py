@@ -0,0 +1,236 @@
+import math
+from .graph import cycle_positions, predecessors, strongly_connected_components, weakly_connected_components
+
+
+X_GAP = 120
+Y_GAP = 110
+MARGIN = 60
+MAX_VIEWPORT_SPAN = 1_000_000
+
+
+def layered_layout(successors, sweeps=4, x_gap=X_GAP, y_gap=Y_GAP):
+    n = len(successors)
+    if n == 0:
+        return {'x': [], 'y': [], 'layer': [], 'width': 0, 'height': 0, 'layers': 0}
+
+    component, components = strongly_connected_components(successors)
+    component_layer = [0] * len(components)
+    component_succ = [set() for _ in components]
+    for v, succ in enumerate(successors):
+        for w in succ:
+            if component[w] != component[v]:
+                component_succ[component[v]].add(component[w])
+
+    for c in reversed(range(len(components))):
+        for d in component_succ[c]:
+            if component_layer[c] + 1 > component_layer[d]:
+                component_layer[d] = component_layer[c] + 1
+
+    layer = [component_layer[component[v]] for v in range(n)]
+    layers = [[] for _ in range(max(layer) + 1)]
+    for v in range(n):
+        layers[layer[v]].append(v)
+
+    predecessors = [[] for _ in range(n)]
+    for v, succ in enumerate(successors):
+        for w in succ:
+            if layer[v] < layer[w]:
+                predecessors[w].append(v)
+    later = [[w for w in succ if layer[w] > layer[v]] for v, succ in enumerate(successors)]
+
+    x = [0.0] * n
+
+    def place(row):
+        offset = (len(row) - 1) / 2
+        for position, v in enumerate(row):
+            x[v] = (position - offset) * x_gap
+
+    for row in layers:
+        place(row)
+
+    def barycenter(row, neighbours):
+        keys = {}
+        for v in row:
+            linked = neighbours[v]
+            keys[v] = sum(x[u] for u in linked) / len(linked) if linked else x[v]
+        row.sort(key=lambda v: (keys[v], component[v]))
+        place(row)
+
+    for sweep in range(sweeps):
+        for row in layers[1:]:
+            barycenter(row, predecessors)
+        for row in reversed(layers[:-1]):
+            barycenter(row, later)
+
+    min_x = min(x)
+    xs = [round(value - min_x + MARGIN, 1) for value in x]
+    ys = [float(layer[v] * y_gap + MARGIN) for v in range(n)]
+
+    return {
+        'x': xs,
+        'y': ys,
+        'layer': layer,
+        'width': round(max(xs) + MARGIN, 1),
+        'height': round(max(ys) + MARGIN, 1),
+        'layers': len(layers)
+    }
+
+
+def grid_layout(sizes, x_gap=X_GAP, y_gap=Y_GAP):
+    order = sorted(range(len(sizes)), key=lambda c: -sizes[c])
+    columns = max(1, int(math.ceil(math.sqrt(len(sizes)))))
+    x = [0.0] * len(sizes)
+    y = [0.0] * len(sizes)
+    for position, c in enumerate(order):
+        x[c] = float((position % columns) * x_gap + MARGIN)
+        y[c] = float((position // columns) * y_gap + MARGIN)
+    return {
+        'x': x,
+        'y': y,
+        'width': max(x, default=0) + MARGIN,
+        'height': max(y, default=0) + MARGIN
+    }
+
+
+class SpatialIndex:
+
+    def __init__(self, x, y, tile_size=1000):
+        self.tile_size = tile_size
+        self.tiles = {}
+        for v, (px, py) in enumerate(zip(x, y)):
+            key = (int(px // tile_size), int(py // tile_size))
+            self.tiles.setdefault(key, []).append(v)
+        self.x = x
+        self.y = y
+        self.columns = (min((tx for tx, _ in self.tiles), default=0), max((tx for tx, _ in self.tiles), default=-1))
+        self.rows = (min((ty for _, ty in self.tiles), default=0), max((ty for _, ty in self.tiles), default=-1))
+
+    def query(self, x0, y0, x1, y1):
+        size = self.tile_size
+        tx0, tx1 = max(int(x0 // size), self.columns[0]), min(int(x1 // size), self.columns[1])
+        ty0, ty1 = max(int(y0 // size), self.rows[0]), min(int(y1 // size), self.rows[1])
+        if tx0 > tx1 or ty0 > ty1:
+            return []
+        if (tx1 - tx0 + 1) * (ty1 - ty0 + 1) > len(self.tiles):
+            keys = [(tx, ty) for tx, ty in self.tiles if tx0 <= tx <= tx1 and ty0 <= ty <= ty1]
+        else:
+            keys = [(tx, ty) for tx in range(tx0, tx1 + 1) for ty in range(ty0, ty1 + 1)]
+        found = []
+        for key in keys:
+            for v in self.tiles.get(key, ()):
+                if x0 <= self.x[v] <= x1 and y0 <= self.y[v] <= y1:
+                    found.append(v)
+        return sorted(found)
+
+
+class GraphView:
+
+    def __init__(self, nodes, edges, x, y, width, height, lod):
+        self.nodes = nodes
+        self.edges = edges
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.lod = lod
+        self.index = SpatialIndex(x, y)
+        self.incident = [[] for _ in nodes]
+        for k, (a, b, _, _) in enumerate(edges):
+            self.incident[a].append(k)
+            if b != a:
+                self.incident[b].append(k)
+
+    def render(self, viewport=None):
+        if viewport is None:
+            visible = range(len(self.nodes))
+            edge_ids = range(len(self.edges))
+        else:
+            visible = self.index.query(*viewport)
+            edge_ids = sorted({k for v in visible for k in self.incident[v]})
+
+        shown = set(visible)
+        outside = set()
+        edges = []
+        for k in edge_ids:
+            a, b, is_circular, weight = self.edges[k]
+            for v in (a, b):
+                if v not in shown:
+                    outside.add(v)
+            edge = {'from': self.nodes[a]['id'], 'to': self.nodes[b]['id'], 'is_circular': is_circular}
+            if weight > 1:
+                edge['count'] = weight
+            edges.append(edge)
+
+        nodes = []
+        for v in list(visible) + sorted(outside):
+            node = dict(self.nodes[v], x=self.x[v], y=self.y[v])
+            if v in outside:
+                node['outside'] = True
+            nodes.append(node)
+
+        return {
+            'lod': self.lod,
+            'bounds': {'width': self.width, 'height': self.height},
+            'total_nodes': len(self.nodes),
+            'total_edges': len(self.edges),
+            'nodes': nodes,
+            'edges': edges
+        }
+
+
+def build_graph_view(ids, titles, scores, successors, lod='none', cycles=None):
+    n = len(ids)
+    component, components = strongly_connected_components(successors)
+    if cycles is None:
+        cycles = cycle_positions(predecessors(successors))
+    circular = [v in cycles for v in range(n)]
+
+    if lod == 'none':
+        layout = layered_layout(successors)
+        nodes = [
+            {'id': ids[v], 'title': titles[v], 'score': scores[v], 'is_circular': circular[v]}
+            for v in range(n)
+        ]
+        edges = [
+            (v, w, circular[v] and circular[w], 1)
+            for v, succ in enumerate(successors) for w in succ
+        ]
+        return GraphView(nodes, edges, layout['x'], layout['y'], layout['width'], layout['height'], lod)
+
+    if lod == 'component':
+        cluster_of, members = weakly_connected_components(successors)
+    else:
+        cluster_of, members = component, components
+
+    counts = {}
+    for v, succ in enumerate(successors):
+        for w in succ:
+            a, b = cluster_of[v], cluster_of[w]
+            if a != b:
+                counts[(a, b)] = counts.get((a, b), 0) + 1
+
+    nodes = []
+    for c, group in enumerate(members):
+        if len(group) == 1:
+            v = group[0]
+            nodes.append({'id': ids[v], 'title': titles[v], 'score': scores[v], 'is_circular': circular[v]})
+            continue
+        lead = max(group, key=lambda v: scores[v])
+        nodes.append({
+            'id': f'cluster-{c}',
+            'title': f'{len(group)} tasks (top: {titles[lead]})',
+            'score': scores[lead],
+            'is_circular': any(circular[v] for v in group),
+            'cluster_size': len(group)
+        })
+
+    edges = [(a, b, False, weight) for (a, b), weight in sorted(counts.items())]
+    if lod == 'component':
+        layout = grid_layout([len(group) for group in members])
+    else:
+        cluster_succ = [[] for _ in members]
+        for a, b, _, _ in edges:
+            cluster_succ[a].append(b)
+        layout = layered_layout(cluster_succ)
+
+    return GraphView(nodes, edges, layout['x'], layout['y'], layout['width'], layout['height'], lod)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from tasks.cli import InputError, add_arguments, run
+
+
+class Command(BaseCommand):
+    help = 'Rank a task backlog from a JSON, NDJSON or CSV file (or stdin) without going through the API'
+
+    def add_arguments(self, parser):
+        add_arguments(parser)
+
+    def handle(self, *args, **options):
+        try:
+            run(options, stdout=self.stdout, stderr=self.stderr)
+        except (InputError, OSError) as e:
+            raise CommandError(str(e))
@@ -0,0 +1,104 @@
+import json
+import pstats
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from tasks.profiling import MODES, capturing
+from tasks.views import profile_store
+
+
+class Command(BaseCommand):
+    help = 'List, show and replay request profiles captured with ?profile= or X-Profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['list', 'show', 'replay'])
+        parser.add_argument('profile_id', nargs='?')
+        parser.add_argument('--profiler', choices=list(MODES) + ['none'], default='cprofile',
+                            help='Profiler to run the replay under')
+        parser.add_argument('--repeat', type=int, default=1)
+        parser.add_argument('--sort', default='cumulative', help='pstats sort key')
+        parser.add_argument('--limit', type=int, default=25, help='Rows of profile output to print')
+        parser.add_argument('--output', help='Also write the replay profile to this file')
+
+    def handle(self, *args, **options):
+        if options['action'] == 'list':
+            return self.list_profiles()
+
+        if not options['profile_id']:
+            raise CommandError(f"{options['action']} needs a profile id")
+        meta = profile_store.load(options['profile_id'])
+        if meta is None:
+            raise CommandError(f"No profile {options['profile_id']}")
+
+        if options['action'] == 'show':
+            self.print_profile(meta['mode'], profile_store.output_path(meta), options)
+        else:
+            self.replay(meta, options)
+
+    def list_profiles(self):
+        entries = profile_store.list()
+        if not entries:
+            self.stdout.write('No profiles captured')
+        for meta in entries:
+            created = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(meta['created']))
+            self.stdout.write(
+                f"{meta['id']}  {created}  {meta['endpoint']:<8} {meta['mode']:<8} "
+                f"{meta['task_count']:>7} tasks  {meta['elapsed_ms']:>10.1f} ms  status {meta['status']}"
+            )
+
+    def print_profile(self, mode, path, options):
+        if mode == 'cprofile':
+            stats = pstats.Stats(path, stream=self.stdout)
+            stats.sort_stats(options['sort']).print_stats(options['limit'])
+            return
+        with open(path, encoding='utf-8') as handle:
+            for line in handle.readlines()[:options['limit']]:
+                self.stdout.write(line.rstrip('\n'))
+
+    def replay(self, meta, options):
+        if meta['payload'] is None:
+            raise CommandError(f"Profile {meta['id']} has no replayable payload")
+        path = reverse(f"{meta['endpoint']}_tasks")
+        view = resolve(path).func
+        body = json.dumps(meta['payload'])
+        factory = RequestFactory()
+
+        def call():
+            response = view(factory.post(path, body, content_type='application/json'))
+            response.render()
+            return response
+
+        timings = []
+        for _ in range(max(1, options['repeat']) - 1):
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+
+        capture = None
+        start = time.perf_counter()
+        if options['profiler'] == 'none':
+            response = call()
+        else:
+            with capturing(options['profiler']) as capture:
+                response = call()
+        timings.append(time.perf_counter() - start)
+
+        self.stdout.write(
+            f"Replayed {meta['id']} ({meta['task_count']} tasks): status {response.status_code}, "
+            f"median {statistics.median(timings) * 1000:.1f} ms over {len(timings)} run(s), "
+            f"captured {meta['elapsed_ms']:.1f} ms"
+        )
+        if capture is None:
+            return
+        if not capture.active:
+            raise CommandError('Another profiler is already active in this process')
+        if options['output']:
+            capture.write(options['output'])
+        if options['profiler'] == 'cprofile':
+            stats = pstats.Stats(capture.profiler, stream=self.stdout)
+            stats.sort_stats(options['sort']).print_stats(options['limit'])
+        else:
+            for line in capture.profiler.folded().splitlines()[:options['limit']]:
+                self.stdout.write(line)
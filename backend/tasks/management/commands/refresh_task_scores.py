@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from tasks.materialize import refresh_scores
+from tasks.models import Workspace
+from tasks.search import update_statistics
+from tasks.scoring import STRATEGY_NAMES, parse_date
+
+
+class Command(BaseCommand):
+    help = 'Store priority scores, blocker counts and cycle flags on Task rows for the admin'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workspace', action='append', dest='workspaces', metavar='SLUG',
+                            help='Only refresh these workspaces (repeatable); default is every backlog')
+        parser.add_argument('--strategy', choices=sorted(STRATEGY_NAMES), default='smart_balance')
+        parser.add_argument('--reference-date', help='Score as of this date (YYYY-MM-DD)')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        reference_date = None
+        if options['reference_date']:
+            reference_date = parse_date(options['reference_date'])
+            if reference_date is None:
+                raise CommandError('reference date must be YYYY-MM-DD')
+
+        if options['workspaces']:
+            workspaces = list(Workspace.objects.filter(slug__in=options['workspaces']))
+            missing = set(options['workspaces']) - {w.slug for w in workspaces}
+            if missing:
+                raise CommandError(f"Unknown workspace(s): {', '.join(sorted(missing))}")
+        else:
+            workspaces = [None] + list(Workspace.objects.all())
+
+        for workspace in workspaces:
+            refreshed = refresh_scores(workspace, options['strategy'], reference_date, options['batch_size'])
+            name = workspace.slug if workspace else '(no workspace)'
+            self.stdout.write(f'{name}: {refreshed} task(s) scored')
+        update_statistics()
@@ -0,0 +1,81 @@
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from django.core.management.base import BaseCommand
+from tasks.job_queue import claim_next_job, finish_job, job_lease, purge_expired_jobs, renew_leases, requeue_expired_jobs
+from tasks.jobs import execute_payload
+
+
+class InlineExecutor:
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Drain the analysis job queue with a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes; 0 runs jobs inside this process')
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        slots = max(1, processes)
+        executor = ProcessPoolExecutor(max_workers=processes) if processes > 0 else InlineExecutor()
+        poll = options['poll_interval']
+        worker_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        renew_every = job_lease().total_seconds() / 3
+
+        running = {}
+        completed = 0
+        renewed = time.monotonic()
+        try:
+            while True:
+                requeued = requeue_expired_jobs()
+                if requeued:
+                    self.stdout.write(f'Requeued {requeued} job(s) with an expired lease')
+                purge_expired_jobs()
+                if running and time.monotonic() - renewed >= renew_every:
+                    renew_leases(worker_id, list(running.values()))
+                    renewed = time.monotonic()
+                while len(running) < slots:
+                    job = claim_next_job(worker_id)
+                    if job is None:
+                        break
+                    running[executor.submit(execute_payload, bytes(job.payload))] = job.id
+
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(poll)
+                    continue
+
+                done, _ = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        finish_job(job_id, result=future.result(), worker_id=worker_id)
+                    except Exception as e:
+                        finish_job(job_id, error=f'{type(e).__name__}: {e}', worker_id=worker_id)
+                        self.stderr.write(f'Job {job_id} failed: {e}')
+                    completed += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {completed} job(s)'))
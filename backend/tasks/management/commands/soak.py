@@ -0,0 +1,93 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from tasks.soak import DEFAULT_MIX, growth_failures, parse_mix, run_soak
+
+
+def _mib(value):
+    return value / 1024 / 1024
+
+
+class Command(BaseCommand):
+    help = 'Replay a synthetic request mix through the test client and report memory growth per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000,
+                            help='Requests timed and sampled for RSS after warmup, with tracemalloc off')
+        parser.add_argument('--warmup', type=int, default=200,
+                            help='Requests replayed before each measured phase, so caches reach their size limits')
+        parser.add_argument('--traced', type=int, default=300,
+                            help='Requests replayed under tracemalloc for growth and allocation sites (0 to skip)')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help='Comma separated endpoint=weight pairs')
+        parser.add_argument('--tasks', type=int, default=100, help='Tasks per synthetic request')
+        parser.add_argument('--variants', type=int, default=50, help='Distinct backlogs replayed per endpoint')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--frames', type=int, default=10, help='Stack frames tracemalloc keeps per allocation')
+        parser.add_argument('--sample-every', type=int, default=250)
+        parser.add_argument('--top', type=int, default=15, help='Allocation sites to report')
+        parser.add_argument('--max-growth-kb', type=float, default=1024,
+                            help='Fail when traced memory grows more than this over the traced requests')
+        parser.add_argument('--max-rss-growth-mb', type=float,
+                            help='Fail when RSS grows more than this over the measured requests')
+        parser.add_argument('--host', default='localhost', help='Host header sent with each request')
+        parser.add_argument('--output', help='Also write the full report as JSON to this file')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        for name in ('iterations', 'tasks', 'variants', 'frames', 'sample_every'):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1")
+
+        report = run_soak(
+            Client(HTTP_HOST=options['host']),
+            options['iterations'],
+            mix,
+            size=options['tasks'],
+            variants=options['variants'],
+            warmup=max(0, options['warmup']),
+            traced=max(0, options['traced']),
+            frames=options['frames'],
+            seed=options['seed'],
+            sample_every=options['sample_every'],
+            top=options['top']
+        )
+
+        self.stdout.write(f"{'endpoint':<10} {'requests':>8} {'errors':>6} {'mean ms':>9} "
+                          f"{'peak alloc':>11} {'peak RSS':>10} {'steady RSS':>11}")
+        for name, entry in report['endpoints'].items():
+            peak_alloc = '-' if entry['peak_alloc_bytes'] is None else f"{_mib(entry['peak_alloc_bytes']):.1f} MiB"
+            self.stdout.write(
+                f"{name:<10} {entry['requests']:>8} {entry['errors']:>6} {entry['mean_ms']:>9.1f} "
+                f"{peak_alloc:>11} {_mib(entry['peak_rss_bytes']):>6.1f} MiB {_mib(entry['steady_rss_bytes']):>7.1f} MiB"
+            )
+
+        self.stdout.write('')
+        for sample in report['samples']:
+            self.stdout.write(f"after {sample['iteration']:>7} requests: RSS {_mib(sample['rss']):.1f} MiB")
+        self.stdout.write(
+            f"RSS growth {_mib(report['rss_growth_bytes']):+.1f} MiB, peak RSS {_mib(report['peak_rss_bytes']):.1f} MiB"
+        )
+        if report['traced_growth_bytes'] is not None:
+            self.stdout.write(
+                f"traced growth {report['traced_growth_bytes'] / 1024:+.1f} KiB over {report['traced']} requests"
+            )
+
+        if report['allocation_sites']:
+            self.stdout.write('')
+            self.stdout.write('Retained over the traced requests, by allocation site:')
+            for site in report['allocation_sites']:
+                self.stdout.write(
+                    f"  {site['site']:<32} {site['size_diff'] / 1024:+10.1f} KiB {site['count_diff']:+8d} blocks"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+
+        failures = growth_failures(report, options['max_growth_kb'], options['max_rss_growth_mb'])
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write('No growth above the configured limits')
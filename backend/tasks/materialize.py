@@ -0,0 +1,46 @@
+from datetime import date
+from .models import Task
+from .scoring import analyze_all_tasks, normalize_tasks
+
+SCORE_FIELDS = ['priority_score', 'blocker_count', 'in_cycle', 'scored_at']
+
+
+def refresh_scores(workspace=None, strategy='smart_balance', reference_date=None, batch_size=2000):
+    from .views import WORKSPACE_TASK_FIELDS, workspace_runtimes
+
+    reference_date = reference_date or date.today()
+    tasks = list(Task.objects.filter(workspace=workspace).order_by('id').values(*WORKSPACE_TASK_FIELDS))
+    if not tasks:
+        return 0
+
+    score_cache = work_calendar = None
+    if workspace is not None:
+        runtime = workspace_runtimes.for_workspace(workspace)
+        score_cache, work_calendar = runtime.score_cache, runtime.calendar
+
+    task_index = normalize_tasks(tasks)
+    analyze_all_tasks(
+        tasks,
+        strategy,
+        score_cache=score_cache,
+        reference_date=reference_date,
+        work_calendar=work_calendar,
+        task_index=task_index
+    )
+    cycles = task_index.cycle_positions()
+
+    Task.objects.bulk_update(
+        [
+            Task(
+                id=task['id'],
+                priority_score=task['priority_score'],
+                blocker_count=len(task_index.blockers[i]),
+                in_cycle=i in cycles,
+                scored_at=reference_date
+            )
+            for i, task in enumerate(tasks)
+        ],
+        SCORE_FIELDS,
+        batch_size=batch_size
+    )
+    return len(tasks)
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-19 01:23
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Workspace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('holidays', models.JSONField(blank=True, default=list)),
+                ('max_tasks', models.IntegerField(default=100000, validators=[django.core.validators.MinValueValidator(1)])),
+                ('cpu_seconds_per_minute', models.FloatField(default=30.0, validators=[django.core.validators.MinValueValidator(0.1)])),
+                ('max_concurrent_analyses', models.IntegerField(default=2, validators=[django.core.validators.MinValueValidator(1)])),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['slug'],
+            },
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='workspace',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='tasks.workspace'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2 on 2026-10-19 01:45
+
+from django.db import migrations, models
+
+
+FTS_STATEMENTS = [
+    "CREATE VIRTUAL TABLE tasks_task_fts USING fts5(title, content='tasks_task', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(rowid, title) VALUES (new.id, new.title); END",
+    "CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+    "CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF title ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+    "INSERT INTO tasks_task_fts(rowid, title) VALUES (new.id, new.title); END",
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+
+
+def has_fts5(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return 'ENABLE_FTS5' in {row[0] for row in cursor.fetchall()}
+
+
+def create_fts(apps, schema_editor):
+    if has_fts5(schema_editor.connection):
+        for statement in FTS_STATEMENTS:
+            schema_editor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for trigger in ('insert', 'delete', 'update'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS tasks_task_fts_{trigger}')
+        schema_editor.execute('DROP TABLE IF EXISTS tasks_task_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_completed'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_ws_priority_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', '-priority_score', '-id'], name='task_ws_rank_idx'),
+        ),
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-19 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='analysisjob',
+            name='worker_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
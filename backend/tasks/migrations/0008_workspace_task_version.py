@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_analysisjob_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workspace',
+            name='task_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
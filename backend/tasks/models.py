@@ -1,8 +1,42 @@
+import uuid
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
+class Workspace(models.Model):
+    slug = models.SlugField(max_length=64, unique=True)
+    name = models.CharField(max_length=200)
+    holidays = models.JSONField(default=list, blank=True)
+    max_tasks = models.IntegerField(
+        default=100000,
+        validators=[MinValueValidator(1)]
+    )
+    cpu_seconds_per_minute = models.FloatField(
+        default=30.0,
+        validators=[MinValueValidator(0.1)]
+    )
+    max_concurrent_analyses = models.IntegerField(
+        default=2,
+        validators=[MinValueValidator(1)]
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    task_version = models.PositiveIntegerField(default=0, editable=False)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['slug']
+
+
 class Task(models.Model):
+    workspace = models.ForeignKey(
+        Workspace,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name='tasks'
+    )
     title = models.CharField(max_length=200)
     due_date = models.DateField()
     estimated_hours = models.IntegerField(
@@ -15,10 +49,50 @@ class Task(models.Model):
     )
     dependencies = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    completed = models.BooleanField(default=False)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    priority_score = models.FloatField(default=0, editable=False)
+    blocker_count = models.IntegerField(default=0, editable=False)
+    in_cycle = models.BooleanField(default=False, editable=False)
+    scored_at = models.DateField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return self.title
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-priority_score', '-id'], name='task_priority_idx'),
+            models.Index(fields=['workspace', '-priority_score', '-id'], name='task_ws_rank_idx'),
+            models.Index(fields=['due_date', 'id'], name='task_due_idx'),
+            models.Index(fields=['importance', 'id'], name='task_importance_idx'),
+        ]
+
 
+class AnalysisJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    content_hash = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default='queued', db_index=True)
+    task_count = models.IntegerField(default=0)
+    payload = models.BinaryField()
+    result = models.BinaryField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+    worker_id = models.CharField(max_length=64, blank=True, default='')
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.id} ({self.status})'
+
+    class Meta:
+        ordering = ['created_at']
@@ -0,0 +1,117 @@
+from datetime import date
+from .instrumentation import stage
+from .propagation import Propagation
+from .scoring import analyze_all_tasks, normalize_tasks, STRATEGY_NAMES
+from .simulation import AnalysisSnapshot
+
+
+def build_dependency_graph(tasks, task_index, coordinates=None):
+    cycles = task_index.cycle_positions()
+    nodes = []
+    edges = []
+    
+    for task in tasks:
+        task_id = task['id']
+        position = task_index.positions[task_id]
+        in_cycle = position in cycles
+        
+        node = {
+            'id': task_id,
+            'title': task.get('title', f'Task {task_id}'),
+            'score': task.get('priority_score', 0),
+            'is_circular': in_cycle
+        }
+        if coordinates:
+            node['x'], node['y'] = coordinates[position]
+        nodes.append(node)
+        
+        for j in task_index.blockers[position]:
+            edges.append({
+                'from': task_index.ids[j],
+                'to': task_id,
+                'is_circular': in_cycle and j in cycles
+            })
+    
+    return {'nodes': nodes, 'edges': edges}
+
+
+def build_propagation(options):
+    method = options.get('propagation', 'legacy')
+    if method == 'legacy':
+        return None
+    return Propagation(
+        method,
+        damping=options.get('damping', 1.0),
+        tolerance=options.get('tolerance', 0.001),
+        max_iterations=options.get('max_iterations', 100)
+    )
+
+
+def run_pipeline(tasks, strategy, options, score_cache=None, work_calendar=None,
+                 layout_limit=2000, analysis_id=None, analyze=analyze_all_tasks):
+    reference_date = options.get('reference_date') or date.today()
+    propagation = build_propagation(options)
+    if score_cache is None:
+        score_cache = {}
+    
+    with stage('normalize'):
+        task_index = normalize_tasks(tasks)
+    
+    simplification = None
+    if options.get('simplify'):
+        with stage('simplify'):
+            task_index, simplification = task_index.simplified()
+    
+    analyzed = analyze(
+        tasks,
+        strategy,
+        score_cache=score_cache,
+        reference_date=reference_date,
+        work_calendar=work_calendar,
+        task_index=task_index,
+        propagation=propagation,
+        downstream=options.get('downstream')
+    )
+    
+    with stage('snapshot'):
+        snapshot = AnalysisSnapshot(analyzed, strategy, score_cache, reference_date, task_index, propagation,
+                                    simplify=simplification is not None, work_calendar=work_calendar)
+    
+    with stage('cycles'):
+        cycle_names = [
+            analyzed[p].get('title', f"Task {analyzed[p].get('id')}")
+            for p in sorted(task_index.cycle_positions())
+        ]
+    
+    with stage('sort'):
+        analyzed.sort(key=lambda x: x['priority_score'], reverse=True)
+        
+        for task in analyzed:
+            if isinstance(task.get('due_date'), date):
+                task['due_date'] = task['due_date'].isoformat()
+    
+    result = {
+        'tasks': analyzed,
+        'strategy_used': STRATEGY_NAMES.get(strategy, 'Smart Balance'),
+        'circular_dependencies': list(cycle_names),
+        'total_tasks': len(analyzed)
+    }
+    if analysis_id is not None:
+        result['analysis_id'] = analysis_id
+    if propagation is not None:
+        result['propagation'] = propagation.report
+    if simplification is not None:
+        result['simplification'] = simplification
+    if not options.get('include_graph', True):
+        return result, snapshot
+    
+    coordinates = None
+    if len(analyzed) <= layout_limit:
+        with stage('layout'):
+            view = snapshot.graph_view()
+            coordinates = list(zip(view.x, view.y))
+    
+    with stage('graph'):
+        result['dependency_graph'] = build_dependency_graph(analyzed, task_index, coordinates)
+    
+    return result, snapshot
@@ -0,0 +1,153 @@
+import heapq
+import math
+from datetime import date, timedelta
+from .scoring import analyze_all_tasks, get_working_dates, normalize_tasks, parse_date
+
+
+MAX_PROJECTION_DAYS = 366 * 100
+
+
+def _last_date(start_date, days):
+    if (date.max - start_date).days <= days:
+        return date.max
+    return start_date + timedelta(days=days)
+
+
+def _extend_working_dates(working_dates, start_date, needed_days):
+    end = start_date
+    if working_dates:
+        end = working_dates[-1] + timedelta(days=1)
+    limit = _last_date(start_date, MAX_PROJECTION_DAYS)
+    while len(working_dates) < needed_days and end < limit:
+        span = (needed_days - len(working_dates)) * 7 // 5 + 7
+        stop = min(_last_date(end, span), limit)
+        working_dates.extend(get_working_dates(end, stop))
+        end = stop
+    return working_dates
+
+
+def plan_schedule(tasks, hours_per_day=8, people=1, horizon_days=14,
+                  start_date=None, strategy='smart_balance'):
+    if start_date is None:
+        start_date = date.today()
+
+    index = normalize_tasks(tasks)
+    analyzed = analyze_all_tasks(tasks, strategy, reference_date=start_date, task_index=index)
+    horizon_dates = get_working_dates(start_date, _last_date(start_date, horizon_days))
+    horizon_len = len(horizon_dates)
+
+    n = len(analyzed)
+    dependents = index.successors
+    remaining = [len(set(blockers)) for blockers in index.blockers]
+
+    ready = [(-analyzed[i]['priority_score'], i) for i in range(n) if remaining[i] == 0]
+    heapq.heapify(ready)
+    workers = [(0.0, p) for p in range(people)]
+
+    release = [0.0] * n
+    spans = [None] * n
+    days = [[] for _ in range(horizon_len)]
+
+    while ready:
+        _, i = heapq.heappop(ready)
+        task = analyzed[i]
+        hours = max(0, task.get('estimated_hours', 1) or 0)
+
+        free_at, person = heapq.heappop(workers)
+        begin = max(free_at, release[i])
+        end = begin + hours
+        heapq.heappush(workers, (end, person))
+        spans[i] = (begin, end, person)
+
+        cursor = begin
+        day = int(begin // hours_per_day)
+        while cursor < end and day < horizon_len:
+            chunk = min(end, (day + 1) * hours_per_day) - cursor
+            days[day].append({
+                'id': task['id'],
+                'title': task.get('title', f"Task {task['id']}"),
+                'hours': round(chunk, 2),
+                'person': person + 1,
+                'priority_score': task['priority_score']
+            })
+            cursor += chunk
+            day += 1
+
+        for j in dependents[i]:
+            if end > release[j]:
+                release[j] = end
+            remaining[j] -= 1
+            if remaining[j] == 0:
+                heapq.heappush(ready, (-analyzed[j]['priority_score'], j))
+
+    finish_days = [None] * n
+    last_day = horizon_len - 1
+    for i, span in enumerate(spans):
+        if span is None:
+            continue
+        begin, end, _ = span
+        finish_days[i] = max(math.ceil(end / hours_per_day) - 1, int(begin // hours_per_day))
+        last_day = max(last_day, finish_days[i])
+
+    working_dates = _extend_working_dates(list(horizon_dates), start_date, last_day + 1)
+
+    late_tasks = []
+    unscheduled = []
+    blocked = []
+    for i, task in enumerate(analyzed):
+        title = task.get('title', f"Task {task['id']}")
+        if finish_days[i] is None:
+            blocked.append({'id': task['id'], 'title': title})
+            continue
+
+        if finish_days[i] >= len(working_dates):
+            unscheduled.append({'id': task['id'], 'title': title, 'projected_finish': None, 'out_of_range': True})
+            due = parse_date(task.get('due_date'))
+            if due is not None:
+                late_tasks.append({
+                    'id': task['id'],
+                    'title': title,
+                    'due_date': due.isoformat(),
+                    'projected_finish': None,
+                    'days_late': None
+                })
+            continue
+
+        finish_date = working_dates[finish_days[i]]
+        if finish_days[i] >= horizon_len:
+            unscheduled.append({
+                'id': task['id'],
+                'title': title,
+                'projected_finish': finish_date.isoformat()
+            })
+
+        due = parse_date(task.get('due_date'))
+        if due is not None and finish_date > due:
+            late_tasks.append({
+                'id': task['id'],
+                'title': title,
+                'due_date': due.isoformat(),
+                'projected_finish': finish_date.isoformat(),
+                'days_late': (finish_date - due).days
+            })
+
+    late_tasks.sort(key=lambda x: math.inf if x['days_late'] is None else x['days_late'], reverse=True)
+    capacity = hours_per_day * people
+
+    schedule = []
+    for day, entries in zip(horizon_dates, days):
+        hours_used = round(sum(e['hours'] for e in entries), 2)
+        schedule.append({
+            'date': day.isoformat(),
+            'capacity': capacity,
+            'hours_used': hours_used,
+            'tasks': entries
+        })
+
+    return {
+        'schedule': schedule,
+        'late_tasks': late_tasks,
+        'unscheduled': unscheduled,
+        'blocked': blocked,
+        'scheduled_tasks': n - len(unscheduled) - len(blocked)
+    }
@@ -0,0 +1,196 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+
+MODES = ('cprofile', 'sample')
+TASK_FIELDS = ('due_date', 'importance', 'estimated_hours')
+
+
+def positional(value):
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    return isinstance(value, str) and value.strip().lstrip('+-').isdigit()
+
+
+def anonymize_payload(data):
+    if not isinstance(data, dict):
+        return None
+
+    tasks = data.get('tasks')
+    if not isinstance(tasks, list):
+        tasks = []
+
+    anonymized = []
+    for i, task in enumerate(tasks):
+        if not isinstance(task, dict):
+            anonymized.append(None)
+            continue
+        clean = {field: task[field] for field in TASK_FIELDS if field in task}
+        clean['title'] = f'Task {i + 1}'
+        dependencies = task.get('dependencies')
+        if isinstance(dependencies, list):
+            clean['dependencies'] = [d if positional(d) else None for d in dependencies]
+        anonymized.append(clean)
+
+    payload = {key: value for key, value in data.items() if key not in ('tasks', 'title', 'name')}
+    payload['tasks'] = anonymized
+    return payload
+
+
+class SamplingProfiler:
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        return ''.join(f'{stack} {n}\n' for stack, n in self.samples.most_common())
+
+
+class Capture:
+
+    def __init__(self, mode, sample_interval=0.001):
+        self.mode = mode
+        self.profiler = cProfile.Profile() if mode == 'cprofile' else SamplingProfiler(sample_interval)
+        self.elapsed = None
+        self.active = False
+
+    def start(self):
+        if self.mode == 'cprofile':
+            try:
+                self.profiler.enable()
+            except ValueError:
+                return
+        else:
+            self.profiler.start()
+        self.active = True
+        self._started = time.perf_counter()
+
+    def stop(self):
+        if not self.active:
+            return
+        self.elapsed = time.perf_counter() - self._started
+        if self.mode == 'cprofile':
+            self.profiler.disable()
+        else:
+            self.profiler.stop()
+
+    def write(self, path):
+        if self.mode == 'cprofile':
+            self.profiler.dump_stats(path)
+        else:
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write(self.profiler.folded())
+
+
+@contextmanager
+def capturing(mode, sample_interval=0.001):
+    capture = Capture(mode, sample_interval)
+    capture.start()
+    try:
+        yield capture
+    finally:
+        capture.stop()
+
+
+class ProfileStore:
+
+    EXTENSIONS = {'cprofile': '.prof', 'sample': '.folded'}
+
+    def __init__(self, directory, limit=50):
+        self.directory = os.fspath(directory)
+        self.limit = limit
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id, extension):
+        return os.path.join(self.directory, profile_id + extension)
+
+    def save(self, endpoint, capture, payload, status_code=None):
+        now = time.time()
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime(now)) + f'{int(now % 1 * 1e6):06d}'
+        profile_id = f'{stamp}-{endpoint}-{uuid.uuid4().hex[:8]}'
+        meta = {
+            'id': profile_id,
+            'endpoint': endpoint,
+            'mode': capture.mode,
+            'created': now,
+            'elapsed_ms': round(capture.elapsed * 1000, 3),
+            'status': status_code,
+            'task_count': len(payload['tasks']) if payload else 0,
+            'output': profile_id + self.EXTENSIONS[capture.mode],
+            'payload': payload
+        }
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            capture.write(self._path(profile_id, self.EXTENSIONS[capture.mode]))
+            with open(self._path(profile_id, '.json'), 'w', encoding='utf-8') as handle:
+                json.dump(meta, handle, default=str)
+            self._rotate()
+        return profile_id
+
+    def _ids(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith('.json'))
+
+    def _rotate(self):
+        ids = self._ids()
+        for profile_id in ids[:max(0, len(ids) - self.limit)]:
+            for extension in ('.json',) + tuple(self.EXTENSIONS.values()):
+                try:
+                    os.remove(self._path(profile_id, extension))
+                except FileNotFoundError:
+                    pass
+
+    def load(self, profile_id):
+        try:
+            with open(self._path(os.path.basename(profile_id), '.json'), encoding='utf-8') as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return None
+
+    def output_path(self, meta):
+        return os.path.join(self.directory, meta['output'])
+
+    def list(self):
+        entries = []
+        for profile_id in reversed(self._ids()):
+            meta = self.load(profile_id)
+            if meta is not None:
+                meta.pop('payload', None)
+                entries.append(meta)
+        return entries
@@ -0,0 +1,81 @@
+import hashlib
+import json
+from bisect import bisect_left
+from datetime import date
+
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'Cannot serialize {type(value).__name__}')
+
+
+def row_digest(task):
+    encoded = json.dumps(task, sort_keys=True, separators=(',', ':'), default=_default).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=8).digest()
+
+
+class RankingVersion:
+
+    def __init__(self, ranked, strategy):
+        self.order = [task['id'] for task in ranked]
+        self.digests = {task['id']: row_digest(task) for task in ranked}
+        combined = hashlib.blake2b(strategy.encode('utf-8'), digest_size=16)
+        for task_id in self.order:
+            combined.update(self.digests[task_id])
+        self.token = combined.hexdigest()
+
+
+def _stable_positions(ranks):
+    tails = []
+    tail_positions = []
+    previous = [-1] * len(ranks)
+    for position, rank in enumerate(ranks):
+        k = bisect_left(tails, rank)
+        if k == len(tails):
+            tails.append(rank)
+            tail_positions.append(position)
+        else:
+            tails[k] = rank
+            tail_positions[k] = position
+        previous[position] = tail_positions[k - 1] if k else -1
+
+    stable = set()
+    position = tail_positions[-1] if tail_positions else -1
+    while position >= 0:
+        stable.add(position)
+        position = previous[position]
+    return stable
+
+
+def diff_rankings(base, current, ranked):
+    old_rank = {task_id: rank for rank, task_id in enumerate(base.order)}
+    common = [(rank, task_id) for rank, task_id in enumerate(current.order) if task_id in old_rank]
+    stable = _stable_positions([old_rank[task_id] for _, task_id in common])
+
+    added = []
+    changed = []
+    for rank, task in enumerate(ranked):
+        task_id = task['id']
+        if task_id not in old_rank:
+            added.append(dict(task, rank=rank + 1))
+        elif base.digests[task_id] != current.digests[task_id]:
+            changed.append(dict(task, rank=rank + 1))
+
+    return {
+        'removed': [task_id for task_id in base.order if task_id not in current.digests],
+        'moved': [[task_id, rank + 1] for k, (rank, task_id) in enumerate(common) if k not in stable],
+        'changed': changed,
+        'added': added
+    }
+
+
+def apply_diff(order, diff):
+    relocated = {task_id for task_id, _ in diff['moved']}
+    dropped = relocated.union(diff['removed'])
+    result = [task_id for task_id in order if task_id not in dropped]
+    placements = [(rank, task_id) for task_id, rank in diff['moved']]
+    placements.extend((task['rank'], task['id']) for task in diff['added'])
+    for rank, task_id in sorted(placements):
+        result.insert(rank - 1, task_id)
+    return result
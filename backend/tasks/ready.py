@@ -0,0 +1,74 @@
+import heapq
+import threading
+
+
+class ReadyQueue:
+
+    def __init__(self, blockers, scores, completed=None):
+        n = len(blockers)
+        self.scores = list(scores)
+        self.completed = bytearray(n) if completed is None else bytearray(1 if c else 0 for c in completed)
+        self.dependents = [[] for _ in range(n)]
+        self.remaining = [0] * n
+        for i, resolved in enumerate(blockers):
+            for j in set(resolved):
+                self.dependents[j].append(i)
+                if not self.completed[j]:
+                    self.remaining[i] += 1
+
+        self._heap = [(-self.scores[i], i) for i in range(n) if self.is_ready(i)]
+        heapq.heapify(self._heap)
+        self.ready_count = len(self._heap)
+        self._lock = threading.Lock()
+
+    def is_ready(self, i):
+        return not self.completed[i] and self.remaining[i] == 0
+
+    def complete(self, i):
+        with self._lock:
+            if self.completed[i]:
+                return []
+            if self.is_ready(i):
+                self.ready_count -= 1
+            self.completed[i] = 1
+
+            unblocked = []
+            for d in self.dependents[i]:
+                self.remaining[d] -= 1
+                if self.is_ready(d):
+                    heapq.heappush(self._heap, (-self.scores[d], d))
+                    self.ready_count += 1
+                    unblocked.append(d)
+            return unblocked
+
+    def reopen(self, i):
+        with self._lock:
+            if not self.completed[i]:
+                return []
+            self.completed[i] = 0
+
+            blocked = []
+            for d in self.dependents[i]:
+                if self.is_ready(d):
+                    self.ready_count -= 1
+                    blocked.append(d)
+                self.remaining[d] += 1
+            if self.is_ready(i):
+                heapq.heappush(self._heap, (-self.scores[i], i))
+                self.ready_count += 1
+            return blocked
+
+    def top(self, k):
+        with self._lock:
+            heap = self._heap
+            chosen = []
+            seen = set()
+            while heap and len(chosen) < k:
+                neg, i = heapq.heappop(heap)
+                if i in seen or not self.is_ready(i) or -neg != self.scores[i]:
+                    continue
+                seen.add(i)
+                chosen.append(i)
+            for i in chosen:
+                heapq.heappush(heap, (-self.scores[i], i))
+            return chosen
@@ -0,0 +1,149 @@
+import json
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from .graph import split_by_component
+from .instrumentation import count, stage
+from .propagation import Propagation
+from .scoring import TaskIndex, analyze_all_tasks, parse_date
+
+
+PARTITION_INPUT_FIELDS = ('id', 'title', 'due_date', 'estimated_hours', 'importance')
+PARTITION_OUTPUT_FIELDS = ('raw_score', 'priority_score', 'explanation', 'downstream_count', 'downstream_weight')
+
+
+class PeerError(Exception):
+    pass
+
+
+def _isoformat(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def score_partition(tasks, strategy, reference_date, propagation=None, score_cache=None, work_calendar=None,
+                    task_index=None, downstream=None):
+    propagation = Propagation(**propagation) if propagation else None
+    analyze_all_tasks(
+        tasks,
+        strategy,
+        score_cache=score_cache,
+        reference_date=reference_date,
+        work_calendar=work_calendar,
+        task_index=task_index,
+        propagation=propagation,
+        downstream=downstream
+    )
+    return {
+        'tasks': [{f: task[f] for f in PARTITION_OUTPUT_FIELDS if f in task} for task in tasks],
+        'propagation': propagation.report if propagation else None
+    }
+
+
+def read_partition(payload):
+    tasks = payload['tasks']
+    for task in tasks:
+        task['due_date'] = parse_date(task.get('due_date'))
+    return tasks
+
+
+def merge_reports(reports):
+    reports = [r for r in reports if r]
+    if not reports:
+        return None
+    return {
+        'method': reports[0]['method'],
+        'iterations': max(r['iterations'] for r in reports),
+        'residual': max(r['residual'] for r in reports),
+        'converged': all(r['converged'] for r in reports)
+    }
+
+
+class ScatterGather:
+
+    def __init__(self, peers, timeout=30.0, min_tasks=0, token=None):
+        self.peers = list(peers)
+        self.timeout = timeout
+        self.min_tasks = min_tasks
+        self.token = token
+        self.partitions = []
+
+    def post(self, peer, payload):
+        request = urllib.request.Request(
+            peer.rstrip('/') + '/api/tasks/analyze/partition/',
+            data=json.dumps(payload, separators=(',', ':')).encode(),
+            headers={'Content-Type': 'application/json', **({'X-Peer-Token': self.token} if self.token else {})},
+            method='POST'
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                result = json.loads(response.read())
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise PeerError(f'{peer}: {e}')
+        if len(result.get('tasks', ())) != len(payload['tasks']):
+            raise PeerError(f'{peer}: partition size mismatch')
+        return result
+
+    def __call__(self, tasks, strategy='smart_balance', score_cache=None, reference_date=None,
+                 work_calendar=None, task_index=None, propagation=None, downstream=None):
+        if not self.peers or len(tasks) < max(self.min_tasks, 2):
+            return analyze_all_tasks(tasks, strategy, score_cache, reference_date, work_calendar, task_index,
+                                     propagation, downstream)
+
+        with stage('partition'):
+            task_index = task_index or TaskIndex(tasks)
+            chunks = split_by_component(task_index.successors, len(self.peers) + 1)
+        if len(chunks) == 1:
+            return analyze_all_tasks(tasks, strategy, score_cache, reference_date, work_calendar, task_index,
+                                     propagation, downstream)
+
+        options = propagation.options() if propagation is not None else None
+
+        def payload(chunk):
+            return {
+                'strategy': strategy,
+                'reference_date': reference_date.isoformat(),
+                'propagation': options,
+                'downstream': bool(downstream),
+                'tasks': [
+                    dict(
+                        {f: tasks[p][f] for f in PARTITION_INPUT_FIELDS if f in tasks[p]},
+                        due_date=_isoformat(tasks[p].get('due_date')),
+                        dependencies=[task_index.ids[j] for j in task_index.blockers[p]]
+                    )
+                    for p in chunk
+                ]
+            }
+
+        def score_locally(chunk):
+            local = {p: k for k, p in enumerate(chunk)}
+            subset = [tasks[p] for p in chunk]
+            index = TaskIndex.from_blockers(
+                [task_index.ids[p] for p in chunk],
+                [[local[j] for j in task_index.blockers[p]] for p in chunk]
+            )
+            return score_partition(subset, strategy, reference_date, options, score_cache, work_calendar, index,
+                                   downstream)
+
+        local_chunk, remote_chunks = chunks[0], chunks[1:]
+        self.partitions = [{'peer': None, 'tasks': len(local_chunk)}]
+        reports = []
+        with stage('scatter'), ThreadPoolExecutor(max_workers=len(remote_chunks)) as pool:
+            futures = [pool.submit(self.post, peer, payload(chunk)) for peer, chunk in zip(self.peers, remote_chunks)]
+            reports.append(score_locally(local_chunk)['propagation'])
+
+            for peer, chunk, future in zip(self.peers, remote_chunks, futures):
+                try:
+                    result = future.result()
+                except PeerError:
+                    count('scatter_fallbacks')
+                    result = score_locally(chunk)
+                    peer = None
+                else:
+                    for p, scored in zip(chunk, result['tasks']):
+                        tasks[p].update(scored)
+                self.partitions.append({'peer': peer, 'tasks': len(chunk)})
+                reports.append(result['propagation'])
+
+        if propagation is not None:
+            propagation.report = merge_reports(reports)
+        return tasks
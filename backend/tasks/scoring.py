@@ -1,5 +1,29 @@
 from datetime import date, datetime, timedelta
-import calendar
+import math
+from array import array
+from .graph import ReachabilityIndex, cycle_positions, transitive_reduction
+from .instrumentation import count, stage
+
+
+STRATEGY_NAMES = {
+    'smart_balance': 'Smart Balance',
+    'fastest_wins': 'Fastest Wins',
+    'high_impact': 'High Impact',
+    'deadline_driven': 'Deadline Driven',
+    'unblock_first': 'Unblock First'
+}
+DOWNSTREAM_STRATEGIES = {'unblock_first'}
+
+
+def parse_date(value):
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            return None
+    return None
 
 
 def is_weekend(check_date):
@@ -13,11 +37,7 @@ def get_common_holidays(year):
         date(year, 12, 25)
     ]
     
-    nov_calendar = calendar.monthcalendar(year, 11)
-    thanksgiving_week = nov_calendar[3]
-    if thanksgiving_week[3] == 0:
-        thanksgiving_week = nov_calendar[4]
-    holidays.append(date(year, 11, thanksgiving_week[3]))
+    holidays.append(date(year, 11, 25 - date(year, 11, 1).weekday()))
     
     return holidays
 
@@ -36,67 +56,85 @@ def get_working_days_remaining(due_date, start_date=None):
     if start_date is None:
         start_date = date.today()
     
-    if due_date < start_date:
-        return 0
-    
-    working_days = 0
-    current = start_date
-    
-    holidays = get_common_holidays(start_date.year)
-    if due_date.year > start_date.year:
-        holidays.extend(get_common_holidays(due_date.year))
-    
-    while current < due_date:
-        if is_working_day(current, holidays):
-            working_days += 1
-        current += timedelta(days=1)
-    
-    return working_days
+    return default_calendar.working_days_between(start_date, due_date)
 
 
-def detect_cycles(tasks):
-    graph = {}
-    for t in tasks:
-        task_id = t.get('id')
-        if task_id is None:
-            continue
-        graph[task_id] = t.get('dependencies', [])
-    
-    visited = set()
-    rec_stack = set()
-    cycles = set()
+def get_working_dates(start_date, end_date):
+    return default_calendar.working_dates(start_date, end_date)
 
-    def dfs(node):
-        if node not in graph:
-            return False
-            
-        visited.add(node)
-        rec_stack.add(node)
+
+class WorkingDayCalendar:
+
+    def __init__(self, extra_holidays=None):
+        self.extra_holidays = set(extra_holidays or [])
+        self._table = None
+
+    def ensure_range(self, first, last):
+        table = self._table
+        if table is not None and table[2] <= first.year and last.year <= table[3]:
+            return table
+        
+        first_year, last_year = first.year, last.year
+        if table is not None:
+            first_year = min(first_year, table[2])
+            last_year = max(last_year, table[3])
         
-        for neighbor_id in graph.get(node, []):
-            if neighbor_id in graph:
-                if neighbor_id not in visited:
-                    if dfs(neighbor_id):
-                        cycles.add(node)
-                        return True
-                elif neighbor_id in rec_stack:
-                    cycles.add(node)
-                    cycles.add(neighbor_id)
-                    return True
+        holidays = set(self.extra_holidays)
+        for year in range(first_year, last_year + 1):
+            holidays.update(get_common_holidays(year))
         
-        rec_stack.remove(node)
-        return False
+        origin = date(first_year, 1, 1).toordinal()
+        prefix = array('l', [0])
+        working = 0
+        for ordinal in range(origin, date(last_year, 12, 31).toordinal() + 1):
+            current = date.fromordinal(ordinal)
+            if current.weekday() < 5 and current not in holidays:
+                working += 1
+            prefix.append(working)
+        count('calendar_days_built', len(prefix) - 1)
+        
+        table = (origin, prefix, first_year, last_year)
+        self._table = table
+        return table
 
-    for task_id in graph:
-        if task_id not in visited:
-            dfs(task_id)
-            
-    return cycles
+    def day_index(self, check_date):
+        origin, prefix, _, _ = self.ensure_range(check_date, check_date)
+        return prefix[check_date.toordinal() - origin]
 
+    def working_days_between(self, start_date, end_date):
+        if end_date <= start_date:
+            return 0
+        origin, prefix, _, _ = self.ensure_range(start_date, end_date)
+        return prefix[end_date.toordinal() - origin] - prefix[start_date.toordinal() - origin]
 
-def calculate_base_score(task, strategy='smart_balance'):
-    score = 0.0
-    today = date.today()
+    def is_working_day(self, check_date):
+        origin, prefix, _, _ = self.ensure_range(check_date, check_date)
+        offset = check_date.toordinal() - origin
+        return prefix[offset + 1] != prefix[offset]
+
+    def working_dates(self, start_date, end_date):
+        if end_date <= start_date:
+            return []
+        origin, prefix, _, _ = self.ensure_range(start_date, end_date)
+        first = start_date.toordinal() - origin
+        return [
+            start_date + timedelta(days=k)
+            for k in range(end_date.toordinal() - start_date.toordinal())
+            if prefix[first + k + 1] != prefix[first + k]
+        ]
+
+
+default_calendar = WorkingDayCalendar()
+
+
+def detect_cycles(tasks):
+    index = TaskIndex(tasks)
+    return {index.ids[p] for p in index.cycle_positions()}
+
+
+def calculate_base_score(task, strategy='smart_balance', reference_date=None, work_calendar=None):
+    today = reference_date or date.today()
+    work_calendar = work_calendar or default_calendar
     
     due_date = task.get('due_date')
     if isinstance(due_date, str):
@@ -107,16 +145,27 @@ def calculate_base_score(task, strategy='smart_balance'):
     elif due_date is None:
         due_date = today + timedelta(days=30)
     
-    days_until_due = (due_date - today).days
-    working_days_left = get_working_days_remaining(due_date, today)
-    importance = max(1, min(10, task.get('importance', 5)))
-    hours = task.get('estimated_hours', 1)
+    return score_from_components(
+        strategy,
+        days_until_due=(due_date - today).days,
+        working_days_left=work_calendar.working_days_between(today, due_date),
+        today_is_working=work_calendar.is_working_day(today),
+        due_on_weekend=is_weekend(due_date),
+        importance=max(1, min(10, task.get('importance', 5))),
+        hours=task.get('estimated_hours', 1),
+        downstream=task.get('downstream_count', 0)
+    )
+
+
+def score_from_components(strategy, days_until_due, working_days_left, today_is_working,
+                          due_on_weekend, importance, hours, downstream=0):
+    score = 0.0
     
     if strategy == 'deadline_driven':
         if days_until_due < 0:
             score += 150 + min(50, abs(days_until_due) * 5)
         elif days_until_due == 0:
-            if is_working_day(today):
+            if today_is_working:
                 score += 120
             else:
                 score += 130
@@ -129,7 +178,7 @@ def calculate_base_score(task, strategy='smart_balance'):
         else:
             score += max(0, 40 - (working_days_left // 3))
         
-        if is_weekend(due_date) and days_until_due > 0:
+        if due_on_weekend and days_until_due > 0:
             score += 5
             
         score += importance * 3
@@ -168,7 +217,7 @@ def calculate_base_score(task, strategy='smart_balance'):
         if days_until_due < 0:
             score += 90 + min(40, abs(days_until_due) * 4)
         elif days_until_due == 0:
-            if is_working_day(today):
+            if today_is_working:
                 score += 80
             else:
                 score += 85
@@ -181,7 +230,7 @@ def calculate_base_score(task, strategy='smart_balance'):
         else:
             score += max(0, 20 - (working_days_left // 5))
         
-        if is_weekend(due_date) and days_until_due > 0:
+        if due_on_weekend and days_until_due > 0:
             score += 5
         
         score += importance * 10
@@ -191,11 +240,35 @@ def calculate_base_score(task, strategy='smart_balance'):
         elif hours <= 3:
             score += 5
     
+    elif strategy == 'unblock_first':
+        if days_until_due < 0:
+            score += 60 + min(30, abs(days_until_due) * 3)
+        elif days_until_due == 0:
+            score += 50
+        elif working_days_left <= 1:
+            score += 45
+        elif working_days_left <= 3:
+            score += 35
+        elif working_days_left <= 7:
+            score += 25
+        else:
+            score += max(0, 15 - (working_days_left // 5))
+        
+        score += importance * 4
+        
+        if downstream > 0:
+            score += min(100, 15 * math.log2(1 + downstream))
+        
+        if hours <= 1:
+            score += 10
+        elif hours <= 3:
+            score += 5
+    
     else:
         if days_until_due < 0:
             score += 100 + min(50, abs(days_until_due) * 5)
         elif days_until_due == 0:
-            if is_working_day(today):
+            if today_is_working:
                 score += 90
             else:
                 score += 100
@@ -208,7 +281,7 @@ def calculate_base_score(task, strategy='smart_balance'):
         else:
             score += max(0, 25 - (working_days_left // 5))
         
-        if is_weekend(due_date) and days_until_due > 0:
+        if due_on_weekend and days_until_due > 0:
             score += 5
             
         score += importance * 6
@@ -225,12 +298,94 @@ def calculate_priority_score(task, all_tasks=None, strategy='smart_balance'):
     return calculate_base_score(task, strategy)
 
 
-def analyze_all_tasks(tasks, strategy='smart_balance'):
-    if not tasks:
-        return []
-    
+class DuplicateTaskIdError(ValueError):
+    pass
+
+
+class TaskIndex:
+
+    def __init__(self, tasks):
+        self.ids = [t.get('id') for t in tasks]
+        self.positions = {}
+        for i, task_id in enumerate(self.ids):
+            if task_id is not None:
+                self.positions.setdefault(task_id, i)
+        
+        self.blockers = []
+        self.successors = [[] for _ in tasks]
+        self.dangling = []
+        for i, task in enumerate(tasks):
+            resolved = []
+            for dep_id in task.get('dependencies') or []:
+                j = self.positions.get(dep_id)
+                if j is None:
+                    self.dangling.append((i, dep_id))
+                    continue
+                resolved.append(j)
+                succ = self.successors[j]
+                if not succ or succ[-1] != i:
+                    succ.append(i)
+            self.blockers.append(resolved)
+        
+        self.remapped = []
+        self._cycles = None
+
+    @classmethod
+    def from_blockers(cls, ids, blockers):
+        index = cls([])
+        index.ids = ids
+        index.positions = {}
+        for i, task_id in enumerate(ids):
+            index.positions.setdefault(task_id, i)
+        index.blockers = blockers
+        index.successors = [[] for _ in blockers]
+        for i, resolved in enumerate(blockers):
+            for j in resolved:
+                succ = index.successors[j]
+                if not succ or succ[-1] != i:
+                    succ.append(i)
+        return index
+
+    def simplified(self):
+        reduced = transitive_reduction(self.successors)
+        keep = [set() for _ in self.blockers]
+        for j, succ in enumerate(reduced):
+            for i in succ:
+                keep[i].add(j)
+
+        blockers = []
+        for i, resolved in enumerate(self.blockers):
+            seen = set()
+            blockers.append([j for j in resolved if j in keep[i] and not (j in seen or seen.add(j))])
+
+        index = TaskIndex.from_blockers(self.ids, blockers)
+        index.dangling = self.dangling
+        index.remapped = self.remapped
+        edges = sum(len(resolved) for resolved in self.blockers)
+        distinct = sum(len(succ) for succ in self.successors)
+        kept = sum(len(resolved) for resolved in blockers)
+        return index, {
+            'edges_before': edges,
+            'duplicate_edges': edges - distinct,
+            'redundant_edges': distinct - kept,
+            'edges_after': kept
+        }
+
+    def cycle_positions(self):
+        if self._cycles is None:
+            self._cycles = cycle_positions(self.blockers, self.positions.values())
+        return self._cycles
+
+
+def build_reachability_index(tasks):
+    return ReachabilityIndex(TaskIndex(tasks).successors)
+
+
+def normalize_tasks(tasks, on_duplicate='remap'):
+    seen = set()
+    duplicates = []
     for i, task in enumerate(tasks):
-        if 'id' not in task:
+        if task.get('id') is None:
             task['id'] = i
         
         deps = task.get('dependencies')
@@ -240,46 +395,137 @@ def analyze_all_tasks(tasks, strategy='smart_balance'):
             task['dependencies'] = []
         else:
             task['dependencies'] = [d for d in deps if d is not None]
+        
+        if task['id'] in seen:
+            duplicates.append(i)
+        else:
+            seen.add(task['id'])
+    
+    if duplicates and on_duplicate == 'error':
+        raise DuplicateTaskIdError(f"Duplicate task id {tasks[duplicates[0]]['id']}")
     
-    for task in tasks:
-        task['raw_score'] = calculate_base_score(task, strategy)
-        task['priority_score'] = task['raw_score']
-        task['explanation'] = _generate_base_explanation(task, strategy)
+    remapped = []
+    next_id = max((x for x in seen if isinstance(x, int)), default=-1) + 1
+    for i in duplicates:
+        remapped.append((i, tasks[i]['id'], next_id))
+        tasks[i]['id'] = next_id
+        next_id += 1
+    
+    index = TaskIndex(tasks)
+    index.remapped = remapped
+    return index
+
+
+def build_dependents(tasks):
+    return TaskIndex(tasks).successors
 
-    cycle_ids = detect_cycles(tasks)
+
+def propagate_scores(raw_scores, dependents, iterations=3):
+    scores = list(raw_scores)
+    edges = sum(len(blocking_for) for blocking_for in dependents)
     
-    for iteration in range(3):
+    for iteration in range(iterations):
         changed = False
-        current_scores = {t['id']: t['priority_score'] for t in tasks}
+        current_scores = list(scores)
+        count('propagation_iterations')
+        count('propagation_edge_visits', edges)
         
-        for task in tasks:
-            task_id = task['id']
-            blocking_for = [t for t in tasks if task_id in t.get('dependencies', [])]
-            
+        for i, blocking_for in enumerate(dependents):
             inherited = 0
-            for dependent in blocking_for:
-                dep_score = current_scores.get(dependent['id'], 0)
-                inherited += dep_score * 0.5
+            for j in blocking_for:
+                inherited += current_scores[j] * 0.5
             
             if inherited > 0:
-                new_score = task['raw_score'] + inherited
-                if new_score > task['priority_score'] and new_score < 1000:
-                    task['priority_score'] = round(new_score, 2)
+                new_score = raw_scores[i] + inherited
+                if new_score > scores[i] and new_score < 1000:
+                    scores[i] = round(new_score, 2)
                     changed = True
         
         if not changed:
             break
+    
+    return scores
+
+
+def analyze_all_tasks(tasks, strategy='smart_balance', score_cache=None,
+                      reference_date=None, work_calendar=None, task_index=None, propagation=None,
+                      downstream=None):
+    if not tasks:
+        return []
+    
+    today = reference_date or date.today()
+    count('tasks', len(tasks))
+    
+    if task_index is None:
+        with stage('normalize'):
+            task_index = normalize_tasks(tasks)
+    count('dangling_dependencies', len(task_index.dangling))
+    
+    reachability = None
+    if downstream or strategy in DOWNSTREAM_STRATEGIES:
+        with stage('reachability'):
+            reachability = ReachabilityIndex(task_index.successors)
+            for task, reached in zip(tasks, reachability.counts()):
+                task['downstream_count'] = reached
+    
+    with stage('base_score'):
+        computed = 0
+        for task in tasks:
+            if score_cache is None:
+                task['raw_score'] = calculate_base_score(task, strategy, today, work_calendar)
+                task['explanation'] = _generate_base_explanation(task, strategy, today, work_calendar)
+                computed += 1
+            else:
+                key = (
+                    strategy,
+                    today,
+                    task.get('due_date'),
+                    task.get('importance', 5),
+                    task.get('estimated_hours', 1),
+                    task.get('downstream_count', 0)
+                )
+                cached = score_cache.get(key)
+                if cached is None:
+                    cached = (
+                        calculate_base_score(task, strategy, today, work_calendar),
+                        _generate_base_explanation(task, strategy, today, work_calendar)
+                    )
+                    score_cache[key] = cached
+                    computed += 1
+                task['raw_score'], task['explanation'] = cached
+        count('base_scores_computed', computed)
+    
+    raw_scores = [t['raw_score'] for t in tasks]
+    if reachability is not None:
+        with stage('reachability'):
+            for task, weight in zip(tasks, reachability.weights(raw_scores)):
+                task['downstream_weight'] = weight
+
+    with stage('cycles'):
+        cycles = task_index.cycle_positions()
+    
+    with stage('propagate'):
+        if propagation is None:
+            scores = propagate_scores(raw_scores, task_index.successors)
+        else:
+            scores = propagation.run(raw_scores, task_index.successors)
+        for task, score in zip(tasks, scores):
+            task['priority_score'] = score
 
-    task_map = {t['id']: t for t in tasks}
+    with stage('explain'):
+        _finalize_explanations(tasks, task_index, cycles)
     
-    for task in tasks:
-        if task['id'] in cycle_ids:
+    return tasks
+
+
+def _finalize_explanations(tasks, task_index, cycles):
+    for i, task in enumerate(tasks):
+        if i in cycles:
             task['priority_score'] = 999.0
             task['explanation'] = "CIRCULAR DEPENDENCY DETECTED - Resolve Immediately"
             continue
             
-        deps = task.get('dependencies', [])
-        blockers = [d for d in deps if d is not None and d in task_map]
+        blockers = task_index.blockers[i]
         
         if blockers:
             task['explanation'] = f"Blocked by {len(blockers)} task(s). " + task['explanation']
@@ -287,11 +533,11 @@ def analyze_all_tasks(tasks, strategy='smart_balance'):
         if task['priority_score'] > task['raw_score'] + 1:
             boost = int(task['priority_score'] - task['raw_score'])
             task['explanation'] += f" (Includes +{boost}pts from downstream dependencies)"
-            
-    return tasks
 
 
-def _generate_base_explanation(task, strategy='smart_balance'):
+def _generate_base_explanation(task, strategy='smart_balance', reference_date=None, work_calendar=None):
+    today = reference_date or date.today()
+    work_calendar = work_calendar or default_calendar
     due = task.get('due_date')
     due_date_obj = None
     
@@ -306,22 +552,16 @@ def _generate_base_explanation(task, strategy='smart_balance'):
     if not due_date_obj:
         return f"Due date unknown (Imp: {task.get('importance', 5)})"
         
-    days_remaining = (due_date_obj - date.today()).days
-    working_days_remaining = get_working_days_remaining(due_date_obj)
+    days_remaining = (due_date_obj - today).days
+    working_days_remaining = work_calendar.working_days_between(today, due_date_obj)
     importance = task.get('importance', 5)
     
-    strategy_names = {
-        'smart_balance': 'Smart Balance',
-        'fastest_wins': 'Fastest Wins',
-        'high_impact': 'High Impact',
-        'deadline_driven': 'Deadline Driven'
-    }
-    strategy_name = strategy_names.get(strategy, 'Smart Balance')
+    strategy_name = STRATEGY_NAMES.get(strategy, 'Smart Balance')
     
     if days_remaining < 0:
         msg = f"Overdue by {abs(days_remaining)} days"
     elif days_remaining == 0:
-        if is_working_day(date.today()):
+        if work_calendar.is_working_day(today):
             msg = "Due today"
         else:
             msg = "Due today (weekend/holiday)"
@@ -339,13 +579,11 @@ def _generate_base_explanation(task, strategy='smart_balance'):
 
 
 def detect_circular_dependencies(tasks):
-    cycle_ids = detect_cycles(tasks)
-    task_map = {t.get('id'): t for t in tasks}
+    index = TaskIndex(tasks)
     result = []
-    for task_id in cycle_ids:
-        task = task_map.get(task_id)
-        if task:
-            result.append(task.get('title', f"Task {task_id}"))
+    for p in index.cycle_positions():
+        task = tasks[p]
+        result.append(task.get('title', f"Task {task.get('id')}"))
     return result
 
 
@@ -0,0 +1,117 @@
+import re
+from datetime import timedelta
+from django.db import connections
+from django.db.models import Count, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'tasks_task_fts'
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+DUE_WINDOWS = {
+    'overdue': (None, 0),
+    'today': (0, 1),
+    'week': (0, 7),
+    'month': (0, 30),
+    'later': (30, None),
+}
+IMPORTANCE_BANDS = {'critical': (9, 10), 'high': (7, 8), 'normal': (4, 6), 'low': (1, 3)}
+
+_fts_tables = {}
+
+
+def fts_available(using='default'):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    key = connection.settings_dict['NAME']
+    if key not in _fts_tables:
+        with connection.cursor() as cursor:
+            _fts_tables[key] = FTS_TABLE in connection.introspection.table_names(cursor)
+    return _fts_tables[key]
+
+
+def update_statistics(using='default'):
+    connection = connections[using]
+    statement = 'ANALYZE TABLE tasks_task' if connection.vendor == 'mysql' else 'ANALYZE tasks_task'
+    with connection.cursor() as cursor:
+        cursor.execute(statement)
+
+
+def match_expression(text):
+    return ' '.join(f'"{token}"*' for token in TOKEN_RE.findall(text))
+
+
+def due_window(name, today):
+    start, end = DUE_WINDOWS[name]
+    condition = Q()
+    if start is not None:
+        condition &= Q(due_date__gte=today + timedelta(days=start))
+    if end is not None:
+        condition &= Q(due_date__lt=today + timedelta(days=end))
+    return condition
+
+
+def importance_band(name):
+    return Q(importance__range=IMPORTANCE_BANDS[name])
+
+
+def match_titles(queryset, text):
+    terms = TOKEN_RE.findall(text)
+    if not terms:
+        return queryset
+    if fts_available(queryset.db):
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match_expression(text)])
+        )
+    for term in terms:
+        queryset = queryset.filter(title__icontains=term)
+    return queryset
+
+
+def facet_counts(queryset, today):
+    aggregates = {f'due:{name}': Count('id', filter=due_window(name, today)) for name in DUE_WINDOWS}
+    aggregates.update({f'importance:{name}': Count('id', filter=importance_band(name)) for name in IMPORTANCE_BANDS})
+    aggregates['blocked'] = Count('id', filter=Q(blocker_count__gt=0))
+    aggregates['in_cycle'] = Count('id', filter=Q(in_cycle=True))
+    aggregates['completed'] = Count('id', filter=Q(completed=True))
+    aggregates['total'] = Count('id')
+    counts = queryset.order_by().aggregate(**aggregates)
+
+    return {
+        'total': counts['total'],
+        'due': {name: counts[f'due:{name}'] for name in DUE_WINDOWS},
+        'importance': {name: counts[f'importance:{name}'] for name in IMPORTANCE_BANDS},
+        'blocked': counts['blocked'],
+        'in_cycle': counts['in_cycle'],
+        'completed': counts['completed']
+    }
+
+
+def filter_tasks(queryset, today, due=None, importance=None, blocked=None, in_cycle=None, completed=None):
+    if due is not None:
+        queryset = queryset.filter(due_window(due, today))
+    if importance is not None:
+        queryset = queryset.filter(importance_band(importance))
+    if blocked is not None:
+        queryset = queryset.filter(blocker_count__gt=0) if blocked else queryset.filter(blocker_count=0)
+    if in_cycle is not None:
+        queryset = queryset.filter(in_cycle=in_cycle)
+    if completed is not None:
+        queryset = queryset.filter(completed=completed)
+    return queryset
+
+
+def parse_cursor(cursor):
+    score, _, pk = cursor.rpartition('|')
+    return float(score), int(pk)
+
+
+def ranked_page(queryset, fields, limit, after=None):
+    queryset = queryset.order_by('-priority_score', '-id')
+    if after is not None:
+        score, pk = after
+        queryset = queryset.filter(Q(priority_score__lt=score) | Q(priority_score=score, id__lt=pk))
+    rows = list(queryset.values(*fields)[:limit + 1])
+    page = rows[:limit]
+    next_cursor = f"{page[-1]['priority_score']!r}|{page[-1]['id']}" if len(rows) > limit else None
+    return page, next_cursor
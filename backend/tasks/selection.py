@@ -0,0 +1,353 @@
+import heapq
+import math
+from datetime import date
+from .scoring import analyze_all_tasks, normalize_tasks
+
+
+FREE, TAKEN, SKIPPED = 0, 1, 2
+
+
+def eligible_tasks(hours, blockers, cycles, budget):
+    chain = [math.inf if i in cycles else None for i in range(len(hours))]
+    for root in range(len(hours)):
+        if chain[root] is not None:
+            continue
+        work = [root]
+        while work:
+            v = work[-1]
+            pending = [j for j in blockers[v] if chain[j] is None]
+            if pending:
+                work.extend(pending)
+                continue
+            work.pop()
+            if chain[v] is None:
+                longest = 0
+                for j in blockers[v]:
+                    if chain[j] > longest:
+                        longest = chain[j]
+                chain[v] = hours[v] + longest
+    return [i for i, cost in enumerate(chain) if cost <= budget]
+
+
+def _forest_parents(candidates, blockers):
+    parent = {}
+    for i in candidates:
+        distinct = set(blockers[i])
+        if len(distinct) > 1:
+            return None
+        parent[i] = distinct.pop() if distinct else None
+    return parent
+
+
+def _knapsack_forest(values, hours, parent, budget):
+    children = {i: [] for i in parent}
+    roots = []
+    for i, p in parent.items():
+        (roots if p is None else children[p]).append(i)
+
+    order = []
+    end = {}
+    work = [(r, False) for r in reversed(roots)]
+    while work:
+        v, done = work.pop()
+        if done:
+            end[v] = len(order)
+            continue
+        order.append(v)
+        work.append((v, True))
+        work.extend((c, False) for c in reversed(children[v]))
+    skip_to = [end[v] for v in order]
+
+    rows = [None] * (len(order) + 1)
+    rows[-1] = [0.0] * (budget + 1)
+    for k in range(len(order) - 1, -1, -1):
+        v = order[k]
+        h, value = hours[v], values[v]
+        skip, after = rows[skip_to[k]], rows[k + 1]
+        rows[k] = skip[:h] + [max(s, value + t) for s, t in zip(skip[h:], after)]
+
+    chosen = []
+    k, w = 0, budget
+    while k < len(order):
+        if rows[k][w] == rows[skip_to[k]][w]:
+            k = skip_to[k]
+        else:
+            v = order[k]
+            chosen.append(v)
+            w -= hours[v]
+            k += 1
+    return chosen, rows[0][budget]
+
+
+def _relaxed_groups(values, hours, parent):
+    children = [None] * len(values)
+    roots = []
+    for i, p in parent.items():
+        if p is None:
+            roots.append(i)
+        elif children[p] is None:
+            children[p] = [i]
+        else:
+            children[p].append(i)
+
+    preorder = []
+    depth = [0] * len(values)
+    work = roots[::-1]
+    while work:
+        v = work.pop()
+        preorder.append(v)
+        if children[v] is not None:
+            for c in children[v]:
+                depth[c] = depth[v] + 1
+            work.extend(reversed(children[v]))
+
+    push, pop = heapq.heappush, heapq.heappop
+    owner = list(range(len(values)))
+    heaps = [None] * len(values)
+    for v in reversed(preorder):
+        value, cost = values[v], hours[v]
+        heap = []
+        if children[v] is not None:
+            for c in children[v]:
+                other = heaps[c]
+                heaps[c] = None
+                if len(other) > len(heap):
+                    heap, other = other, heap
+                for entry in other:
+                    push(heap, entry)
+            while heap and -heap[0][0] > value / cost:
+                root, merged_value, merged_cost = pop(heap)[2:]
+                owner[root] = v
+                value += merged_value
+                cost += merged_cost
+        push(heap, (-value / cost, depth[v], v, value, cost))
+        heaps[v] = heap
+
+    members = {}
+    for v in preorder:
+        root = owner[v]
+        while owner[root] != root:
+            root = owner[root]
+        owner[v] = root
+        members.setdefault(root, []).append(v)
+    groups = sorted(entry for r in roots for entry in heaps[r])
+    return [(members[root], value, cost) for _, _, root, value, cost in groups]
+
+
+def _relaxed_bound(groups, budget):
+    total, remaining = 0.0, budget
+    for _, value, cost in groups:
+        if value <= 0:
+            break
+        if cost > remaining:
+            return total + value * remaining / cost
+        total += value
+        remaining -= cost
+    return total
+
+
+class _BranchAndBound:
+
+    def __init__(self, values, hours, blockers, successors, candidates, budget, node_limit):
+        self.values = values
+        self.hours = hours
+        self.blockers = blockers
+        self.successors = successors
+        self.budget = budget
+        self.node_limit = node_limit
+        self.order = sorted((i for i in candidates if values[i] > 0),
+                            key=lambda i: (-values[i] / hours[i], -values[i], i))
+        self.state = {i: FREE for i in candidates}
+        self.value = 0.0
+        self.remaining = budget
+        self.nodes = 0
+
+    def bound(self):
+        total, remaining = self.value, self.remaining
+        state, hours, values = self.state, self.hours, self.values
+        for i in self.order:
+            if state[i] != FREE or hours[i] > self.remaining:
+                continue
+            if hours[i] > remaining:
+                return total + values[i] * remaining / hours[i]
+            total += values[i]
+            remaining -= hours[i]
+        return total
+
+    def closure(self, i):
+        state = self.state
+        needed = [i]
+        seen = {i}
+        cost = self.hours[i]
+        k = 0
+        while k < len(needed):
+            for j in self.blockers[needed[k]]:
+                if j in seen:
+                    continue
+                if state.get(j, SKIPPED) == SKIPPED:
+                    return None
+                seen.add(j)
+                if state[j] == FREE:
+                    needed.append(j)
+                    cost += self.hours[j]
+            k += 1
+        if cost > self.remaining:
+            return None
+        return [j for j in needed if state[j] == FREE]
+
+    def take(self, positions):
+        for j in positions:
+            self.state[j] = TAKEN
+            self.value += self.values[j]
+            self.remaining -= self.hours[j]
+        return [(j, FREE) for j in positions]
+
+    def skip(self, i):
+        state = self.state
+        changed = []
+        work = [i]
+        while work:
+            v = work.pop()
+            if state.get(v) != FREE:
+                continue
+            state[v] = SKIPPED
+            changed.append((v, FREE))
+            work.extend(self.successors[v])
+        return changed
+
+    def undo(self, changes):
+        for j, previous in changes:
+            if self.state[j] == TAKEN:
+                self.value -= self.values[j]
+                self.remaining += self.hours[j]
+            self.state[j] = previous
+
+    def greedy(self, groups):
+        taken = []
+        for i in (i for members, value, _ in groups if value > 0 for i in members):
+            if self.state[i] == FREE and self.hours[i] <= self.remaining:
+                needed = self.closure(i)
+                if needed is not None:
+                    taken.extend(self.take(needed))
+        chosen = [j for j, _ in taken]
+        value = self.value
+        self.undo(taken)
+        return chosen, value
+
+    def next_item(self):
+        for i in self.order:
+            if self.state[i] == FREE and self.hours[i] <= self.remaining:
+                return i
+        return None
+
+    def solve(self, groups):
+        best, best_value = self.greedy(groups)
+        root_bound = min(self.bound(), _relaxed_bound(groups, self.budget))
+        if best_value >= root_bound - 1e-9:
+            return best, best_value, best_value, True
+        stack = [[None, 0, []]]
+        complete = True
+        while stack:
+            frame = stack[-1]
+            if frame[1] == 0:
+                frame[1] = 1
+                self.nodes += 1
+                if self.nodes > self.node_limit:
+                    complete = False
+                    break
+                if self.value > best_value + 1e-9:
+                    best_value = self.value
+                    best = [j for j, s in self.state.items() if s == TAKEN]
+                i = self.next_item()
+                if i is None or self.bound() <= best_value + 1e-9:
+                    self.undo(stack.pop()[2])
+                    continue
+                frame[0] = i
+                needed = self.closure(i)
+                if needed is not None:
+                    stack.append([None, 0, self.take(needed)])
+                    continue
+            if frame[1] == 1:
+                frame[1] = 2
+                stack.append([None, 0, self.skip(frame[0])])
+                continue
+            self.undo(stack.pop()[2])
+        while stack:
+            self.undo(stack.pop()[2])
+        return best, best_value, best_value if complete else max(root_bound, best_value), complete
+
+
+def choose_tasks(values, hours, blockers, successors, cycles, budget, dp_cells=250000, node_limit=200):
+    budget = int(math.floor(budget))
+    candidates = eligible_tasks(hours, blockers, cycles, budget)
+    if not candidates:
+        return {'positions': [], 'value': 0.0, 'upper_bound': 0.0, 'optimal': True, 'method': 'none',
+                'candidates': 0}
+
+    parent = _forest_parents(candidates, blockers)
+    if parent is not None and len(candidates) * (budget + 1) <= dp_cells:
+        positions, value = _knapsack_forest(values, hours, parent, budget)
+        return {'positions': positions, 'value': value, 'upper_bound': value, 'optimal': True, 'method': 'dp',
+                'candidates': len(candidates)}
+
+    if parent is None:
+        parent = {i: blockers[i][0] if blockers[i] else None for i in candidates}
+    solver = _BranchAndBound(values, hours, blockers, successors, candidates, budget, node_limit)
+    positions, value, upper_bound, optimal = solver.solve(_relaxed_groups(values, hours, parent))
+    return {'positions': positions, 'value': value, 'upper_bound': upper_bound, 'optimal': optimal,
+            'method': 'branch_and_bound', 'candidates': len(candidates), 'nodes': solver.nodes}
+
+
+def precedence_order(positions, values, blockers):
+    chosen = set(positions)
+    waiting = {i: len({j for j in blockers[i] if j in chosen}) for i in positions}
+    dependents = {i: [] for i in positions}
+    for i in positions:
+        for j in set(blockers[i]):
+            if j in chosen:
+                dependents[j].append(i)
+
+    ready = [(-values[i], i) for i in positions if waiting[i] == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, i = heapq.heappop(ready)
+        order.append(i)
+        for d in dependents[i]:
+            waiting[d] -= 1
+            if waiting[d] == 0:
+                heapq.heappush(ready, (-values[d], d))
+    return order
+
+
+def select_within_budget(tasks, hours, strategy='smart_balance', reference_date=None, dp_cells=250000, node_limit=200):
+    reference_date = reference_date or date.today()
+    index = normalize_tasks(tasks)
+    analyzed = analyze_all_tasks(tasks, strategy, reference_date=reference_date, task_index=index)
+    simplified, _ = index.simplified()
+    cycles = index.cycle_positions()
+
+    values = [task['priority_score'] for task in analyzed]
+    durations = [max(1, int(task.get('estimated_hours') or 1)) for task in analyzed]
+    result = choose_tasks(values, durations, simplified.blockers, simplified.successors, cycles, hours,
+                          dp_cells, node_limit)
+
+    selected = []
+    for i in precedence_order(result['positions'], values, simplified.blockers):
+        task = analyzed[i]
+        if isinstance(task.get('due_date'), date):
+            task['due_date'] = task['due_date'].isoformat()
+        selected.append(task)
+
+    total = result['value']
+    return {
+        'selected_tasks': selected,
+        'budget_hours': hours,
+        'total_hours': sum(durations[i] for i in result['positions']),
+        'total_score': round(total, 2),
+        'upper_bound': round(result['upper_bound'], 2),
+        'optimal': result['optimal'],
+        'method': result['method'],
+        'candidates': result['candidates'],
+        'excluded_circular': len(cycles)
+    }
@@ -1,5 +1,9 @@
+import math
 from rest_framework import serializers
+from .layout import MAX_VIEWPORT_SPAN
 from .models import Task
+from .scoring import STRATEGY_NAMES
+from .search import DUE_WINDOWS, IMPORTANCE_BANDS, parse_cursor
 
 
 class TaskSerializer(serializers.ModelSerializer):
@@ -8,6 +12,20 @@ class TaskSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class WorkspaceTaskSerializer(serializers.ModelSerializer):
+    dependencies = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        default=list
+    )
+
+    class Meta:
+        model = Task
+        fields = ['id', 'title', 'due_date', 'estimated_hours', 'importance', 'dependencies', 'completed',
+                  'created_at']
+        read_only_fields = ['id', 'created_at']
+
+
 class TaskAnalysisInputSerializer(serializers.Serializer):
     title = serializers.CharField(max_length=200)
     due_date = serializers.DateField()
@@ -28,3 +46,138 @@ class TaskAnalysisOutputSerializer(serializers.Serializer):
     dependencies = serializers.ListField(child=serializers.IntegerField())
     priority_score = serializers.FloatField()
     explanation = serializers.CharField()
+
+
+class AnalysisOptionsSerializer(serializers.Serializer):
+    reference_date = serializers.DateField(required=False)
+    include_graph = serializers.BooleanField(default=True)
+    propagation = serializers.ChoiceField(choices=['legacy', 'jacobi', 'gauss_seidel'], default='legacy')
+    damping = serializers.FloatField(default=1.0, min_value=0.05, max_value=1.0)
+    tolerance = serializers.FloatField(default=0.001, min_value=0)
+    max_iterations = serializers.IntegerField(default=100, min_value=1, max_value=10000)
+    since_version = serializers.CharField(required=False, max_length=64)
+    simplify = serializers.BooleanField(default=False)
+    downstream = serializers.BooleanField(default=False)
+
+
+class BatchAnalysisSerializer(serializers.Serializer):
+    backlogs = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=1000)
+    processes = serializers.IntegerField(default=0, min_value=0, max_value=64)
+
+
+class PartitionSerializer(serializers.Serializer):
+    tasks = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+    strategy = serializers.ChoiceField(choices=list(STRATEGY_NAMES))
+    reference_date = serializers.DateField()
+    propagation = serializers.DictField(required=False, allow_null=True)
+    downstream = serializers.BooleanField(default=False)
+
+
+class AnalysisJobQuerySerializer(serializers.Serializer):
+    wait = serializers.FloatField(default=0, min_value=0)
+
+
+class ForecastOptionsSerializer(serializers.Serializer):
+    start_date = serializers.DateField(required=False)
+    days = serializers.IntegerField(default=30, min_value=1, max_value=366)
+    top = serializers.IntegerField(default=10, min_value=1, max_value=100)
+
+
+class PlanOptionsSerializer(serializers.Serializer):
+    hours_per_day = serializers.FloatField(default=8, min_value=0.5, max_value=24)
+    people = serializers.IntegerField(default=1, min_value=1, max_value=1000)
+    horizon_days = serializers.IntegerField(default=14, min_value=1, max_value=366)
+    start_date = serializers.DateField(required=False)
+
+
+class SelectOptionsSerializer(serializers.Serializer):
+    hours = serializers.FloatField(default=8, min_value=1, max_value=100000)
+    reference_date = serializers.DateField(required=False)
+
+
+class SimulationEditSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=['shift_due', 'set', 'add_dependency', 'remove_dependency'])
+    task = serializers.IntegerField()
+    days = serializers.IntegerField(required=False)
+    dependency = serializers.IntegerField(required=False)
+    due_date = serializers.DateField(required=False)
+    estimated_hours = serializers.IntegerField(required=False, min_value=1)
+    importance = serializers.IntegerField(required=False, min_value=1, max_value=10)
+
+    def validate(self, data):
+        op = data['op']
+        if op == 'shift_due' and 'days' not in data:
+            raise serializers.ValidationError('shift_due requires days')
+        if op in ('add_dependency', 'remove_dependency') and 'dependency' not in data:
+            raise serializers.ValidationError(f'{op} requires dependency')
+        if op == 'set' and not any(f in data for f in ('due_date', 'estimated_hours', 'importance')):
+            raise serializers.ValidationError('set requires due_date, estimated_hours or importance')
+        return data
+
+
+class SimulationScenarioSerializer(serializers.Serializer):
+    name = serializers.CharField(required=False, default='', allow_blank=True)
+    edits = SimulationEditSerializer(many=True, allow_empty=False)
+
+
+class SimulationRequestSerializer(serializers.Serializer):
+    analysis_id = serializers.CharField()
+    scenarios = SimulationScenarioSerializer(many=True, allow_empty=False)
+    limit = serializers.IntegerField(default=50, min_value=1, max_value=1000)
+
+
+class GraphLayoutQuerySerializer(serializers.Serializer):
+    analysis_id = serializers.CharField()
+    lod = serializers.ChoiceField(choices=['none', 'scc', 'component'], default='none')
+    viewport = serializers.CharField(required=False)
+
+    def validate_viewport(self, value):
+        try:
+            x0, y0, x1, y1 = (float(part) for part in value.split(','))
+        except ValueError:
+            raise serializers.ValidationError('viewport must be x0,y0,x1,y1')
+        if not all(math.isfinite(v) for v in (x0, y0, x1, y1)):
+            raise serializers.ValidationError('viewport values must be finite numbers')
+        if x1 < x0 or y1 < y0:
+            raise serializers.ValidationError('viewport must have x0 <= x1 and y0 <= y1')
+        if x1 - x0 > MAX_VIEWPORT_SPAN or y1 - y0 > MAX_VIEWPORT_SPAN:
+            raise serializers.ValidationError(f'viewport may span at most {MAX_VIEWPORT_SPAN} units per side')
+        return (x0, y0, x1, y1)
+
+
+class GraphQuerySerializer(serializers.Serializer):
+    analysis_id = serializers.CharField()
+    encoding = serializers.ChoiceField(choices=['json', 'base64', 'msgpack'], default='json')
+    include_titles = serializers.BooleanField(default=False)
+
+
+class ReadyQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=1000)
+    strategy = serializers.ChoiceField(choices=list(STRATEGY_NAMES), default='smart_balance')
+
+
+class CompletionSerializer(serializers.Serializer):
+    completed = serializers.BooleanField(default=True)
+
+
+class TaskSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(required=False, default='', allow_blank=True, max_length=200)
+    due = serializers.ChoiceField(choices=list(DUE_WINDOWS), required=False)
+    importance_band = serializers.ChoiceField(choices=list(IMPORTANCE_BANDS), required=False)
+    blocked = serializers.BooleanField(required=False, allow_null=True, default=None)
+    in_cycle = serializers.BooleanField(required=False, allow_null=True, default=None)
+    completed = serializers.BooleanField(required=False, allow_null=True, default=None)
+    facets = serializers.BooleanField(default=False)
+    limit = serializers.IntegerField(default=50, min_value=1, max_value=500)
+    after = serializers.CharField(required=False)
+
+    def validate_after(self, value):
+        try:
+            return parse_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError('after must be a cursor returned as next')
+
+
+class WorkspacePageSerializer(serializers.Serializer):
+    offset = serializers.IntegerField(default=0, min_value=0)
+    limit = serializers.IntegerField(default=1000, min_value=1, max_value=10000)
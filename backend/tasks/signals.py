@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Task, Workspace
+from .views import bump_task_version, ready_queues, workspace_feeds
+
+
+@receiver([post_save, post_delete], sender=Task)
+def task_changed(sender, instance, **kwargs):
+    if instance.workspace_id is not None:
+        bump_task_version(instance.workspace_id)
+        workspace_feeds.notify(instance.workspace_id)
+        ready_queues.pop(instance.workspace_id)
+
+
+@receiver(post_save, sender=Workspace)
+def workspace_changed(sender, instance, **kwargs):
+    workspace_feeds.notify(instance.pk)
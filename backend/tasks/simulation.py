@@ -0,0 +1,158 @@
+import heapq
+from collections import ChainMap
+from datetime import date, timedelta
+from .graph import weakly_connected_components
+from .graph_codec import encode_graph
+from .layout import build_graph_view
+from .propagation import Propagation
+from .scoring import TaskIndex, analyze_all_tasks, parse_date
+
+
+INPUT_FIELDS = ('id', 'title', 'due_date', 'estimated_hours', 'importance', 'dependencies')
+
+
+class SimulationError(ValueError):
+    pass
+
+
+class AnalysisSnapshot:
+
+    def __init__(self, analyzed, strategy='smart_balance', score_cache=None, reference_date=None,
+                 task_index=None, propagation=None, simplify=False, work_calendar=None):
+        self.strategy = strategy
+        self.work_calendar = work_calendar
+        self.simplify = simplify
+        self.propagation = propagation.options() if propagation is not None else None
+        self.reference_date = reference_date or date.today()
+        self.score_cache = score_cache if score_cache is not None else {}
+        self.inputs = [
+            {f: (list(t[f]) if f == 'dependencies' else t[f]) for f in INPUT_FIELDS if f in t}
+            for t in analyzed
+        ]
+        self.scores = [t['priority_score'] for t in analyzed]
+
+        task_index = task_index or TaskIndex(self.inputs)
+        self.positions = task_index.positions
+        self.successors = task_index.successors
+        self.cycles = task_index.cycle_positions()
+
+        self.component, self.members = weakly_connected_components(self.successors)
+        self._layouts = {}
+        self.ranking = sorted(range(len(self.inputs)), key=lambda i: (-self.scores[i], i))
+        self.rank_of = [0] * len(self.inputs)
+        for rank, i in enumerate(self.ranking):
+            self.rank_of[i] = rank
+
+    def graph_view(self, lod='none'):
+        view = self._layouts.get(lod)
+        if view is None:
+            view = build_graph_view(
+                [t['id'] for t in self.inputs],
+                [t.get('title', f"Task {t['id']}") for t in self.inputs],
+                self.scores,
+                self.successors,
+                lod,
+                self.cycles
+            )
+            self._layouts[lod] = view
+        return view
+
+    def encode_graph(self, edge_format='json', include_titles=False):
+        titles = None
+        if include_titles:
+            titles = [t.get('title', f"Task {t['id']}") for t in self.inputs]
+        return encode_graph([t['id'] for t in self.inputs], self.scores, self.successors, titles, edge_format,
+                            self.cycles)
+
+    def _copy_input(self, pos):
+        task = dict(self.inputs[pos])
+        task['dependencies'] = list(task['dependencies'])
+        return task
+
+    def _apply(self, edits):
+        overlay = {}
+        touched = set()
+
+        def editable(task_id):
+            pos = self.positions.get(task_id)
+            if pos is None:
+                raise SimulationError(f'Unknown task {task_id}')
+            if pos not in overlay:
+                overlay[pos] = self._copy_input(pos)
+            touched.add(pos)
+            return overlay[pos]
+
+        for edit in edits:
+            op = edit['op']
+            task = editable(edit['task'])
+
+            if op == 'shift_due':
+                due = parse_date(task.get('due_date'))
+                if due is None:
+                    raise SimulationError(f"Task {edit['task']} has no valid due date to shift")
+                task['due_date'] = due + timedelta(days=edit['days'])
+            elif op == 'set':
+                for field in ('due_date', 'importance', 'estimated_hours'):
+                    if field in edit:
+                        task[field] = edit[field]
+            else:
+                dep_id = edit['dependency']
+                if dep_id in self.positions:
+                    touched.add(self.positions[dep_id])
+                if op == 'add_dependency':
+                    if dep_id not in task['dependencies']:
+                        task['dependencies'].append(dep_id)
+                else:
+                    task['dependencies'] = [d for d in task['dependencies'] if d != dep_id]
+
+        return overlay, touched
+
+    def simulate(self, edits, limit=50):
+        overlay, touched = self._apply(edits)
+
+        roots = {self.component[p] for p in touched}
+        subset = sorted(p for root in roots for p in self.members[root])
+        tasks = [overlay.get(p) or self._copy_input(p) for p in subset]
+        task_index = TaskIndex(tasks).simplified()[0] if self.simplify else None
+
+        analyze_all_tasks(
+            tasks,
+            self.strategy,
+            score_cache=ChainMap({}, self.score_cache),
+            reference_date=self.reference_date,
+            work_calendar=self.work_calendar,
+            task_index=task_index,
+            propagation=Propagation(**self.propagation) if self.propagation else None
+        )
+        new_scores = {p: t['priority_score'] for p, t in zip(subset, tasks)}
+
+        def rank_key(p):
+            return (-new_scores.get(p, self.scores[p]), p)
+
+        rest = [p for p in self.ranking if p not in new_scores]
+        moved = sorted(subset, key=rank_key)
+
+        changes = []
+        for new_rank, p in enumerate(heapq.merge(rest, moved, key=rank_key)):
+            old_rank = self.rank_of[p]
+            new_score = new_scores.get(p, self.scores[p])
+            if new_rank == old_rank and new_score == self.scores[p]:
+                continue
+            task = self.inputs[p]
+            changes.append({
+                'id': task['id'],
+                'title': task.get('title', f"Task {task['id']}"),
+                'old_rank': old_rank + 1,
+                'new_rank': new_rank + 1,
+                'rank_delta': old_rank - new_rank,
+                'old_score': self.scores[p],
+                'new_score': new_score
+            })
+
+        changes.sort(key=lambda c: (-abs(c['rank_delta']), c['new_rank']))
+
+        return {
+            'affected_tasks': len(subset),
+            'changed_tasks': len(changes),
+            'changes': changes[:limit]
+        }
@@ -0,0 +1,209 @@
+import gc
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from django.urls import reverse
+from .scoring import STRATEGY_NAMES
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+HARNESS_FILES = (os.path.abspath(__file__), os.path.join(APP_DIR, 'management'), os.path.join(APP_DIR, 'tests.py'))
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+DEFAULT_MIX = 'analyze=6,suggest=2,plan=1,select=1'
+ENDPOINT_OPTIONS = {
+    'analyze': {},
+    'suggest': {},
+    'plan': {'hours_per_day': 6, 'people': 2, 'horizon_days': 14},
+    'select': {'hours': 40},
+    'forecast': {'days': 14, 'top': 10},
+}
+
+
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in ENDPOINT_OPTIONS:
+            raise ValueError(f"Unknown endpoint {name!r}, expected one of {', '.join(ENDPOINT_OPTIONS)}")
+        try:
+            mix[name] = int(weight or 1)
+        except ValueError:
+            raise ValueError(f'Weight for {name} must be an integer')
+        if mix[name] < 0:
+            raise ValueError(f'Weight for {name} must not be negative')
+    if not any(mix.values()):
+        raise ValueError('Mix needs at least one endpoint with a positive weight')
+    return mix
+
+
+def synthetic_backlog(rng, size, today):
+    tasks = []
+    for i in range(size):
+        dependencies = rng.sample(range(i), min(i, rng.choice((0, 0, 1, 1, 2))))
+        tasks.append({
+            'title': f'Task {i + 1} ' + 'x' * rng.randint(0, 40),
+            'due_date': (today + timedelta(days=rng.randint(-5, 45))).isoformat(),
+            'estimated_hours': rng.randint(1, 16),
+            'importance': rng.randint(1, 10),
+            'dependencies': dependencies
+        })
+    return tasks
+
+
+def build_requests(mix, size, variants, seed=0):
+    rng = random.Random(seed)
+    today = date.today()
+    requests = []
+    for _ in range(variants):
+        tasks = synthetic_backlog(rng, size, today)
+        strategy = rng.choice(list(STRATEGY_NAMES))
+        for name in mix:
+            body = dict(ENDPOINT_OPTIONS[name], tasks=tasks, strategy=strategy)
+            requests.append((name, json.dumps(body, separators=(',', ':'))))
+    return requests
+
+
+def allocation_sites(before, after, limit=15):
+    app = tracemalloc.Filter(True, os.path.join(APP_DIR, '*'), all_frames=True)
+    diffs = after.filter_traces([app]).compare_to(before.filter_traces([app]), 'traceback')
+    sites = {}
+    for diff in diffs:
+        frame = next(
+            (f for f in reversed(diff.traceback)
+             if f.filename.startswith(APP_DIR) and not f.filename.startswith(HARNESS_FILES)),
+            None
+        )
+        if frame is None:
+            continue
+        key = f'{os.path.relpath(frame.filename, APP_DIR)}:{frame.lineno}'
+        size, count = sites.get(key, (0, 0))
+        sites[key] = (size + diff.size_diff, count + diff.count_diff)
+    ranked = sorted(((key, size, count) for key, (size, count) in sites.items() if size > 0), key=lambda s: -s[1])
+    return [{'site': key, 'size_diff': size, 'count_diff': count} for key, size, count in ranked[:limit]]
+
+
+def run_soak(client, iterations, mix, size=100, variants=50, warmup=200, traced=300, frames=10, seed=0,
+             sample_every=250, top=15):
+    bodies = {name: [] for name in mix}
+    for name, body in build_requests(mix, size, variants, seed):
+        bodies[name].append(body)
+    paths = {name: reverse(f'{name}_tasks') for name in mix}
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    stats = {name: {'requests': 0, 'errors': 0, 'seconds': [], 'rss': [], 'peak_alloc': None} for name in names}
+
+    def replay(count):
+        for _ in range(count):
+            name = rng.choices(names, weights)[0]
+            body = bodies[name][rng.randrange(variants)]
+            tracing = tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            failed = client.post(paths[name], body, content_type='application/json').status_code >= 400
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] - before if tracing else None
+            yield stats[name], failed, elapsed, peak
+
+    for _ in replay(warmup):
+        pass
+
+    gc.collect()
+    samples = [{'iteration': 0, 'rss': rss_bytes()}]
+    for n, (entry, failed, elapsed, _) in enumerate(replay(iterations), 1):
+        entry['requests'] += 1
+        entry['errors'] += failed
+        entry['seconds'].append(elapsed)
+        entry['rss'].append(rss_bytes())
+        if n % sample_every == 0 and n < iterations:
+            samples.append({'iteration': n, 'rss': rss_bytes()})
+    gc.collect()
+    samples.append({'iteration': iterations, 'rss': rss_bytes()})
+
+    traced_growth, sites = None, []
+    if traced:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(frames)
+        try:
+            for _ in replay(warmup):
+                pass
+            gc.collect()
+            baseline = tracemalloc.take_snapshot()
+            before = tracemalloc.get_traced_memory()[0]
+            for entry, failed, _, peak in replay(traced):
+                entry['errors'] += failed
+                entry['peak_alloc'] = max(entry['peak_alloc'] or 0, peak)
+            gc.collect()
+            final = tracemalloc.take_snapshot()
+            traced_growth = tracemalloc.get_traced_memory()[0] - before
+            sites = allocation_sites(baseline, final, top)
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    endpoints = {}
+    for name, entry in stats.items():
+        if not entry['requests']:
+            continue
+        steady = entry['rss'][len(entry['rss']) // 2:]
+        endpoints[name] = {
+            'requests': entry['requests'],
+            'errors': entry['errors'],
+            'mean_ms': round(statistics.fmean(entry['seconds']) * 1000, 3),
+            'peak_alloc_bytes': entry['peak_alloc'],
+            'peak_rss_bytes': max(entry['rss']),
+            'steady_rss_bytes': int(statistics.median(steady))
+        }
+
+    return {
+        'iterations': iterations,
+        'warmup': warmup,
+        'traced': traced,
+        'tasks_per_request': size,
+        'endpoints': endpoints,
+        'samples': samples,
+        'rss_growth_bytes': samples[-1]['rss'] - samples[0]['rss'],
+        'traced_growth_bytes': traced_growth,
+        'peak_rss_bytes': peak_rss_bytes(),
+        'allocation_sites': sites
+    }
+
+
+def growth_failures(report, max_growth_kb=None, max_rss_growth_mb=None):
+    failures = []
+    for name, entry in report['endpoints'].items():
+        if entry['errors']:
+            failures.append(f"{name}: {entry['errors']} request(s) failed")
+    growth = report['traced_growth_bytes']
+    if max_growth_kb is not None and growth is not None and growth > max_growth_kb * 1024:
+        failures.append(
+            f"traced memory grew {growth / 1024:.1f} KiB over {report['traced']} requests (limit {max_growth_kb} KiB)"
+        )
+    if max_rss_growth_mb is not None and report['rss_growth_bytes'] > max_rss_growth_mb * 1024 * 1024:
+        failures.append(
+            f"RSS grew {report['rss_growth_bytes'] / 1024 / 1024:.1f} MiB "
+            f"over {report['iterations']} requests (limit {max_rss_growth_mb} MiB)"
+        )
+    return failures
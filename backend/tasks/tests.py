@@ -1,4 +1,17 @@
-from django.test import TestCase
+import base64
+import json
+import os
+import tempfile
+import tracemalloc
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import Client, LiveServerTestCase, TestCase, override_settings
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from datetime import date, timedelta
@@ -9,8 +22,37 @@ from .scoring import (
     is_weekend,
     is_working_day,
     get_working_days_remaining,
-    get_common_holidays
+    get_common_holidays,
+    get_working_dates,
+    propagate_scores,
+    normalize_tasks,
+    detect_cycles,
+    DuplicateTaskIdError,
+    TaskIndex,
+    WorkingDayCalendar
 )
+from .planner import plan_schedule
+from .selection import choose_tasks, select_within_budget
+from .soak import allocation_sites, growth_failures, parse_mix, run_soak
+from .graph import ReachabilityIndex, transitive_reduction
+from .simulation import AnalysisSnapshot
+from .forecast import forecast_rankings
+from .instrumentation import recording, MetricsRegistry
+from .layout import layered_layout, build_graph_view, SpatialIndex
+from .graph_codec import pack_edges, unpack_edges, encode_graph
+from .propagation import Propagation
+from .models import AnalysisJob, Task, Workspace
+from .job_queue import claim_next_job, finish_job, job_lease, purge_expired_jobs
+from .views import bump_task_version, profile_store, ready_queues, workspace_feeds, workspace_runtimes
+from .feeds import Feed
+from .admin import EstimatedCountPaginator
+from .materialize import refresh_scores
+from .ready import ReadyQueue
+from .search import fts_available, match_expression
+from .profiling import anonymize_payload
+from .rank_diff import RankingVersion, apply_diff, diff_rankings
+from .cli import InputError, read_tasks, score_tasks, write_ranked
+from .columnar import ColumnarSnapshot, SnapshotFormatError, write_snapshot
 
 
 class ScoringAlgorithmTests(TestCase):
@@ -560,3 +602,1879 @@ class APITests(TestCase):
         analyzed = analyze_all_tasks([task])
         self.assertEqual(len(analyzed), 1)
         self.assertIn('priority_score', analyzed[0])
+
+
+class PlannerTests(TestCase):
+    
+    def setUp(self):
+        self.monday = date(2024, 1, 8)
+    
+    def test_schedule_respects_dependency_order(self):
+        tasks = [
+            {'id': 0, 'title': 'Design', 'due_date': self.monday + timedelta(days=10),
+             'importance': 3, 'estimated_hours': 4, 'dependencies': []},
+            {'id': 1, 'title': 'Build', 'due_date': self.monday + timedelta(days=2),
+             'importance': 10, 'estimated_hours': 6, 'dependencies': [0]},
+        ]
+        
+        plan = plan_schedule(tasks, hours_per_day=8, horizon_days=7, start_date=self.monday)
+        
+        first_day = [e['id'] for e in plan['schedule'][0]['tasks']]
+        self.assertEqual(first_day, [0, 1])
+        self.assertEqual(plan['schedule'][0]['hours_used'], 8)
+        self.assertEqual(plan['schedule'][1]['tasks'][0]['hours'], 2)
+        self.assertEqual(plan['scheduled_tasks'], 2)
+    
+    def test_schedule_skips_weekends_and_reports_late_tasks(self):
+        tasks = [
+            {'id': 0, 'title': 'Big Task', 'due_date': self.monday + timedelta(days=1),
+             'importance': 5, 'estimated_hours': 40, 'dependencies': []},
+        ]
+        
+        plan = plan_schedule(tasks, hours_per_day=8, horizon_days=14, start_date=self.monday)
+        
+        dates = [d['date'] for d in plan['schedule']]
+        self.assertEqual(dates, [str(d) for d in get_working_dates(self.monday, self.monday + timedelta(days=14))])
+        self.assertEqual(len(plan['late_tasks']), 1)
+        self.assertEqual(plan['late_tasks'][0]['projected_finish'], '2024-01-12')
+    
+    def test_cycle_members_are_blocked(self):
+        tasks = [
+            {'id': 0, 'title': 'A', 'due_date': self.monday, 'dependencies': [1]},
+            {'id': 1, 'title': 'B', 'due_date': self.monday, 'dependencies': [0]},
+            {'id': 2, 'title': 'C', 'due_date': self.monday, 'dependencies': []},
+        ]
+        
+        plan = plan_schedule(tasks, start_date=self.monday)
+        
+        self.assertEqual(sorted(t['id'] for t in plan['blocked']), [0, 1])
+        self.assertEqual(plan['scheduled_tasks'], 1)
+    
+    def test_finish_past_the_projection_limit_is_out_of_range(self):
+        client = APIClient()
+        data = {
+            'tasks': [
+                {'title': 'Endless', 'due_date': str(self.monday), 'estimated_hours': 100000000},
+                {'title': 'Short', 'due_date': str(self.monday), 'estimated_hours': 2},
+            ],
+            'start_date': str(self.monday)
+        }
+        
+        response = client.post('/api/tasks/plan/', data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['unscheduled'],
+                         [{'id': 0, 'title': 'Endless', 'projected_finish': None, 'out_of_range': True}])
+        self.assertIsNone(response.data['late_tasks'][0]['days_late'])
+    
+    def test_plan_endpoint(self):
+        client = APIClient()
+        data = {
+            'tasks': [
+                {'title': 'Task A', 'due_date': str(date.today() + timedelta(days=3)),
+                 'estimated_hours': 3, 'importance': 5, 'dependencies': []},
+                {'title': 'Task B', 'due_date': str(date.today() + timedelta(days=5)),
+                 'estimated_hours': 2, 'importance': 7, 'dependencies': [0]},
+            ],
+            'hours_per_day': 4,
+            'people': 2,
+            'horizon_days': 10
+        }
+        
+        response = client.post('/api/tasks/plan/', data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('schedule', response.data)
+        self.assertIn('late_tasks', response.data)
+        self.assertEqual(response.data['scheduled_tasks'], 2)
+        
+        response = client.post('/api/tasks/plan/', dict(data, hours_per_day=0), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReachabilityTests(TestCase):
+    
+    def test_counts_and_weights_follow_transitive_dependents(self):
+        successors = [[1, 2], [3], [3], []]
+        index = ReachabilityIndex(successors)
+        
+        self.assertEqual(index.counts(), [3, 1, 1, 0])
+        self.assertEqual(index.weights([1, 10, 20, 40]), [70, 40, 40, 0])
+    
+    def test_cycle_members_reach_each_other(self):
+        successors = [[1], [0, 2], []]
+        index = ReachabilityIndex(successors)
+        
+        self.assertEqual(index.counts(), [2, 2, 0])
+    
+    def test_analyze_exposes_downstream_fields(self):
+        tasks = [
+            {'id': 0, 'title': 'Root', 'due_date': date.today() + timedelta(days=20),
+             'importance': 2, 'estimated_hours': 4, 'dependencies': []},
+            {'id': 1, 'title': 'Middle', 'due_date': date.today() + timedelta(days=20),
+             'importance': 2, 'estimated_hours': 4, 'dependencies': [0]},
+            {'id': 2, 'title': 'Leaf', 'due_date': date.today() + timedelta(days=20),
+             'importance': 2, 'estimated_hours': 4, 'dependencies': [1]},
+            {'id': 3, 'title': 'Loner', 'due_date': date.today() + timedelta(days=20),
+             'importance': 2, 'estimated_hours': 4, 'dependencies': []},
+        ]
+        
+        analyzed = analyze_all_tasks(tasks, 'unblock_first')
+        by_id = {t['id']: t for t in analyzed}
+        
+        self.assertEqual(by_id[0]['downstream_count'], 2)
+        self.assertEqual(by_id[2]['downstream_count'], 0)
+        self.assertAlmostEqual(
+            by_id[0]['downstream_weight'],
+            by_id[1]['raw_score'] + by_id[2]['raw_score'],
+            places=1
+        )
+        self.assertGreater(by_id[0]['raw_score'], by_id[3]['raw_score'])
+    
+    def test_reachability_is_only_built_when_needed(self):
+        tasks = [
+            {'title': 'Root', 'due_date': str(date.today() + timedelta(days=5)), 'dependencies': []},
+            {'title': 'Leaf', 'due_date': str(date.today() + timedelta(days=5)), 'dependencies': [0]},
+        ]
+        client = APIClient()
+        
+        with recording() as recorder:
+            analyzed = analyze_all_tasks([dict(t) for t in tasks], 'smart_balance')
+        self.assertNotIn('reachability', recorder.stages)
+        self.assertNotIn('downstream_count', analyzed[0])
+        
+        plain = client.post('/api/tasks/analyze/', {'tasks': tasks}, format='json').data
+        counted = client.post('/api/tasks/analyze/', {'tasks': tasks, 'downstream': True}, format='json').data
+        self.assertNotIn('downstream_count', plain['tasks'][0])
+        self.assertEqual({t['id']: t['downstream_count'] for t in counted['tasks']}, {0: 1, 1: 0})
+        self.assertEqual([t['priority_score'] for t in plain['tasks']],
+                         [t['priority_score'] for t in counted['tasks']])
+
+
+class SimulationTests(TestCase):
+    
+    def make_tasks(self):
+        return [
+            {'id': 0, 'title': 'Schema', 'due_date': date.today() + timedelta(days=20),
+             'importance': 3, 'estimated_hours': 4, 'dependencies': []},
+            {'id': 1, 'title': 'API', 'due_date': date.today() + timedelta(days=2),
+             'importance': 9, 'estimated_hours': 2, 'dependencies': [0]},
+            {'id': 2, 'title': 'Docs', 'due_date': date.today() + timedelta(days=1),
+             'importance': 6, 'estimated_hours': 1, 'dependencies': []},
+            {'id': 3, 'title': 'Launch', 'due_date': date.today() + timedelta(days=10),
+             'importance': 8, 'estimated_hours': 3, 'dependencies': [2]},
+        ]
+    
+    def test_simulation_matches_full_reanalysis(self):
+        score_cache = {}
+        analyzed = analyze_all_tasks(self.make_tasks(), score_cache=score_cache)
+        snapshot = AnalysisSnapshot(analyzed, 'smart_balance', score_cache)
+        
+        result = snapshot.simulate([
+            {'op': 'shift_due', 'task': 1, 'days': 14},
+            {'op': 'remove_dependency', 'task': 3, 'dependency': 2},
+        ])
+        
+        edited = self.make_tasks()
+        edited[1]['due_date'] += timedelta(days=14)
+        edited[3]['dependencies'] = []
+        expected = analyze_all_tasks(edited)
+        expected_scores = {t['id']: t['priority_score'] for t in expected}
+        
+        self.assertEqual(result['affected_tasks'], 4)
+        for change in result['changes']:
+            self.assertEqual(change['new_score'], expected_scores[change['id']])
+        
+        self.assertEqual(snapshot.inputs[1]['due_date'], date.today() + timedelta(days=2))
+        self.assertEqual(snapshot.inputs[3]['dependencies'], [2])
+    
+    def test_simulation_only_rescores_affected_component(self):
+        analyzed = analyze_all_tasks(self.make_tasks())
+        snapshot = AnalysisSnapshot(analyzed)
+        
+        result = snapshot.simulate([{'op': 'set', 'task': 2, 'importance': 1}])
+        
+        self.assertEqual(result['affected_tasks'], 2)
+        self.assertTrue(all(c['id'] in (2, 3) or c['old_score'] == c['new_score'] for c in result['changes']))
+    
+    def test_simulate_endpoint(self):
+        client = APIClient()
+        tasks = [
+            {'title': t['title'], 'due_date': str(t['due_date']), 'importance': t['importance'],
+             'estimated_hours': t['estimated_hours'], 'dependencies': t['dependencies']}
+            for t in self.make_tasks()
+        ]
+        
+        response = client.post('/api/tasks/analyze/', {'tasks': tasks}, format='json')
+        analysis_id = response.data['analysis_id']
+        
+        response = client.post('/api/tasks/simulate/', {
+            'analysis_id': analysis_id,
+            'scenarios': [
+                {'name': 'slip', 'edits': [{'op': 'shift_due', 'task': 2, 'days': 30}]},
+                {'name': 'bad', 'edits': [{'op': 'add_dependency', 'task': 0}]},
+            ]
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        response = client.post('/api/tasks/simulate/', {
+            'analysis_id': analysis_id,
+            'scenarios': [{'name': 'slip', 'edits': [{'op': 'shift_due', 'task': 2, 'days': 30}]}]
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['scenarios'][0]['name'], 'slip')
+        self.assertGreater(response.data['scenarios'][0]['changed_tasks'], 0)
+        
+        response = client.post('/api/tasks/simulate/', {
+            'analysis_id': 'missing',
+            'scenarios': [{'edits': [{'op': 'shift_due', 'task': 2, 'days': 1}]}]
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ForecastTests(TestCase):
+    
+    def make_tasks(self):
+        start = date(2024, 12, 20)
+        return [
+            {'id': 0, 'title': 'Release', 'due_date': start + timedelta(days=12),
+             'importance': 9, 'estimated_hours': 3, 'dependencies': [1]},
+            {'id': 1, 'title': 'QA', 'due_date': start + timedelta(days=20),
+             'importance': 4, 'estimated_hours': 6, 'dependencies': []},
+            {'id': 2, 'title': 'Report', 'due_date': start + timedelta(days=3),
+             'importance': 6, 'estimated_hours': 1, 'dependencies': []},
+        ]
+    
+    def test_reference_date_shifts_urgency(self):
+        task = {'title': 'T', 'due_date': date(2024, 3, 15), 'importance': 5, 'estimated_hours': 2}
+        
+        on_time = analyze_all_tasks([dict(task)], reference_date=date(2024, 3, 15))[0]
+        overdue = analyze_all_tasks([dict(task)], reference_date=date(2024, 3, 25))[0]
+        
+        self.assertIn('Due today', on_time['explanation'])
+        self.assertIn('Overdue by 10 days', overdue['explanation'])
+        self.assertGreater(overdue['priority_score'], on_time['priority_score'])
+    
+    def test_forecast_matches_per_day_analysis(self):
+        start = date(2024, 12, 20)
+        forecast = forecast_rankings(self.make_tasks(), start_date=start, days=15, top=3)
+        
+        self.assertEqual(len(forecast['days']), 15)
+        for offset in (0, 5, 14):
+            day = start + timedelta(days=offset)
+            analyzed = analyze_all_tasks(self.make_tasks(), reference_date=day)
+            expected = sorted(analyzed, key=lambda t: t['priority_score'], reverse=True)
+            top = forecast['days'][offset]['top']
+            self.assertEqual([t['id'] for t in top], [t['id'] for t in expected])
+            self.assertEqual([t['priority_score'] for t in top], [t['priority_score'] for t in expected])
+        
+        self.assertEqual(len(forecast['series']), 3)
+        self.assertEqual(len(forecast['series'][0]['ranks']), 15)
+    
+    def test_forecast_builds_reachability_only_for_downstream_strategies(self):
+        start = date(2024, 12, 20)
+        
+        with recording() as recorder:
+            forecast_rankings(self.make_tasks(), start_date=start, days=3)
+        self.assertNotIn('reachability', recorder.stages)
+        
+        with recording() as recorder:
+            forecast = forecast_rankings(self.make_tasks(), 'unblock_first', start_date=start, days=3)
+        self.assertIn('reachability', recorder.stages)
+        expected = analyze_all_tasks(self.make_tasks(), 'unblock_first', reference_date=start)
+        self.assertEqual(sorted(t['priority_score'] for t in forecast['days'][0]['top']),
+                         sorted(t['priority_score'] for t in expected))
+    
+    def test_working_day_calendar_matches_day_by_day_count(self):
+        calendar = WorkingDayCalendar(extra_holidays=[date(2025, 1, 2)])
+        start = date(2024, 11, 25)
+        
+        for days in (0, 1, 7, 40, 400):
+            end = start + timedelta(days=days)
+            expected = sum(
+                1 for k in range(days)
+                if is_working_day(start + timedelta(days=k)) and start + timedelta(days=k) != date(2025, 1, 2)
+            )
+            self.assertEqual(calendar.working_days_between(start, end), expected)
+    
+    def test_forecast_endpoint(self):
+        client = APIClient()
+        tasks = [
+            {'title': t['title'], 'due_date': str(t['due_date']), 'importance': t['importance'],
+             'estimated_hours': t['estimated_hours'], 'dependencies': t['dependencies']}
+            for t in self.make_tasks()
+        ]
+        
+        response = client.post('/api/tasks/forecast/', {
+            'tasks': tasks, 'start_date': '2024-12-20', 'days': 10, 'top': 2
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['days']), 10)
+        self.assertEqual(len(response.data['days'][0]['top']), 2)
+        
+        response = client.post('/api/tasks/analyze/', {
+            'tasks': tasks, 'reference_date': '2025-01-10'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(any('Overdue' in t['explanation'] for t in response.data['tasks']))
+
+
+class InstrumentationTests(TestCase):
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.data = {
+            'tasks': [
+                {'title': 'A', 'due_date': str(date.today() + timedelta(days=2)),
+                 'estimated_hours': 2, 'importance': 6, 'dependencies': []},
+                {'title': 'B', 'due_date': str(date.today() + timedelta(days=4)),
+                 'estimated_hours': 3, 'importance': 4, 'dependencies': [0]},
+            ]
+        }
+    
+    def test_timings_disabled_by_default(self):
+        response = self.client.post('/api/tasks/analyze/', self.data, format='json')
+        
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotIn('debug_timings', response.data)
+    
+    def test_debug_timings_block_and_header(self):
+        response = self.client.post('/api/tasks/analyze/?debug_timings=1', self.data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings = response.data['debug_timings']
+        for name in ('validate', 'base_score', 'cycles', 'propagate', 'graph'):
+            self.assertIn(name, timings['stages_ms'])
+        self.assertEqual(timings['counters']['tasks'], 2)
+        self.assertGreaterEqual(timings['counters']['propagation_iterations'], 1)
+        self.assertIn('render;dur=', response['Server-Timing'])
+        
+        metrics = self.client.get('/metrics')
+        body = metrics.content.decode()
+        self.assertIn('task_analyzer_request_seconds_bucket{endpoint="analyze",le="+Inf"}', body)
+        self.assertIn('task_analyzer_stage_seconds_count{endpoint="analyze",stage="validate"}', body)
+    
+    def test_stage_recording_is_scoped(self):
+        registry = MetricsRegistry()
+        with recording() as recorder:
+            analyze_all_tasks([{'title': 'A', 'due_date': date.today()}])
+        analyze_all_tasks([{'title': 'B', 'due_date': date.today()}])
+        
+        self.assertEqual(recorder.counters['tasks'], 1)
+        registry.record('cli', recorder, 0.02, 200)
+        self.assertIn('task_analyzer_request_seconds_bucket{endpoint="cli",le="0.025"} 1', registry.render())
+
+
+class GraphLayoutTests(TestCase):
+    
+    def test_layers_follow_dependency_depth(self):
+        successors = [[1, 2], [3], [3], []]
+        layout = layered_layout(successors)
+        
+        self.assertEqual(layout['layer'], [0, 1, 1, 2])
+        self.assertEqual(layout['layers'], 3)
+        self.assertLess(layout['y'][0], layout['y'][1])
+        self.assertNotEqual(layout['x'][1], layout['x'][2])
+    
+    def test_cycle_members_share_a_layer(self):
+        layout = layered_layout([[1], [0, 2], []])
+        
+        self.assertEqual(layout['layer'][0], layout['layer'][1])
+        self.assertEqual(layout['layer'][2], layout['layer'][0] + 1)
+    
+    def test_component_lod_collapses_clusters(self):
+        successors = [[1], [2], [], [], [5], []]
+        view = build_graph_view(list(range(6)), [f'T{i}' for i in range(6)], [1, 2, 3, 4, 5, 6], successors, 'component')
+        graph = view.render()
+        
+        self.assertEqual(graph['total_nodes'], 3)
+        sizes = sorted(n.get('cluster_size', 1) for n in graph['nodes'])
+        self.assertEqual(sizes, [1, 2, 3])
+    
+    def test_viewport_returns_subset_with_boundary_nodes(self):
+        successors = [[1], [2], [3], []]
+        view = build_graph_view(list(range(4)), [f'T{i}' for i in range(4)], [0, 0, 0, 0], successors)
+        
+        graph = view.render((0, 0, 1000, view.y[1]))
+        
+        visible = [n['id'] for n in graph['nodes'] if not n.get('outside')]
+        outside = [n['id'] for n in graph['nodes'] if n.get('outside')]
+        self.assertEqual(visible, [0, 1])
+        self.assertEqual(outside, [2])
+        self.assertEqual(len(graph['edges']), 2)
+    
+    def test_layout_endpoint_and_inline_coordinates(self):
+        client = APIClient()
+        data = {
+            'tasks': [
+                {'title': 'A', 'due_date': str(date.today()), 'dependencies': []},
+                {'title': 'B', 'due_date': str(date.today()), 'dependencies': [0]},
+            ]
+        }
+        response = client.post('/api/tasks/analyze/', data, format='json')
+        nodes = {n['id']: n for n in response.data['dependency_graph']['nodes']}
+        self.assertLess(nodes[0]['y'], nodes[1]['y'])
+        
+        analysis_id = response.data['analysis_id']
+        response = client.get('/api/tasks/graph/layout/', {'analysis_id': analysis_id, 'lod': 'component'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_nodes'], 1)
+        
+        response = client.get('/api/tasks/graph/layout/', {'analysis_id': analysis_id, 'viewport': '1,2'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for viewport in ('nan,0,1,1', '0,0,inf,1', '0,0,100000000,100000000'):
+            response = client.get('/api/tasks/graph/layout/', {'analysis_id': analysis_id, 'viewport': viewport})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_viewport_query_only_visits_occupied_tiles(self):
+        index = SpatialIndex([0.0, 5000.0], [0.0, 5000.0])
+        
+        self.assertEqual(index.query(-1e12, -1e12, 1e12, 1e12), [0, 1])
+        self.assertEqual(index.query(100, 100, 4000, 4000), [])
+        self.assertEqual(index.query(9000, 9000, 9500, 9500), [])
+
+
+class GraphCodecTests(TestCase):
+    
+    def test_packed_edges_round_trip(self):
+        successors = [[1, 2], [2], [], [0]]
+        packed = pack_edges(successors)
+        
+        self.assertEqual(len(packed.tobytes()), 4 * 2 * 4)
+        self.assertEqual(unpack_edges(packed.tobytes()), [(0, 1), (0, 2), (1, 2), (3, 0)])
+    
+    def test_encoded_graph_is_index_aligned(self):
+        graph = encode_graph([7, 8, 9], [1.0, 2.0, 3.0], [[1], [0], []], titles=['A', 'B', 'C'])
+        
+        self.assertEqual(graph['node_count'], 3)
+        self.assertEqual(graph['edge_count'], 2)
+        self.assertEqual(graph['circular'], [1, 1, 0])
+        self.assertEqual(graph['titles'], ['A', 'B', 'C'])
+        self.assertEqual(graph['edges'], [0, 1, 1, 0])
+    
+    def test_graph_endpoint_and_analyze_without_graph(self):
+        client = APIClient()
+        data = {
+            'tasks': [
+                {'title': 'A', 'due_date': str(date.today()), 'dependencies': []},
+                {'title': 'B', 'due_date': str(date.today()), 'dependencies': [0]},
+            ],
+            'include_graph': False
+        }
+        response = client.post('/api/tasks/analyze/', data, format='json')
+        self.assertNotIn('dependency_graph', response.data)
+        
+        response = client.get('/api/tasks/graph/', {'analysis_id': response.data['analysis_id'], 'encoding': 'base64'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['edge_encoding'], 'int32le-pairs')
+        self.assertEqual(unpack_edges(base64.b64decode(response.data['edges'])), [(0, 1)])
+        self.assertNotIn('titles', response.data)
+        
+        response = client.get('/api/tasks/graph/', {'analysis_id': 'missing'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_endpoints_agree_on_circular_tasks(self):
+        client = APIClient()
+        data = {'tasks': [
+            {'title': 'Launch', 'due_date': str(date.today()), 'dependencies': [1]},
+            {'title': 'Build', 'due_date': str(date.today()), 'dependencies': [2]},
+            {'title': 'Test', 'due_date': str(date.today()), 'dependencies': [1]},
+            {'title': 'Docs', 'due_date': str(date.today()), 'dependencies': []},
+        ]}
+        analysis = client.post('/api/tasks/analyze/', data, format='json').data
+        analysis_id = analysis['analysis_id']
+        
+        flagged = {n['id'] for n in analysis['dependency_graph']['nodes'] if n['is_circular']}
+        self.assertEqual(sorted(analysis['circular_dependencies']), ['Build', 'Launch', 'Test'])
+        self.assertEqual(flagged, {0, 1, 2})
+        packed = client.get('/api/tasks/graph/', {'analysis_id': analysis_id}).data
+        self.assertEqual({i for i, c in zip(packed['ids'], packed['circular']) if c}, flagged)
+        for lod in ('none', 'scc'):
+            layout = client.get('/api/tasks/graph/layout/', {'analysis_id': analysis_id, 'lod': lod}).data
+            self.assertEqual({n['id'] for n in layout['nodes'] if n['is_circular'] and 'cluster_size' not in n},
+                             flagged - {1, 2} if lod == 'scc' else flagged)
+
+
+class TaskIndexTests(TestCase):
+    
+    def test_duplicate_ids_are_remapped_first_wins(self):
+        tasks = [
+            {'id': 3, 'title': 'A', 'dependencies': []},
+            {'id': 3, 'title': 'B', 'dependencies': []},
+            {'title': 'C', 'dependencies': [3]},
+        ]
+        index = normalize_tasks(tasks)
+        
+        self.assertEqual([t['id'] for t in tasks], [3, 4, 2])
+        self.assertEqual(index.remapped, [(1, 3, 4)])
+        self.assertEqual(index.blockers[2], [0])
+        self.assertEqual(index.successors[0], [2])
+    
+    def test_duplicate_ids_can_be_rejected(self):
+        tasks = [{'id': 1, 'title': 'A'}, {'id': 1, 'title': 'B'}]
+        
+        with self.assertRaises(DuplicateTaskIdError):
+            normalize_tasks(tasks, on_duplicate='error')
+    
+    def test_dangling_dependencies_recorded_once(self):
+        tasks = [
+            {'id': 0, 'title': 'A', 'dependencies': [9, 1, 1]},
+            {'id': 1, 'title': 'B', 'dependencies': [None, 7]},
+        ]
+        index = normalize_tasks(tasks)
+        
+        self.assertEqual(index.dangling, [(0, 9), (1, 7)])
+        self.assertEqual(index.blockers[0], [1, 1])
+        self.assertEqual(index.successors[1], [0])
+    
+    def test_long_chain_cycle_detection_is_iterative(self):
+        n = 5000
+        tasks = [{'id': i, 'dependencies': [i + 1] if i + 1 < n else [0]} for i in range(n)]
+        
+        self.assertEqual(len(detect_cycles(tasks)), n)
+
+
+class PropagationTests(TestCase):
+    
+    def setUp(self):
+        self.chain = [[i + 1] for i in range(11)] + [[]]
+        self.raw = [1.0] * 12
+    
+    def test_fixed_point_reaches_deep_chains(self):
+        legacy = propagate_scores(self.raw, self.chain)
+        gauss_seidel = Propagation('gauss_seidel')
+        jacobi = Propagation('jacobi', tolerance=1e-9)
+        
+        scores = gauss_seidel.run(self.raw, self.chain)
+        self.assertEqual(scores[0], 2.0)
+        self.assertLess(legacy[0], scores[0])
+        self.assertEqual(jacobi.run(self.raw, self.chain), scores)
+        self.assertTrue(gauss_seidel.report['converged'])
+        self.assertLess(gauss_seidel.report['iterations'], jacobi.report['iterations'])
+    
+    def test_damping_and_iteration_limit_are_reported(self):
+        propagation = Propagation('jacobi', damping=0.5, tolerance=1e-9, max_iterations=3)
+        propagation.run(self.raw, self.chain)
+        
+        self.assertEqual(propagation.report['iterations'], 3)
+        self.assertFalse(propagation.report['converged'])
+        self.assertGreater(propagation.report['residual'], 0)
+    
+    def test_cycles_are_capped(self):
+        dependents = [[j for j in range(4) if j != i] for i in range(4)]
+        propagation = Propagation('gauss_seidel')
+        scores = propagation.run([10.0] * 4, dependents)
+        
+        self.assertEqual(scores, [999.99] * 4)
+        self.assertTrue(propagation.report['converged'])
+    
+    def test_result_is_independent_of_input_order(self):
+        tasks = [
+            {'id': i, 'title': f'T{i}', 'due_date': date.today() + timedelta(days=i),
+             'dependencies': [i + 1] if i < 7 else []}
+            for i in range(8)
+        ]
+        forward = analyze_all_tasks([dict(t) for t in tasks], propagation=Propagation())
+        backward = analyze_all_tasks([dict(t) for t in reversed(tasks)], propagation=Propagation())
+        
+        self.assertEqual(
+            {t['id']: t['priority_score'] for t in forward},
+            {t['id']: t['priority_score'] for t in backward}
+        )
+    
+    def test_analyze_reports_propagation(self):
+        client = APIClient()
+        data = {
+            'tasks': [
+                {'title': 'A', 'due_date': str(date.today()), 'dependencies': []},
+                {'title': 'B', 'due_date': str(date.today()), 'dependencies': [0]},
+            ],
+            'propagation': 'jacobi',
+            'damping': 0.8
+        }
+        response = client.post('/api/tasks/analyze/', data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['propagation']['method'], 'jacobi')
+        self.assertTrue(response.data['propagation']['converged'])
+
+
+class WorkspaceTests(TestCase):
+    
+    def setUp(self):
+        workspace_runtimes.clear()
+        self.client = APIClient()
+        self.monday = date(2025, 6, 2)
+        self.alpha = Workspace.objects.create(slug='alpha', name='Alpha', max_tasks=3)
+        self.beta = Workspace.objects.create(slug='beta', name='Beta', holidays=['2025-06-03', '2025-06-04'])
+    
+    def add_tasks(self, slug, tasks):
+        return self.client.post(f'/api/tasks/workspaces/{slug}/tasks/', {'tasks': tasks}, format='json')
+    
+    def test_tasks_persist_and_dependencies_use_task_ids(self):
+        response = self.add_tasks('alpha', [{'title': 'Schema', 'due_date': '2025-06-10'}])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        schema_id = response.data['created'][0]
+        self.add_tasks('alpha', [{'title': 'API', 'due_date': '2025-06-10', 'dependencies': [schema_id]}])
+        
+        response = self.client.post('/api/tasks/workspaces/alpha/analyze/',
+                                    {'reference_date': str(self.monday)}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['tasks'][0]['id'], schema_id)
+        self.assertTrue(response.data['analysis_id'].startswith('alpha:'))
+        graph = self.client.get('/api/tasks/graph/', {'analysis_id': response.data['analysis_id']})
+        self.assertEqual(graph.data['edge_count'], 1)
+    
+    def test_workspace_holidays_and_caches_are_isolated(self):
+        task = {'title': 'Report', 'due_date': '2025-06-05'}
+        self.add_tasks('alpha', [task])
+        self.add_tasks('beta', [task])
+        
+        alpha = self.client.post('/api/tasks/workspaces/alpha/analyze/', {'reference_date': str(self.monday)}, format='json')
+        beta = self.client.post('/api/tasks/workspaces/beta/analyze/', {'reference_date': str(self.monday)}, format='json')
+        
+        self.assertIn('3 working days', alpha.data['tasks'][0]['explanation'])
+        self.assertIn('1 working day', beta.data['tasks'][0]['explanation'])
+        self.assertIsNot(workspace_runtimes.get('alpha').score_cache, workspace_runtimes.get('beta').score_cache)
+        self.assertEqual(len(workspace_runtimes.get('alpha').analyses), 1)
+    
+    def test_simulation_uses_workspace_calendar(self):
+        created = self.add_tasks('beta', [
+            {'title': 'Report', 'due_date': '2025-06-05', 'importance': 5},
+            {'title': 'Review', 'due_date': '2025-06-09', 'importance': 7},
+        ]).data['created']
+        analysis = self.client.post('/api/tasks/workspaces/beta/analyze/', {'reference_date': str(self.monday)},
+                                    format='json').data
+        
+        response = self.client.post('/api/tasks/simulate/', {
+            'analysis_id': analysis['analysis_id'],
+            'scenarios': [{'edits': [{'op': 'set', 'task': created[0], 'importance': 6}]}]
+        }, format='json')
+        
+        Task.objects.filter(pk=created[0]).update(importance=6)
+        workspace_runtimes.clear()
+        expected = self.client.post('/api/tasks/workspaces/beta/analyze/', {'reference_date': str(self.monday)},
+                                    format='json').data
+        expected_scores = {t['id']: t['priority_score'] for t in expected['tasks']}
+        changes = response.data['scenarios'][0]['changes']
+        self.assertTrue(changes)
+        for change in changes:
+            self.assertEqual(change['new_score'], expected_scores[change['id']])
+    
+    def test_task_count_quota(self):
+        tasks = [{'title': f'T{i}', 'due_date': '2025-06-10'} for i in range(4)]
+        
+        response = self.add_tasks('alpha', tasks)
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.alpha.tasks.count(), 0)
+    
+    def test_cpu_budget_returns_429(self):
+        self.add_tasks('beta', [{'title': 'Report', 'due_date': '2025-06-05'}])
+        runtime = workspace_runtimes.for_workspace(Workspace.objects.get(slug='beta'))
+        runtime.cpu.charge(runtime.cpu.capacity + 30)
+        
+        response = self.client.post('/api/tasks/workspaces/beta/analyze/', {}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        other = self.client.post('/api/tasks/workspaces/alpha/analyze/', {}, format='json')
+        self.assertNotEqual(other.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class AnalysisJobTests(TestCase):
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.data = {
+            'tasks': [
+                {'title': 'Schema', 'due_date': '2025-06-10', 'dependencies': []},
+                {'title': 'API', 'due_date': '2025-06-04', 'dependencies': [0]},
+            ],
+            'reference_date': '2025-06-02'
+        }
+    
+    def run_worker(self, processes=0):
+        call_command('run_analysis_worker', '--once', '--processes', str(processes), stdout=StringIO(), stderr=StringIO())
+    
+    def test_job_result_matches_synchronous_analysis(self):
+        response = self.client.post('/api/tasks/analyze/jobs/', self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'queued')
+        self.assertEqual(response.data['queue_position'], 1)
+        
+        self.run_worker()
+        
+        job = self.client.get(f"/api/tasks/analyze/jobs/{response.data['job_id']}/")
+        expected = self.client.post('/api/tasks/analyze/', self.data, format='json')
+        self.assertEqual(job.data['status'], 'done')
+        self.assertEqual(
+            [(t['id'], t['priority_score']) for t in job.data['result']['tasks']],
+            [(t['id'], t['priority_score']) for t in expected.data['tasks']]
+        )
+        self.assertEqual(bytes(AnalysisJob.objects.get().payload), b'')
+    
+    def test_identical_payloads_share_one_job(self):
+        first = self.client.post('/api/tasks/analyze/jobs/', self.data, format='json')
+        second = self.client.post('/api/tasks/analyze/jobs/', self.data, format='json')
+        other = self.client.post('/api/tasks/analyze/jobs/', dict(self.data, strategy='high_impact'), format='json')
+        
+        self.assertTrue(second.data['deduplicated'])
+        self.assertEqual(first.data['job_id'], second.data['job_id'])
+        self.assertNotEqual(first.data['job_id'], other.data['job_id'])
+        self.assertEqual(AnalysisJob.objects.count(), 2)
+    
+    def test_process_pool_worker_and_failures(self):
+        good = self.client.post('/api/tasks/analyze/jobs/', self.data, format='json')
+        bad = AnalysisJob.objects.create(content_hash='x' * 64, payload=b'not compressed',
+                                         expires_at=timezone.now())
+        
+        self.run_worker(processes=1)
+        
+        self.assertEqual(AnalysisJob.objects.get(id=good.data['job_id']).status, 'done')
+        response = self.client.get(f'/api/tasks/analyze/jobs/{bad.id}/', {'wait': 1})
+        self.assertEqual(response.data['status'], 'failed')
+        self.assertIn('error', response.data)
+    
+    def test_expired_results_are_purged(self):
+        response = self.client.post('/api/tasks/analyze/jobs/', self.data, format='json')
+        self.run_worker()
+        AnalysisJob.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        
+        self.assertEqual(purge_expired_jobs(), 1)
+        missing = self.client.get(f"/api/tasks/analyze/jobs/{response.data['job_id']}/")
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_only_jobs_with_expired_leases_are_requeued(self):
+        live = self.client.post('/api/tasks/analyze/jobs/', self.data, format='json')
+        stale = self.client.post('/api/tasks/analyze/jobs/', dict(self.data, strategy='high_impact'), format='json')
+        claim_next_job('live-worker')
+        claim_next_job('dead-worker')
+        AnalysisJob.objects.filter(id=stale.data['job_id']).update(
+            heartbeat_at=timezone.now() - job_lease() - timedelta(seconds=1)
+        )
+        
+        self.run_worker()
+        
+        running = AnalysisJob.objects.get(id=live.data['job_id'])
+        self.assertEqual((running.status, running.worker_id), ('running', 'live-worker'))
+        self.assertEqual(AnalysisJob.objects.get(id=stale.data['job_id']).status, 'done')
+        self.assertEqual(finish_job(stale.data['job_id'], error='late', worker_id='dead-worker'), 0)
+        self.assertEqual(finish_job(live.data['job_id'], error='stopped', worker_id='live-worker'), 1)
+
+
+class BatchAnalysisTests(TestCase):
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.backlogs = [
+            {
+                'name': 'web',
+                'strategy': 'fastest_wins',
+                'reference_date': '2025-06-02',
+                'include_graph': False,
+                'tasks': [
+                    {'title': 'Login', 'due_date': '2025-06-04', 'estimated_hours': 1},
+                    {'title': 'Billing', 'due_date': '2025-06-20', 'estimated_hours': 8, 'dependencies': [0]},
+                ]
+            },
+            {'name': 'broken', 'tasks': [{'title': 'No due date'}]},
+            {'name': 'empty', 'tasks': []},
+            {
+                'name': 'ops',
+                'reference_date': '2025-06-02',
+                'tasks': [{'title': 'Rotate keys', 'due_date': '2025-06-03'}]
+            },
+        ]
+    
+    def test_batch_returns_results_and_errors_per_backlog(self):
+        response = self.client.post('/api/tasks/analyze/batch/', {'backlogs': self.backlogs}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['name'] for r in response.data['results']], ['web', 'broken', 'empty', 'ops'])
+        self.assertEqual([r['status'] for r in response.data['results']], ['ok', 'error', 'error', 'ok'])
+        self.assertEqual(response.data['failed'], 2)
+        self.assertIn('due_date', response.data['results'][1]['errors'][0])
+        web = response.data['results'][0]['result']
+        self.assertEqual(web['strategy_used'], 'Fastest Wins')
+        self.assertNotIn('dependency_graph', web)
+        self.assertIn('dependency_graph', response.data['results'][3]['result'])
+    
+    def test_batch_matches_single_analysis(self):
+        single = self.client.post('/api/tasks/analyze/', self.backlogs[0], format='json')
+        batch = self.client.post('/api/tasks/analyze/batch/', {'backlogs': self.backlogs[:1]}, format='json')
+        
+        self.assertEqual(
+            [(t['id'], t['priority_score']) for t in batch.data['results'][0]['result']['tasks']],
+            [(t['id'], t['priority_score']) for t in single.data['tasks']]
+        )
+    
+    def test_batch_across_worker_processes(self):
+        response = self.client.post('/api/tasks/analyze/batch/',
+                                    {'backlogs': self.backlogs, 'processes': 2}, format='json')
+        
+        self.assertEqual([r['status'] for r in response.data['results']], ['ok', 'error', 'error', 'ok'])
+        self.assertEqual(response.data['results'][3]['result']['total_tasks'], 1)
+
+
+class LeanImportTests(TestCase):
+    
+    def run_python(self, code, settings_module=None):
+        env = dict(os.environ)
+        env.pop('DJANGO_SETTINGS_MODULE', None)
+        if settings_module:
+            env['DJANGO_SETTINGS_MODULE'] = settings_module
+        return subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=Path(__file__).resolve().parent.parent,
+            env=env, capture_output=True, text=True, timeout=60
+        )
+    
+    def test_engines_import_without_django(self):
+        completed = self.run_python(
+            'import sys\n'
+            'import tasks.scoring, tasks.pipeline, tasks.batch, tasks.jobs, tasks.planner, tasks.forecast, tasks.cli, tasks.columnar\n'
+            'print(sorted(m for m in ("django", "rest_framework", "numpy", "scipy", "calendar") if m in sys.modules))'
+        )
+        
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertEqual(completed.stdout.strip(), '[]')
+    
+    def test_worker_settings_serve_the_api(self):
+        completed = self.run_python(
+            'import django\n'
+            'django.setup()\n'
+            'from django.conf import settings\n'
+            'from django.test import Client\n'
+            'settings.ALLOWED_HOSTS = ["testserver"]\n'
+            'response = Client().post("/api/tasks/analyze/", {"tasks": [{"title": "A", "due_date": "2025-06-02"}]}, '
+            'content_type="application/json")\n'
+            'print(response.status_code, "django.contrib.sessions" in settings.INSTALLED_APPS)',
+            settings_module='task_analyzer.settings_worker'
+        )
+        
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertEqual(completed.stdout.strip(), '200 False')
+
+
+class CliTests(TestCase):
+    
+    def make_tasks(self):
+        tasks = []
+        for group in range(6):
+            base = group * 5
+            for k in range(5):
+                tasks.append({
+                    'id': base + k,
+                    'title': f'Task {base + k}',
+                    'due_date': (date(2025, 6, 2) + timedelta(days=base + k - 10)).isoformat(),
+                    'importance': 1 + (base + k) % 10,
+                    'estimated_hours': 1 + k,
+                    'dependencies': [base + k - 1] if k else []
+                })
+        return tasks
+    
+    def test_reads_csv_json_and_ndjson(self):
+        csv_text = 'id,title,due_date,importance,estimated_hours,dependencies\n1,A,2025-06-03,8,2.5,\n2,B,,5,1,1;x\n'
+        ndjson_text = '{"id": 1, "title": "A"}\n\n{"id": 2, "title": "B"}\n'
+        
+        self.assertEqual(read_tasks(csv_text), [
+            {'id': 1, 'title': 'A', 'due_date': '2025-06-03', 'importance': 8, 'estimated_hours': 2.5},
+            {'id': 2, 'title': 'B', 'importance': 5, 'estimated_hours': 1, 'dependencies': [1, 'x']}
+        ])
+        self.assertEqual([t['id'] for t in read_tasks(ndjson_text)], [1, 2])
+        self.assertEqual(read_tasks('{"tasks": [{"id": 7}]}'), [{'id': 7}])
+    
+    def test_malformed_records_raise_input_error(self):
+        cases = [
+            ('[{"id": 1}, {"id": 2, "importance": "high"}]', 'record 2: importance'),
+            ('[{"id": 1, "importance": null}]', 'record 1: importance'),
+            ('{"id": 1, "estimated_hours": [3]}\n', 'record 1: estimated_hours'),
+            ('[{"id": 1, "due_date": "next week"}]', 'record 1: due_date'),
+            ('[{"id": 1, "dependencies": 4}]', 'record 1: dependencies'),
+            ('[{"id": 1, "dependencies": [{"id": 2}]}]', 'record 1: dependency'),
+            ('[{"id": 1}, 7]', 'record 2: not an object'),
+        ]
+        for text, message in cases:
+            with self.assertRaisesRegex(InputError, message):
+                read_tasks(text)
+        
+        self.assertEqual(read_tasks('[{"id": 1, "importance": "7", "estimated_hours": " 2.5"}]'),
+                         [{'id': 1, 'importance': 7, 'estimated_hours': 2.5}])
+    
+    def test_cli_reports_malformed_record_in_one_line(self):
+        result = subprocess.run(
+            [sys.executable, '-m', 'tasks.cli', '-'],
+            input='[{"id": 1, "title": "A", "importance": "high"}]',
+            capture_output=True, text=True, cwd=Path(__file__).resolve().parent.parent
+        )
+        
+        self.assertEqual(result.returncode, 2)
+        self.assertEqual(result.stderr.strip().splitlines(), ["error: record 1: importance 'high' is not a number"])
+    
+    def test_ranked_output_matches_analyze_all_tasks(self):
+        tasks = self.make_tasks()
+        expected = analyze_all_tasks(json.loads(json.dumps(tasks)), reference_date=date(2025, 6, 2))
+        stream = StringIO()
+        
+        written = write_ranked(score_tasks(tasks, reference_date=date(2025, 6, 2)), stream, top=5)
+        ranked = [json.loads(line) for line in stream.getvalue().splitlines()]
+        
+        self.assertEqual(written, 5)
+        self.assertEqual([r['rank'] for r in ranked], [1, 2, 3, 4, 5])
+        self.assertEqual(
+            [(r['id'], r['priority_score']) for r in ranked],
+            [(t['id'], t['priority_score']) for t in sorted(expected, key=lambda t: -t['priority_score'])[:5]]
+        )
+    
+    def test_multiple_processes_match_single_process(self):
+        single = score_tasks(self.make_tasks(), reference_date=date(2025, 6, 2))
+        parallel = score_tasks(self.make_tasks(), reference_date=date(2025, 6, 2), processes=2)
+        
+        self.assertEqual(
+            [(t['id'], t['priority_score'], t['explanation']) for t in parallel],
+            [(t['id'], t['priority_score'], t['explanation']) for t in single]
+        )
+    
+    def test_analyze_file_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory) / 'backlog.json'
+            target = Path(directory) / 'ranked.csv'
+            source.write_text(json.dumps(self.make_tasks()))
+            stderr = StringIO()
+            
+            call_command('analyze_file', str(source), '--reference-date', '2025-06-02', '--output', str(target),
+                         '--output-format', 'csv', '--strategy', 'deadline_driven', stderr=stderr)
+            lines = target.read_text().splitlines()
+        
+        self.assertEqual(lines[0].split(',')[:4], ['rank', 'id', 'title', 'priority_score'])
+        self.assertEqual(len(lines), 31)
+        self.assertIn('tasks/sec', stderr.getvalue())
+
+
+class ColumnarSnapshotTests(TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.directory.name) / 'backlog.tcol')
+        self.tasks = [
+            {'id': 10, 'title': 'Schéma', 'due_date': '2025-06-03', 'importance': 8, 'estimated_hours': 2},
+            {'id': 11, 'title': 'API', 'due_date': '2025-06-10', 'dependencies': [10, 10, 99]},
+            {'id': 12, 'title': 'Loop A', 'dependencies': [13], 'estimated_hours': 1.5},
+            {'id': 13, 'title': 'Loop B', 'dependencies': [12]},
+        ]
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def test_round_trip_columns(self):
+        write_snapshot(self.path, json.loads(json.dumps(self.tasks)))
+        
+        with ColumnarSnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 4)
+            self.assertEqual(snapshot.edge_count, 4)
+            self.assertEqual(snapshot.ids.tolist(), [10, 11, 12, 13])
+            self.assertEqual(snapshot.dep_indptr.tolist(), [0, 0, 2, 3, 4])
+            self.assertEqual(snapshot.blockers(1), [0, 0])
+            self.assertEqual(snapshot.task(0), {
+                'id': 10, 'title': 'Schéma', 'due_date': '2025-06-03', 'importance': 8,
+                'estimated_hours': 2, 'dependencies': []
+            })
+            self.assertEqual(snapshot.task(2)['estimated_hours'], 1.5)
+            self.assertNotIn('due_date', snapshot.task(3))
+    
+    def test_analyze_matches_engine(self):
+        expected = analyze_all_tasks(json.loads(json.dumps(self.tasks)), reference_date=date(2025, 6, 2))
+        write_snapshot(self.path, json.loads(json.dumps(self.tasks)))
+        
+        with ColumnarSnapshot(self.path) as snapshot:
+            analyzed = snapshot.analyze(reference_date=date(2025, 6, 2))
+        
+        self.assertEqual(
+            [(t['id'], t['priority_score'], t['explanation']) for t in analyzed],
+            [(t['id'], t['priority_score'], t['explanation']) for t in expected]
+        )
+    
+    def test_scores_are_stored(self):
+        analyzed = analyze_all_tasks(json.loads(json.dumps(self.tasks)), reference_date=date(2025, 6, 2))
+        write_snapshot(self.path, analyzed)
+        
+        with ColumnarSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.priority_score.tolist(), [t['priority_score'] for t in analyzed])
+            self.assertEqual(snapshot.task(3)['priority_score'], 999.0)
+    
+    def test_rejects_string_ids_and_foreign_files(self):
+        with self.assertRaises(SnapshotFormatError):
+            write_snapshot(self.path, [{'id': 'a', 'title': 'A'}])
+        Path(self.path).write_bytes(b'[{"id": 1}]')
+        
+        with self.assertRaises(SnapshotFormatError):
+            ColumnarSnapshot(self.path)
+    
+    def test_cli_reads_and_writes_snapshots(self):
+        source = Path(self.directory.name) / 'backlog.json'
+        ranked = Path(self.directory.name) / 'ranked.ndjson'
+        source.write_text(json.dumps(self.tasks))
+        
+        call_command('analyze_file', str(source), '--output', self.path, '--output-format', 'columnar',
+                     '--reference-date', '2025-06-02', stderr=StringIO())
+        call_command('analyze_file', self.path, '--output', str(ranked), '--processes', '2',
+                     '--reference-date', '2025-06-02', stderr=StringIO())
+        rows = [json.loads(line) for line in ranked.read_text().splitlines()]
+        
+        self.assertEqual([r['id'] for r in rows[:2]], [12, 13])
+        self.assertEqual(rows[0]['explanation'], 'CIRCULAR DEPENDENCY DETECTED - Resolve Immediately')
+
+
+class ProfileCaptureTests(TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.original = (profile_store.directory, profile_store.limit)
+        profile_store.directory = self.directory.name
+        self.client = APIClient()
+        self.staff = User.objects.create_user('ops', password='x', is_staff=True)
+        self.payload = {
+            'strategy': 'high_impact',
+            'reference_date': '2025-06-02',
+            'tasks': [
+                {'title': 'Migrate Acme billing', 'due_date': '2025-06-03', 'importance': 9},
+                {'title': 'Email Acme CFO', 'due_date': '2025-06-02', 'dependencies': [0]},
+                {'title': 'Close Acme ticket', 'due_date': '2025-06-04', 'estimated_hours': 2, 'dependencies': [1]},
+            ]
+        }
+    
+    def tearDown(self):
+        profile_store.directory, profile_store.limit = self.original
+        self.directory.cleanup()
+    
+    def test_anonymize_payload(self):
+        anonymized = anonymize_payload(self.payload)
+        
+        self.assertEqual(anonymized['strategy'], 'high_impact')
+        self.assertEqual(anonymized['tasks'], [
+            {'due_date': '2025-06-03', 'importance': 9, 'title': 'Task 1'},
+            {'due_date': '2025-06-02', 'title': 'Task 2', 'dependencies': [0]},
+            {'due_date': '2025-06-04', 'estimated_hours': 2, 'title': 'Task 3', 'dependencies': [1]},
+        ])
+    
+    def test_anonymized_payload_replays_the_same_graph(self):
+        original = self.client.post('/api/tasks/analyze/', self.payload, format='json').data
+        replayed = self.client.post('/api/tasks/analyze/', anonymize_payload(self.payload), format='json').data
+        
+        self.assertEqual(replayed['circular_dependencies'], [])
+        self.assertEqual(
+            [(t['priority_score'], t['dependencies']) for t in replayed['tasks']],
+            [(t['priority_score'], t['dependencies']) for t in original['tasks']]
+        )
+    
+    def test_staff_request_is_captured(self):
+        self.client.force_login(self.staff)
+        response = self.client.post('/api/tasks/analyze/?profile=cprofile', self.payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        meta = profile_store.load(response['X-Profile-Id'])
+        self.assertEqual((meta['endpoint'], meta['mode'], meta['task_count']), ('analyze', 'cprofile', 3))
+        self.assertNotIn('Acme', json.dumps(meta['payload']))
+        self.assertTrue(os.path.exists(profile_store.output_path(meta)))
+    
+    def test_anonymous_requests_are_not_profiled(self):
+        response = self.client.post('/api/tasks/analyze/', self.payload, format='json', HTTP_X_PROFILE='cprofile')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(profile_store.list(), [])
+    
+    def test_store_rotates(self):
+        profile_store.limit = 2
+        self.client.force_login(self.staff)
+        ids = [
+            self.client.post('/api/tasks/suggest/', self.payload, format='json', HTTP_X_PROFILE='sample')['X-Profile-Id']
+            for _ in range(3)
+        ]
+        
+        self.assertEqual([meta['id'] for meta in profile_store.list()], ids[:0:-1])
+        self.assertEqual(sorted(os.listdir(self.directory.name)),
+                         sorted(f'{i}{ext}' for i in ids[1:] for ext in ('.json', '.folded')))
+    
+    def test_list_and_replay_command(self):
+        self.client.force_login(self.staff)
+        profile_id = self.client.post('/api/tasks/analyze/?profile=cprofile', self.payload, format='json')['X-Profile-Id']
+        listing = StringIO()
+        replay = StringIO()
+        
+        call_command('profiles', 'list', stdout=listing)
+        call_command('profiles', 'replay', profile_id, '--repeat', '2', '--limit', '5', stdout=replay)
+        
+        self.assertIn(profile_id, listing.getvalue())
+        self.assertIn(f'Replayed {profile_id} (3 tasks): status 200', replay.getvalue())
+        self.assertIn('function calls', replay.getvalue())
+
+
+class RankDiffTests(TestCase):
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.body = {
+            'reference_date': '2025-06-02',
+            'tasks': [
+                {'title': f'Task {i}', 'due_date': (date(2025, 6, 3) + timedelta(days=i)).isoformat(),
+                 'importance': 1 + i % 10, 'estimated_hours': 1 + i % 4, 'dependencies': [i - 1] if i % 3 else []}
+                for i in range(40)
+            ]
+        }
+    
+    def analyze(self, **extra):
+        return self.client.post('/api/tasks/analyze/', dict(self.body, **extra), format='json').data
+    
+    def test_versions_are_content_addressed(self):
+        first = self.analyze()
+        second = self.analyze()
+        
+        self.assertEqual(first['version'], second['version'])
+        self.assertNotIn('diff', second)
+        self.body['tasks'][0]['importance'] = 10
+        self.assertNotEqual(self.analyze()['version'], first['version'])
+    
+    def test_single_edit_returns_small_diff(self):
+        base = self.analyze()
+        self.body['tasks'][20]['importance'] = 10
+        self.body['tasks'][20]['due_date'] = '2025-06-02'
+        
+        response = self.analyze(since_version=base['version'])
+        full = self.analyze()
+        
+        self.assertEqual(response['base_version'], base['version'])
+        self.assertEqual(response['version'], full['version'])
+        self.assertNotIn('tasks', response)
+        self.assertNotIn('dependency_graph', response)
+        self.assertEqual(sorted(t['id'] for t in response['diff']['changed']), [18, 19, 20])
+        self.assertEqual(response['diff']['moved'], [[18, 1], [19, 2], [20, 3]])
+        self.assertEqual(apply_diff([t['id'] for t in base['tasks']], response['diff']),
+                         [t['id'] for t in full['tasks']])
+    
+    def test_added_and_removed_tasks(self):
+        base = self.analyze()
+        self.body['tasks'].append({'title': 'New', 'due_date': '2025-05-01', 'importance': 10})
+        grown = self.analyze(since_version=base['version'])
+        self.body['tasks'].pop()
+        
+        diff = self.analyze(since_version=grown['version'])['diff']
+        
+        self.assertEqual([(t['id'], t['rank']) for t in grown['diff']['added']], [(40, 1)])
+        self.assertEqual(grown['diff']['removed'], [])
+        self.assertEqual(diff, {'removed': [40], 'moved': [], 'changed': [], 'added': []})
+    
+    def test_unknown_version_returns_full_result(self):
+        response = self.analyze(since_version='f' * 32)
+        
+        self.assertEqual(len(response['tasks']), 40)
+        self.assertNotIn('diff', response)
+        self.assertIn('dependency_graph', response)
+    
+    def test_diff_reconstructs_random_reorderings(self):
+        import random
+        rng = random.Random(7)
+        for _ in range(50):
+            old = [{'id': i, 'priority_score': i} for i in rng.sample(range(60), 40)]
+            new = [dict(t) for t in rng.sample(old, 30)] + [{'id': 100 + i, 'priority_score': 0} for i in range(5)]
+            rng.shuffle(new)
+            for task in new[:3]:
+                task['priority_score'] += 1
+            
+            diff = diff_rankings(RankingVersion(old, 'smart_balance'), RankingVersion(new, 'smart_balance'), new)
+            
+            self.assertEqual(apply_diff([t['id'] for t in old], diff), [t['id'] for t in new])
+
+
+class RankingStreamTests(TestCase):
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.workspace = Workspace.objects.create(slug='ops', name='Ops')
+        today = date.today()
+        self.client.post('/api/tasks/workspaces/ops/tasks/', {'tasks': [
+            {'title': 'Patch servers', 'due_date': today.isoformat(), 'importance': 9},
+            {'title': 'Write postmortem', 'due_date': (today + timedelta(days=5)).isoformat()},
+        ]}, format='json')
+    
+    def tearDown(self):
+        workspace_feeds.clear()
+        workspace_runtimes.clear()
+    
+    def read_event(self, stream):
+        while True:
+            chunk = next(stream)
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if chunk.startswith('id: '):
+                lines = chunk.strip().split('\n')
+                return int(lines[0][4:]), json.loads(lines[2][6:])
+    
+    def test_stream_pushes_initial_ranking_and_updates(self):
+        response = self.client.get('/api/tasks/workspaces/ops/stream/')
+        stream = iter(response.streaming_content)
+        
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        sequence, event = self.read_event(stream)
+        self.assertEqual(sequence, 1)
+        self.assertEqual([t['title'] for t in event['ranking']], ['Patch servers', 'Write postmortem'])
+        self.assertEqual([t['title'] for t in event['suggestions']], ['Patch servers'])
+        
+        self.client.post('/api/tasks/workspaces/ops/tasks/', {'tasks': [
+            {'title': 'Rotate keys', 'due_date': (date.today() - timedelta(days=3)).isoformat(), 'importance': 10}
+        ]}, format='json')
+        sequence, event = self.read_event(stream)
+        self.assertEqual(sequence, 2)
+        self.assertEqual(event['total_tasks'], 3)
+        self.assertEqual(event['ranking'][0]['title'], 'Rotate keys')
+        response.close()
+    
+    def test_version_matches_workspace_analyze(self):
+        stream = iter(self.client.get('/api/tasks/workspaces/ops/stream/').streaming_content)
+        _, event = self.read_event(stream)
+        
+        analyzed = self.client.post('/api/tasks/workspaces/ops/analyze/', {'since_version': event['version']},
+                                    format='json').data
+        
+        self.assertEqual(analyzed['version'], event['version'])
+        self.assertEqual(analyzed['diff'], {'removed': [], 'moved': [], 'changed': [], 'added': []})
+    
+    def test_failed_update_ends_stream_with_error_event(self):
+        runtime = workspace_runtimes.for_workspace(self.workspace)
+        runtime.cpu.charge(runtime.cpu.capacity + 30)
+        
+        response = self.client.get('/api/tasks/workspaces/ops/stream/')
+        chunks = [c.decode() if isinstance(c, bytes) else c for c in response.streaming_content]
+        
+        self.assertTrue(chunks[0].startswith('retry: '))
+        lines = chunks[-1].strip().split('\n')
+        self.assertEqual(lines[0], 'event: error')
+        error = json.loads(lines[1][6:])
+        self.assertIn('error', error)
+        self.assertGreaterEqual(error['retry_after'], 1)
+    
+    def test_unknown_strategy_and_workspace(self):
+        self.assertEqual(self.client.get('/api/tasks/workspaces/ops/stream/?strategy=nope').status_code, 400)
+        self.assertEqual(self.client.get('/api/tasks/workspaces/missing/stream/').status_code, 404)
+    
+    def test_one_computation_fans_out_to_all_subscribers(self):
+        import threading
+        calls = []
+        feed = Feed(lambda today: calls.append(today) or {'day': today.isoformat()}, check_interval=0.05)
+        received = []
+        
+        def subscriber():
+            updates = feed.subscribe(heartbeat=1)
+            received.append(next(updates))
+            updates.close()
+        
+        threads = [threading.Thread(target=subscriber) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(received), 20)
+        self.assertTrue(all(update is received[0] or update == received[0] for update in received))
+        self.assertEqual(feed.subscribers, 0)
+    
+    def test_day_rollover_emits_new_event(self):
+        days = [date(2025, 6, 2)]
+        feed = Feed(lambda today: {'day': today.isoformat()}, today=lambda: days[0], check_interval=0.01)
+        
+        self.assertEqual(feed.next_event(0, timeout=1), (1, {'day': '2025-06-02'}))
+        self.assertIsNone(feed.next_event(1, timeout=0.05))
+        days[0] = date(2025, 6, 3)
+        self.assertEqual(feed.next_event(1, timeout=1), (2, {'day': '2025-06-03'}))
+
+
+class TaskAdminTests(TestCase):
+    
+    def setUp(self):
+        self.workspace = Workspace.objects.create(slug='ops', name='Ops')
+        today = date.today()
+        Task.objects.bulk_create(
+            Task(workspace=self.workspace, title=f'Task {i}', due_date=today + timedelta(days=i % 45 - 10),
+                 importance=1 + i % 10, estimated_hours=1 + i % 5)
+            for i in range(230)
+        )
+        ids = list(Task.objects.order_by('id').values_list('id', flat=True))
+        Task.objects.filter(id=ids[1]).update(dependencies=[ids[0], ids[0]])
+        Task.objects.filter(id=ids[2]).update(dependencies=[ids[3]])
+        Task.objects.filter(id=ids[3]).update(dependencies=[ids[2]])
+        self.ids = ids
+        refresh_scores(self.workspace)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'x'))
+    
+    def tearDown(self):
+        workspace_runtimes.clear()
+    
+    def test_refresh_scores_materializes_analysis(self):
+        tasks = list(Task.objects.order_by('id').values('id', 'title', 'due_date', 'estimated_hours',
+                                                         'importance', 'dependencies'))
+        expected = {t['id']: t['priority_score'] for t in analyze_all_tasks(tasks)}
+        stored = {t.id: t for t in Task.objects.all()}
+        
+        self.assertEqual({i: t.priority_score for i, t in stored.items()}, expected)
+        self.assertEqual(stored[self.ids[1]].blocker_count, 2)
+        self.assertEqual(sorted(i for i, t in stored.items() if t.in_cycle), self.ids[2:4])
+        self.assertEqual(stored[self.ids[0]].scored_at, date.today())
+    
+    def test_changelist_walks_keyset_pages(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        seen = []
+        url = '/admin/tasks/task/'
+        pages = 0
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url if url.startswith('/') else '/admin/tasks/task/' + url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLess(len(queries), 15)
+            changelist = response.context['cl']
+            seen.extend(task.id for task in changelist.result_list)
+            url = changelist.next_url
+            pages += 1
+        
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, list(Task.objects.order_by('-priority_score', '-id').values_list('id', flat=True)))
+    
+    def test_sorted_column_and_filters(self):
+        response = self.client.get('/admin/tasks/task/', {'due': 'overdue', 'importance_band': 'critical', 'o': '6'})
+        rows = response.context['cl'].result_list
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(rows)
+        self.assertTrue(all(t.due_date < date.today() and t.importance >= 9 for t in rows))
+        self.assertEqual([t.due_date for t in rows], sorted(t.due_date for t in rows))
+        self.assertEqual(self.client.get('/admin/tasks/task/', {'after': 'garbage'}).status_code, 302)
+    
+    def test_counts_are_capped_for_filtered_lists(self):
+        paginator = EstimatedCountPaginator(Task.objects.filter(importance__gte=2), 20)
+        paginator.exact_limit = 50
+        
+        self.assertEqual(paginator.count, 51)
+        self.assertTrue(paginator.estimated)
+    
+    def test_refresh_command(self):
+        Task.objects.update(priority_score=0, scored_at=None)
+        output = StringIO()
+        
+        call_command('refresh_task_scores', '--workspace', 'ops', stdout=output)
+        
+        self.assertIn('ops: 230 task(s) scored', output.getvalue())
+        self.assertFalse(Task.objects.filter(scored_at=None).exists())
+
+
+class ReadyQueueTests(TestCase):
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.workspace = Workspace.objects.create(slug='ops', name='Ops')
+        today = date.today()
+        self.ids = [Task.objects.create(workspace=self.workspace, title=title, due_date=today + timedelta(days=days),
+                                        importance=importance).id
+                    for title, days, importance in [
+                        ('Provision', 3, 5), ('Deploy', 1, 9), ('Announce', 0, 10), ('Audit', 10, 2)
+                    ]]
+        Task.objects.filter(id=self.ids[1]).update(dependencies=[self.ids[0]])
+        Task.objects.filter(id=self.ids[2]).update(dependencies=[self.ids[1], self.ids[0]])
+        ready_queues.clear()
+    
+    def tearDown(self):
+        ready_queues.clear()
+        workspace_runtimes.clear()
+    
+    def ready_ids(self, **params):
+        response = self.client.get('/api/tasks/workspaces/ops/ready/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [t['id'] for t in response.data['tasks']]
+    
+    def complete(self, task_id, completed=True):
+        return self.client.post(f'/api/tasks/workspaces/ops/tasks/{task_id}/complete/',
+                                {'completed': completed}, format='json')
+    
+    def test_queue_counts_and_unblocks(self):
+        queue = ReadyQueue([[], [0, 0], [0, 1], [4], [3]], [1.0, 5.0, 9.0, 7.0, 2.0])
+        
+        self.assertEqual(queue.top(10), [0])
+        self.assertEqual(queue.complete(0), [1])
+        self.assertEqual(queue.top(10), [1])
+        self.assertEqual(queue.complete(1), [2])
+        self.assertEqual(queue.top(1), [2])
+        self.assertEqual(queue.complete(1), [])
+        self.assertEqual(queue.reopen(0), [2])
+        self.assertEqual(queue.top(10), [0])
+        self.assertEqual(queue.ready_count, 1)
+    
+    def test_ready_lists_only_unblocked_tasks_by_score(self):
+        response = self.client.get('/api/tasks/workspaces/ops/ready/')
+        
+        self.assertEqual(response.data['total_tasks'], 4)
+        self.assertEqual(response.data['total_ready'], 2)
+        self.assertEqual([t['id'] for t in response.data['tasks']], [self.ids[0], self.ids[3]])
+        self.assertGreater(response.data['tasks'][0]['priority_score'], response.data['tasks'][1]['priority_score'])
+        self.assertEqual(self.ready_ids(limit=1), [self.ids[0]])
+    
+    def test_completion_updates_queue_and_database(self):
+        self.ready_ids()
+        
+        response = self.complete(self.ids[0])
+        self.assertEqual(response.data['unblocked'], [self.ids[1]])
+        self.assertEqual(self.ready_ids(), [self.ids[1], self.ids[3]])
+        self.assertEqual(self.complete(self.ids[1]).data['unblocked'], [self.ids[2]])
+        self.assertEqual(self.ready_ids(limit=1), [self.ids[2]])
+        
+        task = Task.objects.get(id=self.ids[0])
+        self.assertTrue(task.completed)
+        self.assertIsNotNone(task.completed_at)
+        
+        ready_queues.clear()
+        self.assertEqual(self.ready_ids(), [self.ids[2], self.ids[3]])
+    
+    def test_reopening_blocks_dependents_again(self):
+        self.complete(self.ids[0])
+        
+        response = self.complete(self.ids[0], completed=False)
+        self.assertEqual(response.data['blocked'], [self.ids[1]])
+        self.assertEqual(self.ready_ids(), [self.ids[0], self.ids[3]])
+        self.assertIsNone(Task.objects.get(id=self.ids[0]).completed_at)
+    
+    def test_cached_queue_is_checked_without_aggregates(self):
+        self.ready_ids()
+        
+        with self.assertNumQueries(1):
+            self.ready_ids()
+    
+    def test_bulk_writes_that_bump_the_version_rebuild_the_queue(self):
+        self.ready_ids()
+        rollback, = Task.objects.bulk_create([
+            Task(workspace=self.workspace, title='Rollback', due_date=date.today(), importance=8,
+                 dependencies=[self.ids[3]])
+        ])
+        self.assertEqual(self.complete(rollback.id).status_code, status.HTTP_200_OK)
+        verify, = Task.objects.bulk_create([
+            Task(workspace=self.workspace, title='Verify', due_date=date.today(), importance=8,
+                 dependencies=[self.ids[3]])
+        ])
+        bump_task_version(self.workspace.pk)
+        
+        response = self.complete(self.ids[3])
+        
+        self.assertEqual(response.data['unblocked'], [verify.id])
+        self.assertIn(verify.id, self.ready_ids())
+    
+    def test_completing_twice_keeps_completed_at(self):
+        self.complete(self.ids[0])
+        first = Task.objects.get(id=self.ids[0]).completed_at
+        
+        response = self.complete(self.ids[0])
+        
+        self.assertEqual(response.data['unblocked'], [])
+        self.assertEqual(Task.objects.get(id=self.ids[0]).completed_at, first)
+        self.assertEqual(self.ready_ids(), [self.ids[1], self.ids[3]])
+    
+    def test_task_changes_rebuild_the_queue(self):
+        self.assertEqual(self.ready_ids(), [self.ids[0], self.ids[3]])
+        
+        self.client.post('/api/tasks/workspaces/ops/tasks/', {'tasks': [
+            {'title': 'Hotfix', 'due_date': date.today().isoformat(), 'importance': 10, 'completed': True},
+            {'title': 'Page oncall', 'due_date': date.today().isoformat(), 'importance': 10},
+        ]}, format='json')
+        self.assertEqual(len(self.ready_ids()), 3)
+        
+        Task.objects.get(id=self.ids[0]).delete()
+        self.assertIn(self.ids[1], self.ready_ids())
+        self.assertEqual(self.client.post('/api/tasks/workspaces/ops/tasks/999999/complete/').status_code, 404)
+        self.assertEqual(self.client.get('/api/tasks/workspaces/ops/ready/', {'limit': 0}).status_code, 400)
+
+
+class TaskSearchTests(TestCase):
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.workspace = Workspace.objects.create(slug='ops', name='Ops')
+        other = Workspace.objects.create(slug='web', name='Web')
+        today = timezone.localdate()
+        titles = ['Deploy billing service', 'Rotate billing keys', 'Write deploy runbook', 'Review logs',
+                  'Deployment freeze notes', 'Billing export']
+        tasks = Task.objects.bulk_create(
+            Task(workspace=self.workspace, title=title, due_date=today + timedelta(days=i * 3 - 4),
+                 importance=10 - i)
+            for i, title in enumerate(titles)
+        )
+        Task.objects.create(workspace=other, title='Deploy website', due_date=today)
+        self.ids = [task.id for task in tasks]
+        Task.objects.filter(id=self.ids[2]).update(dependencies=[self.ids[0]])
+        refresh_scores(self.workspace)
+    
+    def tearDown(self):
+        workspace_runtimes.clear()
+    
+    def search(self, **params):
+        response = self.client.get('/api/tasks/workspaces/ops/search/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def test_title_search_uses_prefix_terms(self):
+        self.assertTrue(fts_available())
+        self.assertEqual(match_expression('deploy "billing"*'), '"deploy"* "billing"*')
+        
+        found = {t['id'] for t in self.search(q='deploy')['results']}
+        self.assertEqual(found, {self.ids[0], self.ids[2], self.ids[4]})
+        self.assertEqual([t['id'] for t in self.search(q='BILLING dep')['results']], [self.ids[0]])
+        self.assertEqual(len(self.search(q='')['results']), 6)
+    
+    def test_index_follows_title_changes(self):
+        task = Task.objects.get(id=self.ids[3])
+        task.title = 'Review billing alerts'
+        task.save()
+        Task.objects.filter(id=self.ids[5]).delete()
+        
+        found = {t['id'] for t in self.search(q='billing')['results']}
+        self.assertEqual(found, {self.ids[0], self.ids[1], self.ids[3]})
+        self.assertEqual(self.search(q='logs')['results'], [])
+    
+    def test_results_are_ranked_and_paged_by_cursor(self):
+        expected = list(Task.objects.filter(workspace=self.workspace)
+                        .order_by('-priority_score', '-id').values_list('id', flat=True))
+        seen = []
+        params = {'limit': 4}
+        while True:
+            page = self.search(**params)
+            seen.extend(t['id'] for t in page['results'])
+            if page['next'] is None:
+                break
+            params['after'] = page['next']
+        
+        self.assertEqual(seen, expected)
+        response = self.client.get('/api/tasks/workspaces/ops/search/', {'after': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_facet_filters_and_counts(self):
+        overdue = self.search(due='overdue')['results']
+        self.assertEqual([t['id'] for t in overdue], [self.ids[0], self.ids[1]])
+        self.assertEqual([t['id'] for t in self.search(blocked='true')['results']], [self.ids[2]])
+        self.assertEqual(len(self.search(blocked='false')['results']), 5)
+        self.assertEqual([t['id'] for t in self.search(importance_band='critical')['results']],
+                         [self.ids[0], self.ids[1]])
+        
+        facets = self.search(q='deploy', facets='true')['facets']
+        self.assertEqual(facets['total'], 3)
+        self.assertEqual(facets['due']['overdue'], 1)
+        self.assertEqual(facets['blocked'], 1)
+        self.assertEqual(sum(facets['importance'].values()), 3)
+
+
+class GraphSimplificationTests(TestCase):
+    
+    def make_tasks(self):
+        today = date.today()
+        deps = [[], [0], [1, 0, 0], [2, 0, 1], [3, 5], [4], [2]]
+        return [
+            {'id': i, 'title': f'Task {i}', 'due_date': today + timedelta(days=i), 'importance': 5 + i % 4,
+             'estimated_hours': 1 + i % 3, 'dependencies': list(d)}
+            for i, d in enumerate(deps)
+        ]
+    
+    def test_transitive_reduction_keeps_only_covering_edges(self):
+        successors = [[1, 2, 3], [2, 3], [3], []]
+        self.assertEqual(transitive_reduction(successors), [[1], [2], [3], []])
+        
+        cyclic = [[1], [2, 3], [1], [4], [], [1, 3]]
+        self.assertEqual(transitive_reduction(cyclic), [[1], [2, 3], [1], [4], [], [1]])
+    
+    def test_simplified_index_reports_removed_edges(self):
+        index = normalize_tasks(self.make_tasks())
+        simplified, report = index.simplified()
+        
+        self.assertEqual(report, {'edges_before': 11, 'duplicate_edges': 1, 'redundant_edges': 3,
+                                  'edges_after': 7})
+        self.assertEqual(simplified.blockers, [[], [0], [1], [2], [3, 5], [4], [2]])
+        self.assertEqual(simplified.cycle_positions(), index.cycle_positions())
+        self.assertEqual(ReachabilityIndex(simplified.successors).counts(),
+                         ReachabilityIndex(index.successors).counts())
+    
+    def test_analyze_with_simplify(self):
+        client = APIClient()
+        tasks = [
+            {'title': t['title'], 'due_date': str(t['due_date']), 'importance': t['importance'],
+             'dependencies': t['dependencies']}
+            for t in self.make_tasks()[:4]
+        ]
+        
+        plain = client.post('/api/tasks/analyze/', {'tasks': tasks}, format='json').data
+        simple = client.post('/api/tasks/analyze/', {'tasks': tasks, 'simplify': True}, format='json').data
+        
+        self.assertNotIn('simplification', plain)
+        self.assertEqual(simple['simplification']['redundant_edges'], 3)
+        self.assertEqual(len(plain['dependency_graph']['edges']), 7)
+        self.assertEqual(sorted((e['from'], e['to']) for e in simple['dependency_graph']['edges']),
+                         [(0, 1), (1, 2), (2, 3)])
+        scores = {t['id']: t['priority_score'] for t in simple['tasks']}
+        self.assertLess(scores[0], {t['id']: t['priority_score'] for t in plain['tasks']}[0])
+    
+    def test_simulation_keeps_simplifying(self):
+        score_cache = {}
+        tasks = self.make_tasks()
+        index, _ = normalize_tasks(tasks).simplified()
+        analyzed = analyze_all_tasks(tasks, score_cache=score_cache, task_index=index)
+        snapshot = AnalysisSnapshot(analyzed, 'smart_balance', score_cache, task_index=index, simplify=True)
+        
+        result = snapshot.simulate([{'op': 'set', 'task': 6, 'importance': 10}])
+        
+        edited = self.make_tasks()
+        edited[6]['importance'] = 10
+        expected = analyze_all_tasks(edited, task_index=normalize_tasks(edited).simplified()[0])
+        expected_scores = {t['id']: t['priority_score'] for t in expected}
+        self.assertTrue(result['changes'])
+        for change in result['changes']:
+            self.assertEqual(change['new_score'], expected_scores[change['id']])
+
+
+@override_settings(ANALYZE_PEER_TOKEN='s3cret')
+class ScatterGatherTests(LiveServerTestCase):
+    
+    def setUp(self):
+        self.client = APIClient()
+        today = date.today()
+        self.tasks = []
+        for i in range(24):
+            group = i // 4
+            deps = [i - 1] if i % 4 else []
+            if i % 4 == 3:
+                deps.append(i - 3)
+            self.tasks.append({
+                'title': f'Task {i}',
+                'due_date': (today + timedelta(days=(i * 5) % 17 - 3)).isoformat(),
+                'importance': 1 + (i * 7) % 10,
+                'estimated_hours': 1 + i % 3,
+                'dependencies': deps
+            })
+        self.tasks[22]['dependencies'].append(23)
+    
+    def analyze(self, **extra):
+        response = self.client.post('/api/tasks/analyze/', dict({'tasks': self.tasks}, **extra), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def ranking(self, result):
+        return [(t['id'], t['priority_score'], t['explanation']) for t in result['tasks']]
+    
+    def test_partitions_are_scored_by_peers(self):
+        local = self.analyze(propagation='gauss_seidel', simplify=True)
+        with override_settings(ANALYZE_PEERS=[self.live_server_url, self.live_server_url + '/'],
+                               ANALYZE_SCATTER_MIN_TASKS=10):
+            remote = self.analyze(propagation='gauss_seidel', simplify=True)
+        
+        self.assertEqual(self.ranking(remote), self.ranking(local))
+        self.assertEqual(remote['circular_dependencies'], local['circular_dependencies'])
+        self.assertEqual(remote['dependency_graph']['edges'], local['dependency_graph']['edges'])
+        self.assertEqual(remote['propagation']['converged'], True)
+        self.assertEqual([p['peer'] for p in remote['partitions']],
+                         [None, self.live_server_url, self.live_server_url + '/'])
+        self.assertEqual(sum(p['tasks'] for p in remote['partitions']), 24)
+        self.assertNotIn('partitions', local)
+    
+    def test_unreachable_peer_falls_back_to_local_scoring(self):
+        local = self.analyze()
+        with override_settings(ANALYZE_PEERS=['http://127.0.0.1:9', self.live_server_url], ANALYZE_PEER_TIMEOUT=2,
+                               ANALYZE_SCATTER_MIN_TASKS=10):
+            result = self.analyze()
+        
+        self.assertEqual(self.ranking(result), self.ranking(local))
+        self.assertEqual([p['peer'] for p in result['partitions']], [None, None, self.live_server_url])
+    
+    def test_small_backlogs_stay_local(self):
+        with override_settings(ANALYZE_PEERS=[self.live_server_url]):
+            result = self.analyze()
+        
+        self.assertNotIn('partitions', result)
+    
+    def test_partition_endpoint_requires_peer_token(self):
+        payload = {'strategy': 'smart_balance', 'reference_date': date.today().isoformat(),
+                   'tasks': [{'id': 5, 'title': 'A', 'due_date': date.today().isoformat(), 'dependencies': []}]}
+        
+        denied = self.client.post('/api/tasks/analyze/partition/', payload, format='json')
+        allowed = self.client.post('/api/tasks/analyze/partition/', payload, format='json', HTTP_X_PEER_TOKEN='s3cret')
+        
+        self.assertEqual(denied.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(allowed.status_code, status.HTTP_200_OK)
+        with override_settings(ANALYZE_PEER_TOKEN=None):
+            unconfigured = self.client.post('/api/tasks/analyze/partition/', payload, format='json',
+                                            HTTP_X_PEER_TOKEN='')
+        self.assertEqual(unconfigured.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(len(allowed.data['tasks']), 1)
+        self.assertIn('priority_score', allowed.data['tasks'][0])
+        with override_settings(ANALYZE_PEERS=[self.live_server_url], ANALYZE_SCATTER_MIN_TASKS=10):
+            self.assertEqual(self.analyze()['partitions'][1]['peer'], self.live_server_url)
+
+
+class SelectionTests(TestCase):
+    
+    def best_value(self, values, hours, blockers, budget):
+        best = 0
+        for mask in range(1 << len(values)):
+            chosen = {i for i in range(len(values)) if mask >> i & 1}
+            if sum(hours[i] for i in chosen) > budget:
+                continue
+            if any(j not in chosen for i in chosen for j in blockers[i]):
+                continue
+            best = max(best, sum(values[i] for i in chosen))
+        return best
+    
+    def choose(self, values, hours, blockers, budget, **kwargs):
+        index = TaskIndex.from_blockers(list(range(len(values))), blockers)
+        return choose_tasks(values, hours, index.blockers, index.successors, index.cycle_positions(), budget,
+                            **kwargs)
+    
+    def test_forest_uses_exact_dynamic_program(self):
+        values = [10, 40, 30, 5, 50, 20, 25]
+        hours = [3, 4, 2, 1, 6, 2, 3]
+        blockers = [[], [0], [0], [], [3], [4], []]
+        
+        for budget in range(0, 22):
+            result = self.choose(values, hours, blockers, budget)
+            self.assertEqual(result['method'], 'dp' if budget >= 1 else 'none')
+            self.assertTrue(result['optimal'])
+            self.assertEqual(result['value'], self.best_value(values, hours, blockers, budget))
+            self.assertLessEqual(sum(hours[i] for i in result['positions']), budget)
+    
+    def test_shared_blockers_use_branch_and_bound(self):
+        values = [5, 8, 30, 12, 9, 40, 3, 15]
+        hours = [2, 3, 4, 2, 5, 6, 1, 3]
+        blockers = [[], [], [0, 1], [1], [3], [2, 4], [], [6, 3]]
+        
+        for budget in (9, 13, 17, 26):
+            result = self.choose(values, hours, blockers, budget)
+            self.assertEqual(result['method'], 'branch_and_bound')
+            self.assertTrue(result['optimal'])
+            self.assertEqual(result['value'], self.best_value(values, hours, blockers, budget))
+            chosen = set(result['positions'])
+            self.assertTrue(all(j in chosen for i in chosen for j in blockers[i]))
+    
+    def test_node_limit_returns_incumbent_with_bound(self):
+        values, hours, blockers = [6, 5, 5], [6, 5, 5], [[], [], []]
+        
+        capped = self.choose(values, hours, blockers, 10, dp_cells=0, node_limit=0)
+        solved = self.choose(values, hours, blockers, 10, dp_cells=0)
+        
+        self.assertFalse(capped['optimal'])
+        self.assertEqual(capped['value'], 6)
+        self.assertGreaterEqual(capped['upper_bound'], 10)
+        self.assertTrue(solved['optimal'])
+        self.assertEqual(sorted(solved['positions']), [1, 2])
+    
+    def test_cycles_and_oversized_chains_are_excluded(self):
+        today = date.today()
+        tasks = [
+            {'id': 0, 'title': 'A', 'due_date': today, 'estimated_hours': 2, 'importance': 9, 'dependencies': [1]},
+            {'id': 1, 'title': 'B', 'due_date': today, 'estimated_hours': 2, 'importance': 9, 'dependencies': [0]},
+            {'id': 2, 'title': 'C', 'due_date': today, 'estimated_hours': 6, 'importance': 3, 'dependencies': []},
+            {'id': 3, 'title': 'D', 'due_date': today, 'estimated_hours': 3, 'importance': 10, 'dependencies': [2]},
+            {'id': 4, 'title': 'E', 'due_date': today, 'estimated_hours': 4, 'importance': 2, 'dependencies': []},
+        ]
+        
+        result = select_within_budget(tasks, 8, reference_date=today)
+        
+        self.assertEqual(result['excluded_circular'], 2)
+        self.assertEqual(result['candidates'], 2)
+        self.assertEqual([t['id'] for t in result['selected_tasks']], [2])
+        self.assertEqual(result['total_hours'], 6)
+    
+    def test_select_endpoint(self):
+        client = APIClient()
+        today = date.today()
+        data = {
+            'tasks': [
+                {'title': 'Schema', 'due_date': str(today + timedelta(days=4)), 'estimated_hours': 3,
+                 'importance': 4, 'dependencies': []},
+                {'title': 'API', 'due_date': str(today + timedelta(days=1)), 'estimated_hours': 2,
+                 'importance': 9, 'dependencies': [0]},
+                {'title': 'Docs', 'due_date': str(today + timedelta(days=9)), 'estimated_hours': 4,
+                 'importance': 3, 'dependencies': []},
+            ],
+            'hours': 5
+        }
+        
+        response = client.post('/api/tasks/select/', data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([t['id'] for t in response.data['selected_tasks']], [0, 1])
+        self.assertEqual(response.data['total_hours'], 5)
+        self.assertEqual(response.data['method'], 'dp')
+        self.assertTrue(response.data['optimal'])
+        self.assertEqual(response.data['total_tasks'], 3)
+        
+        response = client.post('/api/tasks/select/', dict(data, hours=0), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SoakTests(TestCase):
+    
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('analyze=3, select'), {'analyze': 3, 'select': 1})
+        for bad in ('analyze=x', 'nope=1', 'analyze=0', 'plan=-1'):
+            with self.assertRaises(ValueError):
+                parse_mix(bad)
+    
+    def test_allocation_sites_point_at_app_code(self):
+        today = date.today()
+        tasks = [{'id': i, 'title': f'Task {i}', 'due_date': today + timedelta(days=i), 'importance': 5,
+                  'estimated_hours': 2, 'dependencies': [i - 1] if i else []} for i in range(50)]
+        
+        tracemalloc.start(5)
+        try:
+            before = tracemalloc.take_snapshot()
+            kept = analyze_all_tasks(tasks)
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        
+        sites = allocation_sites(before, after)
+        self.assertEqual(len(kept), 50)
+        self.assertTrue(sites)
+        self.assertTrue(any(site['site'].startswith('scoring.py:') for site in sites))
+        self.assertFalse(any(site['site'].startswith(('tests.py', 'soak.py')) for site in sites))
+    
+    def test_soak_reports_memory_per_endpoint(self):
+        report = run_soak(Client(), 12, {'analyze': 2, 'select': 1}, size=8, variants=2, warmup=2, traced=4,
+                          frames=3, sample_every=5)
+        
+        self.assertLessEqual(set(report['endpoints']), {'analyze', 'select'})
+        self.assertEqual(sum(e['requests'] for e in report['endpoints'].values()), 12)
+        for entry in report['endpoints'].values():
+            self.assertEqual(entry['errors'], 0)
+            self.assertGreater(entry['steady_rss_bytes'], 0)
+            self.assertGreaterEqual(entry['peak_rss_bytes'], entry['steady_rss_bytes'])
+        self.assertEqual([s['iteration'] for s in report['samples']], [0, 5, 10, 12])
+        self.assertIsNotNone(report['traced_growth_bytes'])
+        self.assertFalse(tracemalloc.is_tracing())
+    
+    def test_growth_failures(self):
+        report = {
+            'iterations': 1000,
+            'traced': 300,
+            'endpoints': {'analyze': {'requests': 10, 'errors': 0}, 'plan': {'requests': 5, 'errors': 2}},
+            'traced_growth_bytes': 4096,
+            'rss_growth_bytes': 3 * 1024 * 1024
+        }
+        
+        self.assertEqual(growth_failures(dict(report, endpoints={})), [])
+        failures = growth_failures(report, max_growth_kb=2, max_rss_growth_mb=1)
+        self.assertEqual(len(failures), 3)
+        self.assertIn('plan: 2 request(s) failed', failures)
+        self.assertEqual(len(growth_failures(dict(report, traced_growth_bytes=None), max_growth_kb=2)), 1)
+    
+    def test_soak_command(self):
+        out = StringIO()
+        call_command('soak', '--iterations', '6', '--warmup', '1', '--traced', '0', '--tasks', '5',
+                     '--variants', '2', '--mix', 'suggest=1,plan=1', '--host', 'testserver', stdout=out)
+        
+        self.assertIn('No growth above the configured limits', out.getvalue())
+        self.assertIn('steady RSS', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('soak', '--mix', 'unknown=1', stdout=StringIO())
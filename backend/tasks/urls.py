@@ -3,5 +3,25 @@ from . import views
 
 urlpatterns = [
     path('analyze/', views.analyze_tasks, name='analyze_tasks'),
+    path('analyze/partition/', views.analyze_partition, name='analyze_partition'),
+    path('analyze/batch/', views.analyze_tasks_batch, name='analyze_tasks_batch'),
+    path('analyze/jobs/', views.analysis_jobs, name='analysis_jobs'),
+    path('analyze/jobs/<uuid:job_id>/', views.analysis_job, name='analysis_job'),
     path('suggest/', views.suggest_tasks, name='suggest_tasks'),
+    path('plan/', views.plan_tasks, name='plan_tasks'),
+    path('select/', views.select_tasks, name='select_tasks'),
+    path('simulate/', views.simulate_tasks, name='simulate_tasks'),
+    path('forecast/', views.forecast_tasks, name='forecast_tasks'),
+    path('graph/', views.graph_data, name='graph_data'),
+    path('graph/layout/', views.graph_layout, name='graph_layout'),
+    path('workspaces/<slug:slug>/tasks/', views.workspace_tasks, name='workspace_tasks'),
+    path('workspaces/<slug:slug>/analyze/', views.workspace_analyze, name='workspace_analyze'),
+    path('workspaces/<slug:slug>/search/', views.workspace_search, name='workspace_search'),
+    path('workspaces/<slug:slug>/ready/', views.workspace_ready, name='workspace_ready'),
+    path(
+        'workspaces/<slug:slug>/tasks/<int:task_id>/complete/',
+        views.workspace_task_complete,
+        name='workspace_task_complete'
+    ),
+    path('workspaces/<slug:slug>/stream/', views.workspace_stream, name='workspace_stream'),
 ]
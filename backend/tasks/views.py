@@ -1,39 +1,187 @@
+import functools
+import hmac
+import json
+import math
+import time
+import uuid
+from django.conf import settings
+from django.db.models import Count, F, Max
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 from datetime import date, datetime
-from .scoring import analyze_all_tasks, detect_cycles, detect_circular_dependencies
-from .serializers import TaskAnalysisInputSerializer
+from .batch import analyze_batch
+from .cache import LRUCache
+from .feeds import Feed, FeedRegistry, format_error, format_event
+from .instrumentation import recording, registry, stage
+from .job_queue import job_state, submit_job
+from .models import AnalysisJob, Task, Workspace
+from .scoring import analyze_all_tasks, normalize_tasks, STRATEGY_NAMES
+from .pipeline import run_pipeline
+from .profiling import MODES as PROFILE_MODES, ProfileStore, anonymize_payload, capturing
+from .rank_diff import RankingVersion, diff_rankings
+from .scatter import ScatterGather, read_partition, score_partition
+from .search import facet_counts, filter_tasks, match_titles, ranked_page
+from .ready import ReadyQueue
+from .planner import plan_schedule
+from .selection import select_within_budget
+from .forecast import forecast_rankings
+from .graph_codec import CodecUnavailable, to_msgpack
+from .simulation import SimulationError
+from .workspaces import QuotaExceeded, RuntimeRegistry
+from .serializers import (
+    TaskAnalysisInputSerializer,
+    AnalysisOptionsSerializer,
+    AnalysisJobQuerySerializer,
+    BatchAnalysisSerializer,
+    CompletionSerializer,
+    ForecastOptionsSerializer,
+    GraphLayoutQuerySerializer,
+    GraphQuerySerializer,
+    PartitionSerializer,
+    PlanOptionsSerializer,
+    ReadyQuerySerializer,
+    SelectOptionsSerializer,
+    SimulationRequestSerializer,
+    TaskSearchSerializer,
+    WorkspacePageSerializer,
+    WorkspaceTaskSerializer
+)
 
 
-def build_dependency_graph(tasks, circular_ids):
-    task_lookup = {t['id']: t for t in tasks}
-    nodes = []
-    edges = []
-    
-    for task in tasks:
-        task_id = task['id']
-        in_cycle = task_id in circular_ids
-        
-        nodes.append({
-            'id': task_id,
-            'title': task.get('title', f'Task {task_id}'),
-            'score': task.get('priority_score', 0),
-            'is_circular': in_cycle
-        })
-        
-        for dep_id in task.get('dependencies', []):
-            if dep_id in task_lookup:
-                edge_in_cycle = task_id in circular_ids and dep_id in circular_ids
-                edges.append({
-                    'from': dep_id,
-                    'to': task_id,
-                    'is_circular': edge_in_cycle
-                })
-    
-    return {'nodes': nodes, 'edges': edges}
+analysis_cache = LRUCache(getattr(settings, 'ANALYSIS_CACHE_SIZE', 16))
+ranking_versions = LRUCache(getattr(settings, 'RANKING_VERSION_CACHE_SIZE', 64))
+workspace_runtimes = RuntimeRegistry(
+    getattr(settings, 'WORKSPACE_RUNTIME_LIMIT', 64),
+    getattr(settings, 'WORKSPACE_ANALYSIS_CACHE_SIZE', 4),
+    getattr(settings, 'WORKSPACE_SCORE_CACHE_SIZE', 50000)
+)
+profile_store = ProfileStore(
+    getattr(settings, 'PROFILE_STORE_DIR', settings.BASE_DIR / 'profiles'),
+    getattr(settings, 'PROFILE_STORE_LIMIT', 50)
+)
+workspace_feeds = FeedRegistry()
+ready_queues = LRUCache(getattr(settings, 'READY_QUEUE_CACHE_SIZE', 64))
+
+WORKSPACE_TASK_FIELDS = ('id', 'title', 'due_date', 'estimated_hours', 'importance', 'dependencies')
+SEARCH_RESULT_FIELDS = ('id', 'title', 'due_date', 'estimated_hours', 'importance', 'priority_score',
+                        'blocker_count', 'in_cycle', 'completed', 'scored_at')
+
+
+def instrumented(endpoint):
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            wants_block = (
+                request.GET.get('debug_timings') in ('1', 'true')
+                or request.headers.get('X-Debug-Timings') == '1'
+            )
+            if not wants_block and not getattr(settings, 'TASK_ANALYZER_TIMINGS', False):
+                return view(request, *args, **kwargs)
+            
+            start = time.perf_counter()
+            with recording() as recorder:
+                response = view(request, *args, **kwargs)
+                if wants_block and isinstance(getattr(response, 'data', None), dict):
+                    response.data['debug_timings'] = recorder.as_dict()
+                if hasattr(response, 'render'):
+                    with stage('render'):
+                        response.render()
+            elapsed = time.perf_counter() - start
+            
+            registry.record(endpoint, recorder, elapsed, response.status_code)
+            timing = recorder.server_timing()
+            response['Server-Timing'] = f'{timing}, total;dur={elapsed * 1000:.3f}' if timing else f'total;dur={elapsed * 1000:.3f}'
+            return response
+        return wrapper
+    return decorator
+
+
+def profiled(endpoint):
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            mode = request.GET.get('profile') or request.headers.get('X-Profile')
+            if mode not in PROFILE_MODES or not getattr(getattr(request, 'user', None), 'is_staff', False):
+                return view(request, *args, **kwargs)
+            
+            try:
+                payload = anonymize_payload(json.loads(request.body or b'null'))
+            except ValueError:
+                payload = None
+            
+            with capturing(mode, getattr(settings, 'PROFILE_SAMPLE_INTERVAL', 0.001)) as capture:
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+            if not capture.active:
+                return response
+            
+            response['X-Profile-Id'] = profile_store.save(endpoint, capture, payload, response.status_code)
+            return response
+        return wrapper
+    return decorator
+
+
+def run_analysis(tasks, strategy, options, score_cache=None, work_calendar=None,
+                 cache=analysis_cache, analysis_id=None, analyze=analyze_all_tasks):
+    analysis_id = analysis_id or uuid.uuid4().hex
+    result, snapshot = run_pipeline(
+        tasks,
+        strategy,
+        options,
+        score_cache=score_cache,
+        work_calendar=work_calendar,
+        layout_limit=getattr(settings, 'GRAPH_INLINE_LAYOUT_LIMIT', 2000),
+        analysis_id=analysis_id,
+        analyze=analyze
+    )
+    cache.set(analysis_id, snapshot)
+    return result
+
+
+def ranking_base(options):
+    since_version = options.get('since_version')
+    base = ranking_versions.get(since_version) if since_version else None
+    if base is not None:
+        options = dict(options, include_graph=False)
+    return base, options
+
 
+def versioned(result, strategy, base=None):
+    with stage('version'):
+        current = RankingVersion(result['tasks'], strategy)
+        ranking_versions.set(current.token, current)
+        result['version'] = current.token
+        if base is not None:
+            result['base_version'] = base.token
+            result['diff'] = diff_rankings(base, current, result.pop('tasks'))
+    return result
 
+
+def find_snapshot(analysis_id):
+    slug, separator, _ = analysis_id.rpartition(':')
+    if not separator:
+        return analysis_cache.get(analysis_id)
+    runtime = workspace_runtimes.get(slug)
+    if runtime is None:
+        return None
+    return runtime.analyses.get(analysis_id)
+
+
+def quota_response(error):
+    if error.retry_after is None:
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    response = Response({'error': str(error)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    response['Retry-After'] = str(max(1, math.ceil(error.retry_after)))
+    return response
+
+
+@instrumented('analyze')
+@profiled('analyze')
 @api_view(['POST'])
 def analyze_tasks(request):
     tasks = request.data.get('tasks', [])
@@ -42,45 +190,161 @@ def analyze_tasks(request):
     if not tasks:
         return Response({'error': 'No tasks provided'}, status=status.HTTP_400_BAD_REQUEST)
     
-    serializer = TaskAnalysisInputSerializer(data=tasks, many=True)
-    if not serializer.is_valid():
+    with stage('validate'):
+        serializer = TaskAnalysisInputSerializer(data=tasks, many=True)
+        valid = serializer.is_valid()
+    if not valid:
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-    validated_tasks = serializer.validated_data
+    options = AnalysisOptionsSerializer(data=request.data)
+    if not options.is_valid():
+        return Response(options.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    analyzed = analyze_all_tasks(validated_tasks, strategy)
+    base, analysis_options = ranking_base(options.validated_data)
+    scatter = ScatterGather(
+        getattr(settings, 'ANALYZE_PEERS', []),
+        timeout=getattr(settings, 'ANALYZE_PEER_TIMEOUT', 30),
+        min_tasks=getattr(settings, 'ANALYZE_SCATTER_MIN_TASKS', 20000),
+        token=getattr(settings, 'ANALYZE_PEER_TOKEN', None)
+    )
+    result = run_analysis(serializer.validated_data, strategy, analysis_options, analyze=scatter)
+    if scatter.partitions:
+        result['partitions'] = scatter.partitions
+    return Response(versioned(result, strategy, base))
+
+
+@instrumented('analyze_partition')
+@api_view(['POST'])
+def analyze_partition(request):
+    token = getattr(settings, 'ANALYZE_PEER_TOKEN', None)
+    if not token:
+        return Response({'error': 'Peer scoring is disabled; set ANALYZE_PEER_TOKEN'}, status=status.HTTP_403_FORBIDDEN)
+    if not hmac.compare_digest(request.headers.get('X-Peer-Token', ''), token):
+        return Response({'error': 'Invalid peer token'}, status=status.HTTP_403_FORBIDDEN)
     
-    cycle_ids = detect_cycles(analyzed)
-    cycle_names = [
-        t.get('title', f"Task {t.get('id')}") 
-        for t in analyzed 
-        if t.get('id') in cycle_ids
-    ]
+    serializer = PartitionSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    analyzed.sort(key=lambda x: x['priority_score'], reverse=True)
+    data = serializer.validated_data
+    try:
+        result = score_partition(
+            read_partition(data),
+            data['strategy'],
+            data['reference_date'],
+            data.get('propagation'),
+            downstream=data['downstream']
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return Response({'error': f'Invalid partition: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result)
+
+
+@instrumented('analyze_batch')
+@api_view(['POST'])
+def analyze_tasks_batch(request):
+    batch = BatchAnalysisSerializer(data=request.data)
+    if not batch.is_valid():
+        return Response(batch.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    for task in analyzed:
-        if isinstance(task.get('due_date'), date):
-            task['due_date'] = task['due_date'].isoformat()
+    items = batch.validated_data['backlogs']
+    if len(items) > getattr(settings, 'ANALYZE_BATCH_MAX_BACKLOGS', 500):
+        return Response({'error': 'Too many backlogs in one batch'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    results = [None] * len(items)
+    pending = []
+    positions = []
+    with stage('validate'):
+        for i, item in enumerate(items):
+            name = str(item.get('name') or f'backlog-{i + 1}')
+            tasks = item.get('tasks') or []
+            if not tasks:
+                results[i] = {'name': name, 'status': 'error', 'error': 'No tasks provided'}
+                continue
             
-    graph = build_dependency_graph(analyzed, cycle_ids)
+            serializer = TaskAnalysisInputSerializer(data=tasks, many=True)
+            options = AnalysisOptionsSerializer(data=item)
+            if not serializer.is_valid():
+                results[i] = {'name': name, 'status': 'error', 'errors': serializer.errors}
+                continue
+            if not options.is_valid():
+                results[i] = {'name': name, 'status': 'error', 'errors': options.errors}
+                continue
+            
+            pending.append({
+                'name': name,
+                'tasks': serializer.validated_data,
+                'strategy': item.get('strategy', 'smart_balance'),
+                'options': options.validated_data
+            })
+            positions.append(i)
     
-    strategy_names = {
-        'smart_balance': 'Smart Balance',
-        'fastest_wins': 'Fastest Wins',
-        'high_impact': 'High Impact',
-        'deadline_driven': 'Deadline Driven'
-    }
+    processes = min(batch.validated_data['processes'], getattr(settings, 'ANALYZE_BATCH_MAX_PROCESSES', 4))
+    with stage('score'):
+        outcomes = analyze_batch(
+            pending,
+            processes=processes,
+            layout_limit=getattr(settings, 'GRAPH_INLINE_LAYOUT_LIMIT', 2000)
+        )
+    for i, outcome in zip(positions, outcomes):
+        results[i] = outcome
     
     return Response({
-        'tasks': analyzed,
-        'strategy_used': strategy_names.get(strategy, 'Smart Balance'),
-        'circular_dependencies': list(cycle_names),
-        'total_tasks': len(analyzed),
-        'dependency_graph': graph
+        'results': results,
+        'total_backlogs': len(results),
+        'failed': sum(1 for r in results if r['status'] == 'error')
     })
 
 
+@instrumented('analyze_jobs')
+@api_view(['POST'])
+def analysis_jobs(request):
+    tasks = request.data.get('tasks', [])
+    strategy = request.data.get('strategy', 'smart_balance')
+    
+    if not tasks:
+        return Response({'error': 'No tasks provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    with stage('validate'):
+        serializer = TaskAnalysisInputSerializer(data=tasks, many=True)
+        valid = serializer.is_valid()
+    if not valid:
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    options = AnalysisOptionsSerializer(data=request.data)
+    if not options.is_valid():
+        return Response(options.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    job_options = dict(options.validated_data)
+    job_options.pop('since_version', None)
+    job_options['reference_date'] = job_options.get('reference_date') or date.today()
+    
+    with stage('enqueue'):
+        job, deduplicated = submit_job(serializer.validated_data, strategy, job_options)
+    
+    state = job_state(job)
+    state['deduplicated'] = deduplicated
+    return Response(state, status=status.HTTP_202_ACCEPTED)
+
+
+@instrumented('analyze_job')
+@api_view(['GET'])
+def analysis_job(request, job_id):
+    query = AnalysisJobQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    job = get_object_or_404(AnalysisJob, id=job_id)
+    deadline = time.monotonic() + min(query.validated_data['wait'], getattr(settings, 'ANALYSIS_JOB_MAX_WAIT', 30))
+    while job.status in ('queued', 'running') and time.monotonic() < deadline:
+        time.sleep(0.25)
+        job.refresh_from_db()
+    
+    return Response(job_state(job))
+
+
+@instrumented('suggest')
+@profiled('suggest')
 @api_view(['GET', 'POST'])
 def suggest_tasks(request):
     if request.method == 'POST':
@@ -90,14 +354,20 @@ def suggest_tasks(request):
         if not tasks:
             return Response({'error': 'No tasks provided'}, status=status.HTTP_400_BAD_REQUEST)
         
-        serializer = TaskAnalysisInputSerializer(data=tasks, many=True)
-        if not serializer.is_valid():
+        with stage('validate'):
+            serializer = TaskAnalysisInputSerializer(data=tasks, many=True)
+            valid = serializer.is_valid()
+        if not valid:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
+        options = AnalysisOptionsSerializer(data=request.data)
+        if not options.is_valid():
+            return Response(options.errors, status=status.HTTP_400_BAD_REQUEST)
+        
         validated = serializer.validated_data
-        analyzed = analyze_all_tasks(validated, strategy)
+        today = options.validated_data.get('reference_date') or date.today()
+        analyzed = analyze_all_tasks(validated, strategy, reference_date=today)
         
-        today = date.today()
         due_today = []
         
         for task in analyzed:
@@ -121,16 +391,9 @@ def suggest_tasks(request):
             if isinstance(task.get('due_date'), date):
                 task['due_date'] = task['due_date'].isoformat()
         
-        strategy_names = {
-            'smart_balance': 'Smart Balance',
-            'fastest_wins': 'Fastest Wins',
-            'high_impact': 'High Impact',
-            'deadline_driven': 'Deadline Driven'
-        }
-        
         return Response({
             'suggestions': suggestions,
-            'strategy_used': strategy_names.get(strategy, 'Smart Balance'),
+            'strategy_used': STRATEGY_NAMES.get(strategy, 'Smart Balance'),
             'total_tasks_due_today': len(due_today),
             'message': f'Found {len(due_today)} task(s) due today, showing top {len(suggestions)}'
         })
@@ -138,3 +401,497 @@ def suggest_tasks(request):
     return Response({'message': 'Send POST request with tasks data'})
 
 
+@instrumented('plan')
+@api_view(['POST'])
+def plan_tasks(request):
+    tasks = request.data.get('tasks', [])
+    strategy = request.data.get('strategy', 'smart_balance')
+    
+    if not tasks:
+        return Response({'error': 'No tasks provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    with stage('validate'):
+        serializer = TaskAnalysisInputSerializer(data=tasks, many=True)
+        valid = serializer.is_valid()
+    if not valid:
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    options = PlanOptionsSerializer(data=request.data)
+    if not options.is_valid():
+        return Response(options.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    with stage('plan'):
+        plan = plan_schedule(
+            serializer.validated_data,
+            hours_per_day=options.validated_data['hours_per_day'],
+            people=options.validated_data['people'],
+            horizon_days=options.validated_data['horizon_days'],
+            start_date=options.validated_data.get('start_date'),
+            strategy=strategy
+        )
+    
+    plan['strategy_used'] = STRATEGY_NAMES.get(strategy, 'Smart Balance')
+    plan['total_tasks'] = len(serializer.validated_data)
+    return Response(plan)
+
+
+@instrumented('select')
+@api_view(['POST'])
+def select_tasks(request):
+    tasks = request.data.get('tasks', [])
+    strategy = request.data.get('strategy', 'smart_balance')
+    
+    if not tasks:
+        return Response({'error': 'No tasks provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    with stage('validate'):
+        serializer = TaskAnalysisInputSerializer(data=tasks, many=True)
+        valid = serializer.is_valid()
+    if not valid:
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    options = SelectOptionsSerializer(data=request.data)
+    if not options.is_valid():
+        return Response(options.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    with stage('select'):
+        selection = select_within_budget(
+            serializer.validated_data,
+            options.validated_data['hours'],
+            strategy=strategy,
+            reference_date=options.validated_data.get('reference_date'),
+            dp_cells=getattr(settings, 'SELECT_DP_CELLS', 250000),
+            node_limit=getattr(settings, 'SELECT_NODE_LIMIT', 200)
+        )
+    
+    selection['strategy_used'] = STRATEGY_NAMES.get(strategy, 'Smart Balance')
+    selection['total_tasks'] = len(serializer.validated_data)
+    return Response(selection)
+
+
+@instrumented('simulate')
+@api_view(['POST'])
+def simulate_tasks(request):
+    serializer = SimulationRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = serializer.validated_data
+    snapshot = find_snapshot(data['analysis_id'])
+    if snapshot is None:
+        return Response({'error': 'Unknown or expired analysis_id'}, status=status.HTTP_404_NOT_FOUND)
+    
+    results = []
+    for scenario in data['scenarios']:
+        try:
+            result = snapshot.simulate(scenario['edits'], limit=data['limit'])
+        except SimulationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        result['name'] = scenario['name']
+        results.append(result)
+    
+    return Response({
+        'analysis_id': data['analysis_id'],
+        'strategy_used': STRATEGY_NAMES.get(snapshot.strategy, 'Smart Balance'),
+        'scenarios': results
+    })
+
+
+@instrumented('forecast')
+@api_view(['POST'])
+def forecast_tasks(request):
+    tasks = request.data.get('tasks', [])
+    strategy = request.data.get('strategy', 'smart_balance')
+    
+    if not tasks:
+        return Response({'error': 'No tasks provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    with stage('validate'):
+        serializer = TaskAnalysisInputSerializer(data=tasks, many=True)
+        valid = serializer.is_valid()
+    if not valid:
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    options = ForecastOptionsSerializer(data=request.data)
+    if not options.is_valid():
+        return Response(options.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    with stage('forecast'):
+        forecast = forecast_rankings(
+            serializer.validated_data,
+            strategy,
+            start_date=options.validated_data.get('start_date'),
+            days=options.validated_data['days'],
+            top=options.validated_data['top']
+        )
+    
+    forecast['strategy_used'] = STRATEGY_NAMES.get(strategy, 'Smart Balance')
+    forecast['total_tasks'] = len(serializer.validated_data)
+    return Response(forecast)
+
+
+@instrumented('graph_layout')
+@api_view(['GET'])
+def graph_layout(request):
+    query = GraphLayoutQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    snapshot = find_snapshot(query.validated_data['analysis_id'])
+    if snapshot is None:
+        return Response({'error': 'Unknown or expired analysis_id'}, status=status.HTTP_404_NOT_FOUND)
+    
+    with stage('layout'):
+        view = snapshot.graph_view(query.validated_data['lod'])
+    
+    with stage('graph'):
+        graph = view.render(query.validated_data.get('viewport'))
+    
+    return Response(graph)
+
+
+@instrumented('graph')
+@api_view(['GET'])
+def graph_data(request):
+    query = GraphQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    snapshot = find_snapshot(query.validated_data['analysis_id'])
+    if snapshot is None:
+        return Response({'error': 'Unknown or expired analysis_id'}, status=status.HTTP_404_NOT_FOUND)
+    
+    encoding = query.validated_data['encoding']
+    with stage('graph'):
+        graph = snapshot.encode_graph(encoding, query.validated_data['include_titles'])
+    
+    if encoding != 'msgpack':
+        return Response(graph)
+    
+    try:
+        with stage('render'):
+            body = to_msgpack(graph)
+    except CodecUnavailable as e:
+        return Response({'error': str(e)}, status=status.HTTP_406_NOT_ACCEPTABLE)
+    return HttpResponse(body, content_type='application/msgpack')
+
+
+@instrumented('workspace_tasks')
+@api_view(['GET', 'POST'])
+def workspace_tasks(request, slug):
+    workspace = get_object_or_404(Workspace, slug=slug)
+    
+    if request.method == 'POST':
+        tasks = request.data.get('tasks', [])
+        if not tasks:
+            return Response({'error': 'No tasks provided'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = WorkspaceTaskSerializer(data=tasks, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        runtime = workspace_runtimes.for_workspace(workspace)
+        try:
+            runtime.check_task_count(workspace.tasks.count() + len(serializer.validated_data))
+        except QuotaExceeded as e:
+            return quota_response(e)
+        
+        created = Task.objects.bulk_create(
+            Task(workspace=workspace, **data) for data in serializer.validated_data
+        )
+        bump_task_version(workspace.pk)
+        workspace_feeds.notify(workspace.pk)
+        ready_queues.pop(workspace.pk)
+        return Response({
+            'workspace': workspace.slug,
+            'created': [task.id for task in created],
+            'total_tasks': workspace.tasks.count()
+        }, status=status.HTTP_201_CREATED)
+    
+    page = WorkspacePageSerializer(data=request.query_params)
+    if not page.is_valid():
+        return Response(page.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    offset = page.validated_data['offset']
+    tasks = workspace.tasks.order_by('id')[offset:offset + page.validated_data['limit']]
+    return Response({
+        'workspace': workspace.slug,
+        'total_tasks': workspace.tasks.count(),
+        'tasks': WorkspaceTaskSerializer(tasks, many=True).data
+    })
+
+
+@instrumented('workspace_analyze')
+@api_view(['POST'])
+def workspace_analyze(request, slug):
+    workspace = get_object_or_404(Workspace, slug=slug)
+    strategy = request.data.get('strategy', 'smart_balance')
+    
+    options = AnalysisOptionsSerializer(data=request.data)
+    if not options.is_valid():
+        return Response(options.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    runtime = workspace_runtimes.for_workspace(workspace)
+    with stage('load'):
+        tasks = list(workspace.tasks.order_by('id').values(*WORKSPACE_TASK_FIELDS))
+    if not tasks:
+        return Response({'error': 'Workspace has no tasks'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    base, analysis_options = ranking_base(options.validated_data)
+    try:
+        runtime.check_task_count(len(tasks))
+        result = runtime.run(
+            run_analysis,
+            tasks,
+            strategy,
+            analysis_options,
+            score_cache=runtime.score_cache,
+            work_calendar=runtime.calendar,
+            cache=runtime.analyses,
+            analysis_id=f'{workspace.slug}:{uuid.uuid4().hex}'
+        )
+    except QuotaExceeded as e:
+        return quota_response(e)
+    
+    result['workspace'] = workspace.slug
+    return Response(versioned(result, strategy, base))
+
+
+@instrumented('workspace_search')
+@api_view(['GET'])
+def workspace_search(request, slug):
+    workspace = get_object_or_404(Workspace, slug=slug)
+    query = TaskSearchSerializer(data=request.query_params.dict())
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    params = query.validated_data
+    today = timezone.localdate()
+    with stage('search'):
+        matched = match_titles(workspace.tasks.all(), params['q'])
+        filtered = filter_tasks(
+            matched,
+            today,
+            due=params.get('due'),
+            importance=params.get('importance_band'),
+            blocked=params['blocked'],
+            in_cycle=params['in_cycle'],
+            completed=params['completed']
+        )
+        results, next_cursor = ranked_page(filtered, SEARCH_RESULT_FIELDS, params['limit'], params.get('after'))
+    
+    response = {
+        'workspace': workspace.slug,
+        'results': results,
+        'next': next_cursor
+    }
+    if params['facets']:
+        with stage('facets'):
+            response['facets'] = facet_counts(matched, today)
+    return Response(response)
+
+
+def bump_task_version(workspace_id):
+    Workspace.objects.filter(pk=workspace_id).update(task_version=F('task_version') + 1)
+
+
+def ready_version(workspace):
+    return workspace.updated_at, workspace.task_version
+
+
+def load_ready_queue(workspace, strategy):
+    today = date.today()
+    seen = ready_version(workspace)
+    day, version, queues = ready_queues.get(workspace.pk, (None, None, None))
+    if day != today or version != seen:
+        queues = {}
+        ready_queues.set(workspace.pk, (today, seen, queues))
+    if strategy in queues:
+        return queues[strategy]
+    runtime = workspace_runtimes.for_workspace(workspace)
+    rows = list(workspace.tasks.order_by('id').values(*WORKSPACE_TASK_FIELDS, 'completed'))
+    runtime.check_task_count(len(rows))
+    completed = [row.pop('completed') for row in rows]
+    index = normalize_tasks(rows)
+    runtime.run(
+        analyze_all_tasks,
+        rows,
+        strategy,
+        score_cache=runtime.score_cache,
+        reference_date=today,
+        work_calendar=runtime.calendar,
+        task_index=index
+    )
+    queue = ReadyQueue(index.blockers, [row['priority_score'] for row in rows], completed)
+    queues[strategy] = (rows, index, queue)
+    return queues[strategy]
+
+
+@instrumented('workspace_ready')
+@api_view(['GET'])
+def workspace_ready(request, slug):
+    workspace = get_object_or_404(Workspace, slug=slug)
+    query = ReadyQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    strategy = query.validated_data['strategy']
+    try:
+        rows, index, queue = load_ready_queue(workspace, strategy)
+    except QuotaExceeded as e:
+        return quota_response(e)
+    
+    return Response({
+        'workspace': workspace.slug,
+        'strategy_used': STRATEGY_NAMES[strategy],
+        'total_tasks': len(rows),
+        'total_ready': queue.ready_count,
+        'tasks': [
+            {
+                'id': rows[p]['id'],
+                'title': rows[p]['title'],
+                'due_date': rows[p]['due_date'],
+                'estimated_hours': rows[p]['estimated_hours'],
+                'importance': rows[p]['importance'],
+                'priority_score': rows[p]['priority_score'],
+                'explanation': rows[p]['explanation']
+            }
+            for p in queue.top(query.validated_data['limit'])
+        ]
+    })
+
+
+@instrumented('workspace_task_complete')
+@api_view(['POST'])
+def workspace_task_complete(request, slug, task_id):
+    workspace = get_object_or_404(Workspace, slug=slug)
+    task = get_object_or_404(Task, pk=task_id, workspace=workspace)
+    serializer = CompletionSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    completed = serializer.validated_data['completed']
+    try:
+        _, index, _ = load_ready_queue(workspace, 'smart_balance')
+        if task.pk not in index.positions:
+            ready_queues.pop(workspace.pk)
+            load_ready_queue(workspace, 'smart_balance')
+    except QuotaExceeded as e:
+        return quota_response(e)
+    
+    changed = []
+    if task.completed == completed:
+        return Response({'id': task.pk, 'completed': completed, 'unblocked' if completed else 'blocked': changed})
+    
+    Task.objects.filter(pk=task.pk).update(completed=completed, completed_at=timezone.now() if completed else None)
+    
+    bump_task_version(workspace.pk)
+    workspace.refresh_from_db(fields=['updated_at', 'task_version'])
+    day, _, queues = ready_queues.get(workspace.pk, (None, None, {}))
+    if day is not None:
+        ready_queues.set(workspace.pk, (day, ready_version(workspace), queues))
+    for strategy, (rows, index, queue) in list(queues.items()):
+        if task.pk not in index.positions:
+            del queues[strategy]
+            continue
+        position = index.positions[task.pk]
+        moved = queue.complete(position) if completed else queue.reopen(position)
+        if strategy == 'smart_balance':
+            changed = [index.ids[p] for p in moved]
+    
+    return Response({
+        'id': task.pk,
+        'completed': completed,
+        'unblocked' if completed else 'blocked': changed
+    })
+
+
+def workspace_feed_event(workspace_id, strategy, today):
+    workspace = Workspace.objects.get(pk=workspace_id)
+    runtime = workspace_runtimes.for_workspace(workspace)
+    tasks = list(workspace.tasks.order_by('id').values(*WORKSPACE_TASK_FIELDS))
+    runtime.check_task_count(len(tasks))
+    analyzed = runtime.run(
+        analyze_all_tasks,
+        tasks,
+        strategy,
+        score_cache=runtime.score_cache,
+        reference_date=today,
+        work_calendar=runtime.calendar
+    )
+    analyzed.sort(key=lambda x: x['priority_score'], reverse=True)
+    
+    version = RankingVersion(analyzed, strategy)
+    ranking_versions.set(version.token, version)
+    limit = getattr(settings, 'FEED_RANKING_LIMIT', 50)
+    
+    def entry(task):
+        return {
+            'id': task['id'],
+            'title': task['title'],
+            'priority_score': task['priority_score'],
+            'explanation': task['explanation']
+        }
+    
+    return {
+        'workspace': workspace.slug,
+        'strategy_used': STRATEGY_NAMES[strategy],
+        'date': today.isoformat(),
+        'version': version.token,
+        'total_tasks': len(analyzed),
+        'ranking': [dict(entry(task), rank=rank) for rank, task in enumerate(analyzed[:limit], 1)],
+        'suggestions': [entry(task) for task in analyzed if task['due_date'] == today][:3]
+    }
+
+
+def workspace_fingerprint(workspace_id):
+    return list(
+        Workspace.objects.filter(pk=workspace_id)
+        .annotate(total=Count('tasks'), last=Max('tasks__id'))
+        .values_list('updated_at', 'total', 'last')
+    )
+
+
+def feed_stream(feed, after):
+    yield f"retry: {getattr(settings, 'FEED_RETRY_MS', 3000)}\n\n"
+    updates = feed.subscribe(
+        after,
+        heartbeat=getattr(settings, 'FEED_HEARTBEAT_SECONDS', 15),
+        max_seconds=getattr(settings, 'FEED_STREAM_SECONDS', 300)
+    )
+    try:
+        for update in updates:
+            yield ': keep-alive\n\n' if update is None else format_event(*update)
+    except QuotaExceeded as e:
+        extra = {} if e.retry_after is None else {'retry_after': max(1, math.ceil(e.retry_after))}
+        yield format_error(str(e), **extra)
+    except Exception:
+        yield format_error('Ranking update failed')
+
+
+def workspace_stream(request, slug):
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    workspace = get_object_or_404(Workspace, slug=slug)
+    strategy = request.GET.get('strategy', 'smart_balance')
+    if strategy not in STRATEGY_NAMES:
+        return JsonResponse({'error': f'Unknown strategy {strategy}'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        after = int(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or 0)
+    except ValueError:
+        after = 0
+    
+    feed = workspace_feeds.get(workspace.pk, strategy, lambda: Feed(
+        functools.partial(workspace_feed_event, workspace.pk, strategy),
+        functools.partial(workspace_fingerprint, workspace.pk),
+        check_interval=getattr(settings, 'FEED_HEARTBEAT_SECONDS', 15)
+    ))
+    response = StreamingHttpResponse(feed_stream(feed, after), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def metrics(request):
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,93 @@
+import threading
+import time
+from .cache import LRUCache
+from .scoring import WorkingDayCalendar, parse_date
+
+
+class QuotaExceeded(Exception):
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CpuBudget:
+
+    def __init__(self, seconds_per_minute):
+        self.capacity = seconds_per_minute
+        self.rate = seconds_per_minute / 60.0
+        self.available = seconds_per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def retry_after(self):
+        with self._lock:
+            self._refill()
+            if self.available > 0:
+                return 0
+            return -self.available / self.rate
+
+    def charge(self, seconds):
+        with self._lock:
+            self._refill()
+            self.available -= seconds
+
+
+class WorkspaceRuntime:
+
+    def __init__(self, workspace, analysis_cache_size=4, score_cache_size=50000):
+        self.slug = workspace.slug
+        self.version = workspace.updated_at
+        self.max_tasks = workspace.max_tasks
+        holidays = [parse_date(h) for h in workspace.holidays or []]
+        self.calendar = WorkingDayCalendar([h for h in holidays if h is not None])
+        self.score_cache = LRUCache(score_cache_size)
+        self.analyses = LRUCache(analysis_cache_size)
+        self.cpu = CpuBudget(workspace.cpu_seconds_per_minute)
+        self._slots = threading.BoundedSemaphore(workspace.max_concurrent_analyses)
+
+    def check_task_count(self, total):
+        if total > self.max_tasks:
+            raise QuotaExceeded(f'Workspace {self.slug} allows at most {self.max_tasks} tasks')
+
+    def run(self, func, *args, **kwargs):
+        wait = self.cpu.retry_after()
+        if wait:
+            raise QuotaExceeded(f'Workspace {self.slug} is over its CPU budget', retry_after=wait)
+        if not self._slots.acquire(blocking=False):
+            raise QuotaExceeded(f'Workspace {self.slug} has too many analyses running', retry_after=1)
+
+        start = time.thread_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.cpu.charge(time.thread_time() - start)
+            self._slots.release()
+
+
+class RuntimeRegistry:
+
+    def __init__(self, max_workspaces=64, analysis_cache_size=4, score_cache_size=50000):
+        self.analysis_cache_size = analysis_cache_size
+        self.score_cache_size = score_cache_size
+        self._runtimes = LRUCache(max_workspaces)
+        self._lock = threading.Lock()
+
+    def get(self, slug):
+        return self._runtimes.get(slug)
+
+    def for_workspace(self, workspace):
+        with self._lock:
+            runtime = self._runtimes.get(workspace.slug)
+            if runtime is None or runtime.version != workspace.updated_at:
+                runtime = WorkspaceRuntime(workspace, self.analysis_cache_size, self.score_cache_size)
+                self._runtimes.set(workspace.slug, runtime)
+            return runtime
+
+    def clear(self):
+        self._runtimes.clear()
@@ -1,4 +1,5 @@
 const API_BASE = 'http://127.0.0.1:8000/api/tasks';
+const MAX_RENDERED_NODES = 1500;
 
 async function analyzeTasks() {
     const inputEl = document.getElementById('taskInput');
@@ -73,7 +74,7 @@ function displayResults(data) {
     });
     
     if (data.dependency_graph) {
-        renderDependencyGraph(data.dependency_graph, data.circular_dependencies || []);
+        renderDependencyGraph(data.dependency_graph, data.circular_dependencies || [], data.analysis_id);
     }
 }
 
@@ -136,7 +137,24 @@ function createTaskCard(task, rank) {
     return card;
 }
 
-function renderDependencyGraph(graphData, circularDeps) {
+async function fetchClusteredGraph(analysisId, container) {
+    const x0 = container.scrollLeft;
+    const y0 = container.scrollTop;
+    const x1 = x0 + Math.max(800, container.clientWidth);
+    const y1 = y0 + Math.max(500, container.clientHeight);
+    const params = new URLSearchParams({
+        analysis_id: analysisId,
+        lod: 'component',
+        viewport: [x0, y0, x1, y1].join(',')
+    });
+    const response = await fetch(`${API_BASE}/graph/layout/?${params}`);
+    if (!response.ok) {
+        return null;
+    }
+    return response.json();
+}
+
+async function renderDependencyGraph(graphData, circularDeps, analysisId) {
     const container = document.getElementById('graphContainer');
     if (!container || !graphData) {
         if (container) {
@@ -146,18 +164,35 @@ function renderDependencyGraph(graphData, circularDeps) {
     }
     
     const circularSet = new Set(circularDeps);
-    const nodes = graphData.nodes || [];
-    const edges = graphData.edges || [];
+    let nodes = graphData.nodes || [];
+    let edges = graphData.edges || [];
     
     if (nodes.length === 0) {
         container.innerHTML = '<p class="empty">No tasks to display in graph</p>';
         return;
     }
     
-    const width = Math.max(800, container.offsetWidth - 30);
-    const height = 500;
+    let hasLayout = nodes.every(node => node.x !== undefined && node.y !== undefined);
+    if ((!hasLayout || nodes.length > MAX_RENDERED_NODES) && analysisId) {
+        const clustered = await fetchClusteredGraph(analysisId, container);
+        if (clustered) {
+            nodes = clustered.nodes;
+            edges = clustered.edges;
+            hasLayout = true;
+        }
+    }
+    
+    let width = Math.max(800, container.offsetWidth - 30);
+    let height = 500;
     const radius = 35;
     
+    if (hasLayout) {
+        for (const node of nodes) {
+            width = Math.max(width, node.x + 60);
+            height = Math.max(height, node.y + 60);
+        }
+    }
+    
     container.innerHTML = '';
     
     const svg = document.createElementNS('http://www.w3.org/2000/svg', 'svg');
@@ -193,6 +228,10 @@ function renderDependencyGraph(graphData, circularDeps) {
     const layoutRadius = Math.min(width, height) / 3;
     
     nodes.forEach((node, i) => {
+        if (hasLayout) {
+            positions[node.id] = { x: node.x, y: node.y };
+            return;
+        }
         const angle = (2 * Math.PI * i) / nodes.length - Math.PI / 2;
         positions[node.id] = {
             x: centerX + layoutRadius * Math.cos(angle),